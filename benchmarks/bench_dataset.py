@@ -0,0 +1,71 @@
+"""Benchmark do repositório central de dados.
+
+Compara requisições por segundo de endpoints de listagem em dois cenários:
+
+- **antes:** cada requisição relê e revalida o arquivo JSON do recurso,
+  reproduzindo o custo dos antigos ``load_*()`` dos routers;
+- **depois:** as requisições usam o snapshot compartilhado de ``get_dataset()``.
+
+Uso:
+    python benchmarks/bench_dataset.py --requests 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.testclient import TestClient
+
+from main import app
+from repository.dataset import DATA_FILES, MODELS, load_json
+
+# Endpoint -> campo do Dataset que ele consulta
+ENDPOINTS = [
+    ("/spells", "spells"),
+    ("/racas", "races"),
+    ("/classes", "classes"),
+    ("/deuses", "deities"),
+    ("/conditions", "conditions"),
+    ("/criaturas", "creatures"),
+    ("/planos", "planes"),
+    ("/leituras", "leituras"),
+]
+
+FILENAMES = {field: filename for filename, field in DATA_FILES.items()}
+
+
+def reload_resource(field: str) -> list:
+    """Lê e valida um recurso do disco, como os routers faziam por requisição."""
+    model = MODELS[field]
+    return [model(**item) for item in load_json(FILENAMES[field])]
+
+
+def measure(client: TestClient, path: str, field: str, requests: int, per_request_load: bool) -> float:
+    """Executa ``requests`` chamadas e retorna requisições por segundo."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        if per_request_load:
+            reload_resource(field)
+        response = client.get(path)
+        assert response.status_code == 200
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300, help="Requisições por endpoint e cenário")
+    args = parser.parse_args()
+
+    client = TestClient(app)
+    print(f"{'endpoint':<14} {'antes (req/s)':>14} {'depois (req/s)':>15} {'ganho':>7}")
+    for path, field in ENDPOINTS:
+        client.get(path)  # aquecimento
+        before = measure(client, path, field, args.requests, per_request_load=True)
+        after = measure(client, path, field, args.requests, per_request_load=False)
+        print(f"{path:<14} {before:>14.1f} {after:>15.1f} {after / before:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""Teste de carga da API com um cliente httpx assíncrono, em processo.
+
+Dispara tráfego representativo direto na aplicação ASGI (sem rede), com
+várias requisições simultâneas, em quatro cenários:
+
+- **listas:** listas completas mais acessadas (pré-serializadas);
+- **filtros:** listas com filtros, paginação e ``fields``;
+- **detalhes:** rotas de detalhe por id e por slug;
+- **busca:** busca de texto completo e busca tolerante a erros.
+
+Cada cenário roda ``--rounds`` vezes e vale a rodada de req/s mediano; são
+reportados req/s e latência p50/p95/p99. Os resultados podem ser gravados
+como baseline JSON (``--save``) e comparados com um baseline anterior
+(``--compare``); a comparação termina com código 1 se req/s cair ou p95
+subir mais que ``--tolerance``.
+
+Uso:
+    python benchmarks/bench_load.py --requests 2000 --concurrency 32
+    python benchmarks/bench_load.py --save benchmarks/baselines/bench_load.json
+    python benchmarks/bench_load.py --compare benchmarks/baselines/bench_load.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import httpx
+
+from main import app
+from repository.dataset import get_dataset
+
+# Cenário -> URLs percorridas em ciclo
+SCENARIOS: Dict[str, List[str]] = {
+    "listas": [
+        "/spells",
+        "/criaturas",
+        "/deuses",
+        "/planos",
+        "/leituras",
+        "/conditions",
+        "/classes",
+        "/racas",
+    ],
+    "filtros": [
+        "/spells?level=1&class_=Mago",
+        "/spells/escola/Evocação",
+        "/criaturas?tipo=Besta&limit=10",
+        "/deuses?panteao=Faerûn&limit=20",
+        "/feats?class=Mago",
+        "/spells?fields=nome,nivel,escola",
+        "/classes?fields=nome,niveis.nivel",
+        "/backgrounds?name=a",
+    ],
+    "detalhes": [
+        "/spells/3",
+        "/classes/5",
+        "/racas/1",
+        "/criaturas/corvo",
+        "/criaturas/lobo",
+        "/deuses/mystra",
+        "/planos/plano-material",
+        "/subracas/anao-da-colina",
+    ],
+    "busca": [
+        "/search?q=fogo",
+        "/search?q=desvantagem&tipo=conditions",
+        "/spells/busca/bola",
+        "/spells/busca/bola%20de%20fgo?fuzzy=true",
+        "/deuses/busca/mis",
+        "/criaturas/esquleto?fuzzy=true",
+    ],
+}
+
+# Métricas comparadas com o baseline: (nome, True se maior é melhor)
+COMPARED = (("req_s", True), ("p95_ms", False))
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Percentil pelo método nearest-rank."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(client: httpx.AsyncClient, urls: List[str], requests: int, concurrency: int) -> dict:
+    """Executa ``requests`` chamadas com ``concurrency`` clientes simultâneos."""
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            url = urls[i % len(urls)]
+            start = time.perf_counter()
+            response = await client.get(url)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "req_s": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run(scenarios: List[str], requests: int, concurrency: int, rounds: int) -> Dict[str, dict]:
+    """Resultado de cada cenário: a rodada de req/s mediano, para reduzir o ruído."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        results = {}
+        for name in scenarios:
+            urls = SCENARIOS[name]
+            # Aquecimento: primeira chamada de cada URL fora da medição
+            for url in urls:
+                await client.get(url)
+            measured = [await run_scenario(client, urls, requests, concurrency) for _ in range(rounds)]
+            measured.sort(key=lambda result: result["req_s"])
+            results[name] = measured[len(measured) // 2]
+        return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> bool:
+    """Imprime a variação contra o baseline; False se houver regressão além da tolerância."""
+    ok = True
+    print(f"\n{'cenário':<10} {'métrica':<8} {'baseline':>10} {'atual':>10} {'variação':>9}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for metric, higher_is_better in COMPARED:
+            before, after = baseline[name][metric], result[metric]
+            change = (after - before) / before if before else 0.0
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            ok = ok and not regressed
+            flag = "  ⚠ regressão" if regressed else ""
+            print(f"{name:<10} {metric:<8} {before:>10.1f} {after:>10.1f} {change:>+8.1%}{flag}")
+    return ok
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requisições simultâneas")
+    parser.add_argument("--rounds", type=int, default=3, help="Rodadas por cenário; vale a de req/s mediano")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="Cenários a executar (padrão: todos)")
+    parser.add_argument("--save", help="Grava os resultados como baseline JSON neste caminho")
+    parser.add_argument("--compare", help="Compara com um baseline JSON gravado com --save")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Variação aceita antes de acusar regressão (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    results = asyncio.run(run(scenarios, args.requests, args.concurrency, args.rounds))
+
+    print(f"{'cenário':<10} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['req_s']:>9.1f} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['errors']:>6}"
+        )
+
+    if args.save:
+        baseline = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "dataset_version": get_dataset().version,
+                "requests": args.requests,
+                "concurrency": args.concurrency,
+                "rounds": args.rounds,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            },
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"\nBaseline gravado em {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        if not compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark dos backends de serialização JSON.
+
+Mede a vazão de serialização dos payloads completos de ``/classes`` e
+``/spells`` (validação pelo ``response_model`` + codificação) em cada backend:
+
+- **pydantic:** ``TypeAdapter.dump_json``, caminho usado pelo FastAPI nas rotas
+  com ``response_model`` e pelas respostas pré-serializadas;
+- **orjson / json:** ``dump_python(mode='json')`` seguido do backend de
+  ``repository.serialization``, caminho das rotas sem ``response_model``.
+
+Uso:
+    python benchmarks/bench_serialization.py --iterations 500
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from pydantic import TypeAdapter
+
+from models.class_ import Class
+from models.spell import Spell
+from repository.dataset import get_dataset
+from repository.serialization import BACKENDS
+
+# Endpoint -> (response_model, campo do Dataset)
+ENDPOINTS = [
+    ("/classes", List[Class], "classes"),
+    ("/spells", List[Spell], "spells"),
+]
+
+
+def serializers(response_type) -> dict:
+    """Funções ``payload -> bytes`` de cada backend para o response_model."""
+    adapter = TypeAdapter(response_type)
+    functions = {"pydantic": lambda items: adapter.dump_json(adapter.validate_python(items))}
+    for name, dumps in BACKENDS.items():
+        functions[name] = lambda items, dumps=dumps: dumps(adapter.dump_python(adapter.validate_python(items), mode="json"))
+    return functions
+
+
+def measure(serialize, items, iterations: int) -> float:
+    """Executa ``iterations`` serializações e retorna serializações por segundo."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        serialize(items)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300, help="Serializações por endpoint e backend")
+    args = parser.parse_args()
+
+    dataset = get_dataset()
+    print(f"{'endpoint':<10} {'backend':<9} {'ops/s':>10} {'MB/s':>8} {'vs json':>8}")
+    for path, response_type, field in ENDPOINTS:
+        items = list(getattr(dataset, field))
+        results = {}
+        for name, serialize in serializers(response_type).items():
+            size = len(serialize(items))  # aquecimento e tamanho do payload
+            results[name] = (measure(serialize, items, args.iterations), size)
+        baseline = results["json"][0]
+        for name, (ops, size) in results.items():
+            print(f"{path:<10} {name:<9} {ops:>10.1f} {ops * size / 1e6:>8.1f} {ops / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
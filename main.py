@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from routes.races import router as races_router
 from routes.classes import router as classes_router
@@ -24,6 +25,19 @@ from routes.planes import router as planes_router
 from routes.creatures import router as creatures_router
 from routes.leituras import router as leituras_router
 from routes.changelog import router as changelog_router
+from routes.search import router as search_router
+from routes.batch import router as batch_router
+from routes.export import router as export_router
+from routes.admin import router as admin_router
+from routes.metrics import router as metrics_router
+from routes.dice import router as dice_router
+from routes.encounters import router as encounters_router
+from repository.dataset import get_dataset
+from repository.responses import warm_responses
+from repository.reload import RELOAD_INTERVAL, DataWatcher, install_reload_signal
+from middleware.etag import ETagMiddleware
+from middleware.compression import CompressionMiddleware
+from middleware.metrics import MetricsMiddleware
 
 # Definição das tags para Swagger
 openapi_tags = [
@@ -54,9 +68,27 @@ openapi_tags = [
     {"name": "Divindades", "description": "Sistema de divindades com panteões, alinhamentos, domínios e símbolos sagrados. Inclui divindades Faerûnianas e outras."},
     {"name": "Planos", "description": "Sistema de planos de existência com tipos, alinhamentos, associações e criaturas típicas. Inclui planos Material, Elementais, Exteriores e Transitivos."},
     {"name": "Criaturas", "description": "Sistema de criaturas com estatísticas completas, ataques, sentidos e níveis de desafio. Inclui bestas, mortos-vivos, humanoides e outras criaturas do PHB."},
+    {"name": "Rolagens", "description": "Expressões de dados (ex: 2d6 + 3) com a distribuição exata dos resultados, média, desvio padrão e percentis."},
+    {"name": "Encontros", "description": "Montagem de encontros balanceados para o grupo de personagens, pelo orçamento de XP e a dificuldade do Guia do Mestre."},
+    {"name": "Lote", "description": "Busca de várias entidades de tipos diferentes (raças, classes, magias, talentos, etc.) em uma única chamada, com resultado e erro por item."},
+    {"name": "Exportação", "description": "Exportação em streaming (NDJSON) de todas as entidades da API, para sincronização de dados."},
+    {"name": "Métricas", "description": "Latência, contagem e tamanho das respostas por rota, no formato do Prometheus."},
+    {"name": "Administração", "description": "Operações de manutenção, como recarregar os arquivos de dados sem reiniciar o servidor."},
+    {"name": "Busca", "description": "Busca de texto completo em magias, criaturas, condições, divindades, planos, leituras e antecedentes, com resultados ranqueados por relevância."},
     {"name": "Leituras Inspiradoras", "description": "Sistema de leituras inspiradoras que influenciaram D&D. Inclui obras literárias, mitologias e suas influências específicas no jogo."}
 ]
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Liga a recarga dos dados por SIGHUP e, se configurado, o watcher dos arquivos."""
+    install_reload_signal()
+    watcher = DataWatcher(RELOAD_INTERVAL) if RELOAD_INTERVAL > 0 else None
+    if watcher is not None:
+        watcher.start()
+    yield
+    if watcher is not None:
+        watcher.stop()
+
 app = FastAPI(
     title="D&D 5e API",
     description="""API RESTful para consulta de dados do Livro do Jogador de Dungeons & Dragons 5ª Edição.
@@ -88,11 +120,12 @@ app = FastAPI(
 
 ---""",
     version="2.4.0",
-    openapi_tags=openapi_tags
+    openapi_tags=openapi_tags,
+    lifespan=lifespan
 )
 
 @app.get("/", tags=["Root"], summary="Root", description="Endpoint raiz da API. Retorna status, versão e informações sobre a API.")
-def root():
+async def root():
     return JSONResponse({
         "status": "ok",
         "version": "2.4.0",
@@ -126,6 +159,18 @@ def root():
         }
     })
 
+# Carrega e valida todos os arquivos de dados uma única vez, antes da primeira requisição
+get_dataset()
+
+# Compressão gzip/br negociada; adicionada antes do ETag para ficar mais perto das rotas
+app.add_middleware(CompressionMiddleware)
+
+# ETag por versão do dataset + query; If-None-Match é respondido com 304 antes das rotas
+app.add_middleware(ETagMiddleware, version=lambda: get_dataset().version)
+
+# Métricas por rota; o mais externo, para medir também os 304 e o corpo comprimido
+app.add_middleware(MetricsMiddleware, router=app.router)
+
 app.include_router(races_router)
 app.include_router(classes_router)
 app.include_router(backgrounds_router)
@@ -149,4 +194,14 @@ app.include_router(deities_router)
 app.include_router(planes_router)
 app.include_router(creatures_router)
 app.include_router(leituras_router)
-app.include_router(changelog_router) 
\ No newline at end of file
+app.include_router(changelog_router)
+app.include_router(search_router)
+app.include_router(batch_router)
+app.include_router(export_router)
+app.include_router(admin_router)
+app.include_router(metrics_router)
+app.include_router(dice_router)
+app.include_router(encounters_router)
+
+# Renderiza as listas completas pré-serializadas antes da primeira requisição
+warm_responses()
@@ -0,0 +1,192 @@
+"""Compressão de respostas com negociação de ``Accept-Encoding``.
+
+Suporta br (pacote ``brotli``) e gzip. Respostas
+menores que ``MINIMUM_SIZE`` saem sem compressão: o ganho não compensa o
+custo de CPU nem o cabeçalho extra.
+
+Há dois caminhos:
+
+- as listas completas pré-serializadas (``repository.responses``) são
+  comprimidas uma vez, com nível máximo, e servidas por
+  ``PrecompressedResponse``, que só escolhe a variante;
+- as demais respostas são comprimidas sob demanda por
+  ``CompressionMiddleware``, com nível mais baixo para não pesar na latência.
+"""
+import gzip
+import zlib
+from typing import Dict, Optional
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Abaixo deste tamanho (em bytes) a resposta não é comprimida
+MINIMUM_SIZE = 1024
+
+# Ordem de preferência do servidor quando o cliente aceita várias com o mesmo peso
+ENCODINGS = ("br", "gzip")
+
+# Níveis usados na compressão sob demanda (rápidos) e na pré-compressão (máximos)
+DYNAMIC_LEVELS = {"gzip": 6, "br": 5}
+STATIC_LEVELS = {"gzip": 9, "br": 11}
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[str]:
+    """Codificação suportada de maior peso no ``Accept-Encoding``, ou None."""
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    best, best_weight = None, 0.0
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def compress(body: bytes, encoding: str, levels: Dict[str, int] = DYNAMIC_LEVELS) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """Variantes do corpo por codificação (``identity`` é sempre incluída)."""
+    variants = {"identity": body}
+    if len(body) >= MINIMUM_SIZE:
+        for encoding in ENCODINGS:
+            variants[encoding] = compress(body, encoding, STATIC_LEVELS)
+    return variants
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+class PrecompressedResponse(Response):
+    """Resposta com variantes já comprimidas, escolhida pelo ``Accept-Encoding``."""
+
+    def __init__(self, variants: Dict[str, bytes], media_type: str = "application/json"):
+        super().__init__(content=variants["identity"], media_type=media_type)
+        self.variants = variants
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if len(self.variants) > 1:
+            self.headers["Vary"] = "Accept-Encoding"
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+            if encoding is not None:
+                self.body = self.variants[encoding]
+                self.headers["Content-Encoding"] = encoding
+                self.headers["Content-Length"] = str(len(self.body))
+        await super().__call__(scope, receive, send)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI que comprime respostas grandes sob demanda."""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = MINIMUM_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        responder = _CompressionResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Segura o início da resposta até saber o tamanho do primeiro bloco do corpo."""
+
+    def __init__(self, send: Send, encoding: Optional[str], minimum_size: int):
+        self._send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            # Já comprimida (pré-compressão) ou de tipo que não vale comprimir
+            self.passthrough = "content-encoding" in headers or not is_compressible(headers.get("content-type"))
+            if self.passthrough:
+                await self._send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            headers = MutableHeaders(scope=start)
+            if "accept-encoding" not in headers.get("vary", "").lower():
+                headers.add_vary_header("Accept-Encoding")
+            if self.encoding is None:
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            headers["Content-Encoding"] = self.encoding
+            if not more_body:
+                body = compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            # Corpo em blocos (streaming): comprime incrementalmente
+            del headers["Content-Length"]
+            self.compressor = _stream_compressor(self.encoding)
+            await self._send(start)
+
+        chunk = self.compressor.compress(body)
+        if not more_body:
+            chunk += self.compressor.flush()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+def _stream_compressor(encoding: str):
+    if encoding == "br":
+        return _BrotliStream()
+    return zlib.compressobj(DYNAMIC_LEVELS["gzip"], zlib.DEFLATED, 31)
+
+
+class _BrotliStream:
+    """Adapta ``brotli.Compressor`` à interface compress/flush do zlib."""
+
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=DYNAMIC_LEVELS["br"])
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self.compressor.finish()
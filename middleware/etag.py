@@ -0,0 +1,108 @@
+"""ETag e GET condicional para os endpoints de catálogo.
+
+Os dados só mudam entre deploys, então a resposta de um GET é determinada
+pela versão do dataset, pelo caminho e pela query string. O ETag é calculado
+a partir desses três valores *antes* de executar a rota: se o cliente já tem
+essa versão (``If-None-Match``), a resposta é um 304 sem corpo e nenhuma
+lógica de rota roda.
+
+Respostas comprimidas são outra representação do mesmo recurso, então o ETag
+ganha o sufixo da codificação (``"abc-gzip"``), como faz o Apache.
+"""
+import hashlib
+from typing import Callable, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Navegadores e CDN podem reutilizar a resposta por 5 minutos; depois disso
+# revalidam com If-None-Match e recebem 304 enquanto os dados não mudarem
+CACHE_CONTROL = "public, max-age=300, must-revalidate"
+
+# Documentação e métricas não dependem do dataset e não devem ser versionadas por ele
+EXCLUDED_PATHS = frozenset({"/docs", "/docs/oauth2-redirect", "/redoc", "/openapi.json", "/metrics"})
+
+
+def normalize_query(query_string: bytes) -> str:
+    """Query string com parâmetros ordenados pelo nome.
+
+    A ordem entre valores repetidos do mesmo parâmetro é preservada, pois
+    ``?tipo=a&tipo=b`` e ``?tipo=b&tipo=a`` podem gerar respostas diferentes.
+    """
+    params = parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    return urlencode(sorted(params, key=lambda param: param[0]))
+
+
+def compute_etag(version: str, path: str, query_string: bytes) -> str:
+    """ETag forte para a versão do dataset, o caminho e a query normalizada."""
+    key = f"{version}\n{path}\n{normalize_query(query_string)}"
+    return '"' + hashlib.sha256(key.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """ETag da representação com ``Content-Encoding``: ``"abc"`` -> ``"abc-gzip"``."""
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> Optional[str]:
+    """ETag de If-None-Match que casa com o recurso (comparação fraca, RFC 9110).
+
+    Aceita também as variantes comprimidas do mesmo ETag.
+    """
+    if not if_none_match:
+        return None
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return etag
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or (candidate.startswith(etag[:-1] + "-") and candidate.endswith('"')):
+            return candidate
+    return None
+
+
+class ETagMiddleware:
+    """Middleware ASGI que adiciona ETag/Cache-Control e responde 304."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        version: Callable[[], str],
+        cache_control: str = CACHE_CONTROL,
+        exclude: Iterable[str] = EXCLUDED_PATHS,
+    ):
+        self.app = app
+        self.version = version
+        self.cache_control = cache_control
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        etag = compute_etag(self.version(), scope["path"], scope["query_string"])
+        matched = etag_matches(Headers(scope=scope).get("if-none-match"), etag)
+        if matched:
+            headers = {"ETag": matched, "Cache-Control": self.cache_control}
+            if matched != etag:
+                headers["Vary"] = "Accept-Encoding"
+            response = Response(status_code=304, headers=headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            # Só respostas de sucesso são versionadas; erros não devem ir para cache
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = MutableHeaders(scope=message)
+                headers["ETag"] = encoded_etag(etag, headers.get("content-encoding"))
+                if "cache-control" not in headers:
+                    headers["Cache-Control"] = self.cache_control
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
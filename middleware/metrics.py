@@ -0,0 +1,206 @@
+"""Métricas por rota no formato de texto do Prometheus (``/metrics``).
+
+Para cada rota (o caminho com parâmetros, ex.: ``/spells/{spell_id}``) são
+registrados:
+
+- ``dnd_api_requests_total``: contagem por método, rota e status;
+- ``dnd_api_request_duration_seconds``: histograma da latência total;
+- ``dnd_api_response_size_bytes``: histograma do tamanho do corpo enviado;
+- ``dnd_api_request_phase_seconds``: histograma de cada fase da requisição
+  (``load``, ``filter``, ``model``, ``serialize``; ver ``repository.timing``).
+
+Cada worker tem o seu registro; com vários workers, cada coleta do
+Prometheus mostra os números do worker que a atendeu.
+"""
+from bisect import bisect_left
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.routing import BaseRoute, Match, Router
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from repository.timing import RequestTimings, current_timings
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Rótulo das requisições que não casam com nenhuma rota (evita um rótulo por URL)
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        # Rótulos -> [contagem por bucket (não cumulativa) + excedentes, soma]
+        self.values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                lines.append(f"{self.name}_bucket{_format_labels(labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Métricas HTTP da API; todas as atualizações acontecem no event loop."""
+
+    def __init__(self):
+        self.requests = Counter("dnd_api_requests_total", "Total de requisições HTTP.")
+        self.duration = Histogram(
+            "dnd_api_request_duration_seconds", "Latência das requisições HTTP em segundos.", LATENCY_BUCKETS,
+        )
+        self.size = Histogram(
+            "dnd_api_response_size_bytes", "Tamanho do corpo das respostas HTTP em bytes.", SIZE_BUCKETS,
+        )
+        self.phases = Histogram(
+            "dnd_api_request_phase_seconds", "Tempo de cada fase da requisição em segundos.", LATENCY_BUCKETS,
+        )
+
+    def record(
+        self, method: str, route: str, status: int, duration: float, size: int, phases: Dict[str, float],
+    ) -> None:
+        labels = (("method", method), ("route", route))
+        self.requests.inc(labels + (("status", str(status)),))
+        self.duration.observe(labels, duration)
+        self.size.observe(labels, size)
+        for name, seconds in phases.items():
+            self.phases.observe(labels + (("phase", name),), seconds)
+
+    def reset(self) -> None:
+        """Descarta tudo o que foi medido até aqui."""
+        for metric in (self.requests, self.duration, self.size, self.phases):
+            metric.values.clear()
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in (self.requests, self.duration, self.size, self.phases):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def _flatten(routes: Sequence[BaseRoute]) -> Iterator[BaseRoute]:
+    # O FastAPI guarda cada router incluído num envoltório com o router original
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from _flatten(included.routes)
+        else:
+            yield route
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mede cada requisição e alimenta o ``MetricsRegistry``.
+
+    Deve ser o mais externo, para medir também os 304 respondidos pelo
+    ``ETagMiddleware`` e o corpo já comprimido.
+    """
+
+    def __init__(self, app: ASGIApp, router: Optional[Router] = None, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.router = router
+        self.registry = registry
+        self._routes: Optional[List[BaseRoute]] = None
+
+    def routes(self) -> List[BaseRoute]:
+        """Rotas da aplicação, com as dos routers incluídos já expandidas."""
+        if self._routes is None:
+            self._routes = list(_flatten(self.router.routes)) if self.router is not None else []
+        return self._routes
+
+    def route_of(self, scope: Scope) -> str:
+        """Caminho da rota que atendeu; respostas dadas antes do roteamento são casadas aqui."""
+        route = scope.get("route")
+        if route is not None:
+            return route.path
+        for candidate in self.routes():
+            match, _ = candidate.matches(scope)
+            if match == Match.FULL:
+                return getattr(candidate, "path", UNMATCHED_ROUTE)
+        return UNMATCHED_ROUTE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = perf_counter()
+        timings = RequestTimings()
+        token = current_timings.set(timings)
+        status = 500
+        size = 0
+        response_start: Optional[float] = None
+
+        async def send_with_metrics(message: Message) -> None:
+            nonlocal status, size, response_start
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_start = perf_counter()
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            current_timings.reset(token)
+            self.registry.record(
+                scope["method"], self.route_of(scope), status, perf_counter() - start, size,
+                timings.finish(response_start),
+            )
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional, Union
+
+# Máximo de referências aceitas numa requisição de ``/batch``
+MAX_BATCH_ITEMS = 100
+
+class BatchReference(BaseModel):
+    """Referência a uma entidade: o tipo (prefixo da rota de detalhe) e o id."""
+    tipo: str = Field(..., description="Tipo da entidade (racas, subracas, classes, backgrounds, feats, spells, conditions, deuses, planos, criaturas, leituras)")
+    id: Union[int, str] = Field(..., description="Identificador da entidade, o mesmo usado na rota de detalhe")
+
+
+class BatchRequest(BaseModel):
+    """Lista de referências resolvidas em uma única chamada."""
+    itens: List[BatchReference] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS, description=f"Referências a resolver (1-{MAX_BATCH_ITEMS})")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "itens": [
+                        {"tipo": "racas", "id": 1},
+                        {"tipo": "classes", "id": 5},
+                        {"tipo": "backgrounds", "id": 0},
+                        {"tipo": "spells", "id": 3},
+                        {"tipo": "feats", "id": 2}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class BatchResult(BaseModel):
+    """Resultado de uma referência, na mesma posição em que foi pedida."""
+    tipo: str = Field(..., description="Tipo pedido")
+    id: Union[int, str] = Field(..., description="Id pedido")
+    status: int = Field(..., description="Status HTTP que a rota de detalhe retornaria (200, 400, 404 ou 422)")
+    item: Optional[Any] = Field(None, description="Entidade encontrada, no mesmo formato da rota de detalhe")
+    erro: Optional[str] = Field(None, description="Mensagem de erro quando a entidade não foi encontrada")
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict
 
+from models.dice import Ataque, Dados
+
 class Criatura(BaseModel):
     """Modelo para criaturas de D&D 5e."""
     id: str = Field(..., description="Identificador único da criatura (slug)")
@@ -16,6 +18,8 @@ class Criatura(BaseModel):
     nivel_desafio: str = Field(..., description="Nível de Desafio da criatura (ex: '1/4', '1', '5')")
     ataques: Optional[List[str]] = Field(None, description="Lista de ataques da criatura")
     notas: Optional[str] = Field(None, description="Notas adicionais sobre a criatura")
+    pv_dados: Optional[Dados] = Field(None, description="Dados de vida extraídos de `pv` (calculado na carga dos dados)")
+    ataques_detalhados: Optional[List[Ataque]] = Field(None, description="Nome, bônus e danos de cada ataque, extraídos de `ataques` (calculado na carga dos dados)")
     
     model_config = {
         "json_schema_extra": {
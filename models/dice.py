@@ -0,0 +1,117 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+# Limites de ``POST /dice/roll``: itens por pedido e rolagens somadas de todos os itens
+MAX_ROLL_ITEMS = 100
+MAX_ROLLS = 100000
+
+
+class TermoDados(BaseModel):
+    """Grupo de dados iguais de uma expressão."""
+    quantidade: int = Field(..., description="Quantidade de dados (negativa quando os dados são subtraídos)")
+    faces: int = Field(..., description="Número de faces de cada dado")
+
+
+class Dados(BaseModel):
+    """Expressão de dados já interpretada, com os valores mínimo, máximo e médio."""
+    expressao: str = Field(..., description="Expressão normalizada (ex: '2d6 + 3')")
+    dados: List[TermoDados] = Field(..., description="Dados rolados, agrupados por número de faces")
+    modificador: int = Field(..., description="Valor fixo somado aos dados")
+    minimo: int = Field(..., description="Menor resultado possível")
+    maximo: int = Field(..., description="Maior resultado possível")
+    media: float = Field(..., description="Resultado médio")
+
+
+class Dano(BaseModel):
+    """Dano de um ataque, como aparece no texto: ``8 (2d6 + 3) dano de corte``."""
+    valor: int = Field(..., description="Dano fixo indicado no texto (a média arredondada para baixo)")
+    dados: Optional[Dados] = Field(None, description="Dados rolados no lugar do valor fixo, quando houver")
+    tipo: str = Field(..., description="Tipo de dano (corte, perfuração, fogo, etc.)")
+
+
+class Ataque(BaseModel):
+    """Ataque de uma criatura extraído do texto de ``ataques``."""
+    nome: str = Field(..., description="Nome do ataque")
+    bonus_ataque: Optional[int] = Field(None, description="Bônus na jogada de ataque, quando houver")
+    dano: List[Dano] = Field(..., description="Danos causados, na ordem do texto")
+
+
+class ProbabilidadeResultado(BaseModel):
+    valor: int = Field(..., description="Resultado")
+    probabilidade: float = Field(..., description="Probabilidade exata do resultado (0 a 1)")
+
+
+class EstatisticasDados(BaseModel):
+    """Distribuição exata dos resultados de uma expressão de dados."""
+    expressao: str = Field(..., description="Expressão normalizada")
+    minimo: int = Field(..., description="Menor resultado possível")
+    maximo: int = Field(..., description="Maior resultado possível")
+    media: float = Field(..., description="Resultado médio")
+    desvio_padrao: float = Field(..., description="Desvio padrão dos resultados")
+    percentis: Dict[str, int] = Field(..., description="Percentis dos resultados (p10, p25, p50, p75, p90)")
+    distribuicao: Optional[List[ProbabilidadeResultado]] = Field(None, description="Probabilidade de cada resultado possível")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "expressao": "2d6 + 3",
+                    "minimo": 5,
+                    "maximo": 15,
+                    "media": 10.0,
+                    "desvio_padrao": 2.4152,
+                    "percentis": {"p10": 7, "p25": 8, "p50": 10, "p75": 12, "p90": 13},
+                    "distribuicao": [
+                        {"valor": 5, "probabilidade": 0.027777777777777776},
+                        {"valor": 6, "probabilidade": 0.05555555555555555}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class ItemRolagem(BaseModel):
+    """Expressão a rolar e quantas vezes."""
+    expr: str = Field(..., description="Expressão de dados (ex: '2d6 + 3'), o `dano` de uma arma ou o texto de um ataque de criatura")
+    vezes: int = Field(1, ge=1, le=MAX_ROLLS, description=f"Quantas vezes rolar (1-{MAX_ROLLS})")
+
+
+class PedidoRolagem(BaseModel):
+    """Rolagens feitas em uma única chamada, opcionalmente reproduzíveis."""
+    rolagens: List[ItemRolagem] = Field(..., min_length=1, max_length=MAX_ROLL_ITEMS, description=f"Expressões a rolar (1-{MAX_ROLL_ITEMS})")
+    semente: Optional[int] = Field(None, description="Semente do gerador: a mesma semente e o mesmo pedido repetem os resultados")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "rolagens": [
+                        {"expr": "1d20 + 5", "vezes": 4},
+                        {"expr": "1d8"},
+                        {"expr": "Mordida. Ataque Corpo a Cor com Arma: +4 para atingir, alcance 1,5 m, um alvo. Acerto: 7 (2d4 + 2) dano de perfuração."}
+                    ],
+                    "semente": 42
+                }
+            ]
+        }
+    }
+
+
+class ParteRolagem(BaseModel):
+    """Resultados de uma das expressões de um item (um tipo de dano, em ataques)."""
+    expressao: str = Field(..., description="Expressão normalizada")
+    tipo: Optional[str] = Field(None, description="Tipo de dano, quando o item é o texto de um ataque")
+    resultados: List[int] = Field(..., description="Resultado de cada rolagem")
+
+
+class ResultadoRolagem(BaseModel):
+    """Resultados de um item, na mesma posição em que foi pedido."""
+    expr: str = Field(..., description="Expressão pedida")
+    partes: List[ParteRolagem] = Field(..., description="Expressões roladas; uma só, exceto em ataques com mais de um dano")
+    totais: List[int] = Field(..., description="Soma das partes em cada rolagem")
+
+
+class RespostaRolagem(BaseModel):
+    semente: int = Field(..., description="Semente usada (a enviada ou uma sorteada), para repetir as rolagens")
+    resultados: List[ResultadoRolagem] = Field(..., description="Um resultado por item do pedido")
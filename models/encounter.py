@@ -0,0 +1,48 @@
+from pydantic import BaseModel, Field
+from typing import Annotated, Dict, List, Literal, Optional
+
+Dificuldade = Literal["facil", "media", "dificil", "mortal"]
+
+
+class PedidoEncontro(BaseModel):
+    """Grupo de personagens e o tipo de encontro desejado."""
+    niveis: List[Annotated[int, Field(ge=1, le=20)]] = Field(..., min_length=1, max_length=10, description="Nível de cada personagem do grupo (1-20)")
+    dificuldade: Dificuldade = Field("media", description="Dificuldade desejada: facil, media, dificil ou mortal")
+    max_criaturas: int = Field(8, ge=1, le=15, description="Máximo de criaturas no encontro")
+    max_criaturas_diferentes: int = Field(2, ge=1, le=3, description="Máximo de criaturas diferentes no encontro")
+    tipo: Optional[str] = Field(None, description="Restringe a um tipo de criatura (ex: Besta, Morto-vivo)")
+    max_resultados: int = Field(5, ge=1, le=20, description="Quantidade de encontros sugeridos")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {"niveis": [1, 1, 1, 1], "dificuldade": "media", "max_criaturas": 6, "tipo": "Besta"}
+            ]
+        }
+    }
+
+
+class CriaturaEncontro(BaseModel):
+    id: str = Field(..., description="Id da criatura (rota /criaturas/{id})")
+    nome: str = Field(..., description="Nome da criatura")
+    nivel_desafio: str = Field(..., description="Nível de desafio")
+    xp: int = Field(..., description="XP de cada criatura")
+    quantidade: int = Field(..., description="Quantas criaturas deste tipo")
+
+
+class Encontro(BaseModel):
+    """Encontro sugerido, com o cálculo de XP do Guia do Mestre."""
+    criaturas: List[CriaturaEncontro] = Field(..., description="Criaturas e quantidades")
+    total_criaturas: int = Field(..., description="Número total de criaturas")
+    xp_base: int = Field(..., description="Soma do XP das criaturas (o XP concedido ao grupo)")
+    multiplicador: float = Field(..., description="Multiplicador pelo número de criaturas e tamanho do grupo")
+    xp_ajustado: float = Field(..., description="XP base vezes o multiplicador, comparado aos limiares")
+    dificuldade: str = Field(..., description="Dificuldade resultante (trivial, facil, media, dificil ou mortal)")
+
+
+class RespostaEncontro(BaseModel):
+    limiares: Dict[str, int] = Field(..., description="Limiares de XP do grupo por dificuldade")
+    dificuldade: Dificuldade = Field(..., description="Dificuldade pedida")
+    xp_minimo: int = Field(..., description="Menor XP ajustado aceito para a dificuldade")
+    xp_maximo: int = Field(..., description="Maior XP ajustado aceito para a dificuldade")
+    encontros: List[Encontro] = Field(..., description="Encontros do mais ao menos equilibrado (XP ajustado mais perto do centro da faixa)")
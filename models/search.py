@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import Generic, TypeVar, Union
+
+T = TypeVar("T")
+
+class SearchResult(BaseModel):
+    """Resultado da busca de texto completo."""
+    tipo: str = Field(..., description="Tipo da entidade (spells, criaturas, conditions, deuses, planos, leituras, backgrounds)")
+    id: Union[int, str] = Field(..., description="Identificador da entidade, o mesmo usado na rota de detalhe")
+    nome: str = Field(..., description="Nome ou título da entidade")
+    url: str = Field(..., description="Rota de detalhe da entidade")
+    score: float = Field(..., description="Relevância BM25 (maior é mais relevante)")
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "tipo": "conditions",
+                    "id": 2,
+                    "nome": "Caído",
+                    "url": "/conditions/2",
+                    "score": 4.21
+                }
+            ]
+        }
+    }
+
+
+class FuzzyMatch(BaseModel, Generic[T]):
+    """Candidato da busca tolerante a erros de digitação (``fuzzy=true``)."""
+    similaridade: float = Field(..., description="Similaridade entre o termo e o nome (0 a 1)")
+    item: T = Field(..., description="Entidade encontrada")
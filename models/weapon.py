@@ -1,6 +1,7 @@
 from pydantic import Field, ConfigDict
+from models.dice import Dados
 from models.item import ItemBase
-from typing import List
+from typing import List, Optional
 
 class Weapon(ItemBase):
     """Modelo de arma, incluindo dano, tipo, propriedades e categoria."""
@@ -8,6 +9,7 @@ class Weapon(ItemBase):
     tipo: str = Field(..., description="Tipo de dano (ex: corte, perfurante, concussão).")
     propriedades: List[str] = Field(..., description="Propriedades especiais da arma.")
     categoria: str = Field(..., description="Categoria da arma (simples, marcial).")
+    dano_dados: Optional[Dados] = Field(None, description="Dados de dano interpretados a partir de `dano` (calculado na carga dos dados).")
 
     model_config = ConfigDict(json_schema_extra={
         "example": {
@@ -0,0 +1,50 @@
+"""API assíncrona de acesso aos dados.
+
+Depois da carga inicial, ler o dataset é só acesso à memória: as rotas são
+``async def`` e leem o dataset direto no event loop, sem ocupar o threadpool
+do Starlette. Os endpoints de lista recebem ``aget_dataset`` como
+dependência: o FastAPI a resolve uma vez por requisição e entrega o mesmo
+snapshot ao handler, à paginação e à ordenação, então uma recarga no meio da
+requisição não mistura itens, totais e cursores de versões diferentes. O que
+toca o disco (a primeira carga e as recargas) passa por ``IO_EXECUTOR``, um
+executor próprio e limitado, para que uma leitura lenta de arquivo não
+bloqueie o loop nem tome os threads usados pelo restante da aplicação.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterable, Tuple, TypeVar
+
+from repository.dataset import Dataset, get_dataset, is_dataset_loaded
+from repository.reload import reload_data
+
+T = TypeVar("T")
+
+# Threads dedicados a I/O de arquivos; carga e recarga raramente concorrem
+IO_WORKERS = int(os.environ.get("DND_API_IO_WORKERS", "2"))
+
+IO_EXECUTOR = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="dataset-io")
+
+
+async def run_io(func: Callable[..., T], *args) -> T:
+    """Executa uma função bloqueante de I/O no executor limitado."""
+    return await asyncio.get_running_loop().run_in_executor(IO_EXECUTOR, func, *args)
+
+
+async def aget_dataset() -> Dataset:
+    """Snapshot atual; só a primeira carga, que lê os arquivos, vai para o executor."""
+    if is_dataset_loaded():
+        return get_dataset()
+    return await run_io(get_dataset)
+
+
+async def areload_data() -> Tuple[str, str]:
+    """``reload_data`` sem bloquear o event loop; ``(versão anterior, nova)``."""
+    return await run_io(reload_data)
+
+
+async def aiterate(chunks: Iterable[T]) -> AsyncIterator[T]:
+    """Percorre um gerador em memória no loop, cedendo a vez entre os blocos."""
+    for chunk in chunks:
+        yield chunk
+        await asyncio.sleep(0)
@@ -0,0 +1,85 @@
+"""Resolução de várias referências ``(tipo, id)`` numa única chamada.
+
+Cada tipo segue a mesma regra de identificação da sua rota de detalhe
+(``/classes/{id}``, ``/criaturas/{id}``, ...), usando as tuplas e os índices
+de id/slug do snapshot. Erros são por item: uma referência inválida não
+derruba as demais.
+"""
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from repository.dataset import Dataset
+
+
+class ItemNotFound(Exception):
+    """Referência sem entidade correspondente; a mensagem é a da rota de detalhe."""
+
+
+class Resolver(NamedTuple):
+    """Como achar uma entidade de um tipo a partir do id recebido."""
+    get: Callable[[Dataset, Any], Any]
+    integer_id: bool = False
+
+
+def _by_position(field: str, start: int, message: Callable[[Dataset, int], str]) -> Callable[[Dataset, int], Any]:
+    """Entidades identificadas pela posição na lista (``start`` é o primeiro id)."""
+    def get(dataset: Dataset, key: int) -> Any:
+        items = getattr(dataset, field)
+        if start <= key < len(items) + start:
+            return items[key - start]
+        raise ItemNotFound(message(dataset, key))
+    return get
+
+
+def _by_lookup(resource: str, message: Callable[[Any], str], suggest: bool = True) -> Callable[[Dataset, Any], Any]:
+    """Entidades identificadas por id ou slug no ``EntityIndex`` do recurso."""
+    def get(dataset: Dataset, key: Any) -> Any:
+        lookup = dataset.lookups[resource]
+        item = lookup.get(key)
+        if item is None:
+            raise ItemNotFound(lookup.not_found(key, message(key)) if suggest else message(key))
+        return item
+    return get
+
+
+# Tipo (prefixo da rota de detalhe) -> resolvedor, com as mesmas mensagens de 404 das rotas
+RESOLVERS: Dict[str, Resolver] = {
+    'racas': Resolver(_by_lookup('races', lambda key: "Raça não encontrada", suggest=False)),
+    'subracas': Resolver(_by_lookup('subraces', lambda key: "Sub-raça não encontrada")),
+    'classes': Resolver(_by_position('classes', 1, lambda d, key: "Classe não encontrada"), integer_id=True),
+    'backgrounds': Resolver(_by_position('backgrounds', 0, lambda d, key: "Antecedente não encontrado"), integer_id=True),
+    'feats': Resolver(_by_position('feats', 0, lambda d, key: "Talento não encontrado"), integer_id=True),
+    'spells': Resolver(_by_position('spells', 1, lambda d, key: "Magia não encontrada"), integer_id=True),
+    'conditions': Resolver(
+        _by_position(
+            'conditions', 1,
+            lambda d, key: f"Condição com ID {key} não encontrada. IDs válidos: 1-{len(d.conditions)}",
+        ),
+        integer_id=True,
+    ),
+    'deuses': Resolver(_by_lookup('deities', lambda key: f"Divindade com ID '{key}' não encontrada")),
+    'planos': Resolver(_by_lookup(
+        'planes', lambda key: f"Plano '{key}' não encontrado. Use /planos para ver todos os planos disponíveis.",
+    )),
+    'criaturas': Resolver(_by_lookup(
+        'creatures', lambda key: f"Criatura '{key}' não encontrada. Use /criaturas para ver todas as criaturas disponíveis.",
+    )),
+    'leituras': Resolver(_by_lookup(
+        'leituras', lambda key: f"Leitura inspiradora '{key}' não encontrada. Use /leituras para ver todas as leituras disponíveis.",
+    )),
+}
+
+
+def resolve(dataset: Dataset, tipo: str, key: Any) -> Tuple[int, Optional[Any], Optional[str]]:
+    """``(status, entidade, erro)`` de uma referência, com status no estilo HTTP."""
+    resolver = RESOLVERS.get(tipo)
+    if resolver is None:
+        return 400, None, f"Tipo '{tipo}' não suportado. Tipos disponíveis: {', '.join(RESOLVERS)}"
+    if resolver.integer_id:
+        try:
+            key = int(key)
+        except (TypeError, ValueError):
+            return 422, None, f"ID de '{tipo}' deve ser um número inteiro"
+    try:
+        return 200, resolver.get(dataset, key), None
+    except ItemNotFound as exc:
+        return 404, None, str(exc)
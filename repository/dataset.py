@@ -0,0 +1,496 @@
+"""Repositório central de dados da API.
+
+Todos os arquivos de ``data/*.json`` são lidos uma única vez, validados nos
+modelos de ``models/`` e expostos como um snapshot imutável (``Dataset``)
+compartilhado por todos os routers. Os handlers nunca tocam o disco.
+
+Se existir o snapshot binário gerado no build (``SNAPSHOT_PATH``) e ele
+corresponder aos arquivos JSON atuais, os dados são lidos dele, sem parse
+de JSON em Python nem cálculo da versão.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from models.ability import Ability
+from models.armor import Armor
+from models.background import Background
+from models.class_ import Class
+from models.condition import Condition
+from models.creature import Criatura
+from models.deity import Deus
+from models.dice import Ataque, Dados, Dano, TermoDados
+from models.environment_condition import EnvironmentCondition
+from models.feat import Feat
+from models.item import ItemBase
+from models.leitura import LeituraInspiradora
+from models.mount import Mount
+from models.multiclass_requirement import MulticlassRequirement
+from models.plane import PlanoExistencia
+from models.race import Race
+from models.rest_rule import RestRule
+from models.rule import Rule
+from models.skill import Skill
+from models.spell import Spell
+from models.tool import Tool
+from models.travel_rule import TravelRule
+from models.weapon import Weapon
+from repository.dice import DiceError, DiceExpression, parse_attack, parse_dice, parse_hit_points
+from repository.encounters import EncounterIndex
+from repository.fuzzy import TrigramIndex
+from repository.indexes import CreatureStatIndex, SortIndex, SpellIndex, scalar_columns
+from repository.lookup import EntityIndex
+from repository.search import InvertedIndex, SearchDocument
+from repository.snapshot import Snapshot, SnapshotError, write_snapshot
+from repository.text import SearchKeys
+from repository.timing import phase
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '../data')
+
+# Snapshot binário gerado por ``scripts/build_snapshot.py``; sem ele, lê os JSON
+SNAPSHOT_PATH = os.environ.get('DND_API_SNAPSHOT', os.path.join(DATA_DIR, 'dataset.snapshot'))
+
+logger = logging.getLogger(__name__)
+
+# Arquivo de dados -> nome do campo no Dataset
+DATA_FILES = {
+    'races.json': 'races',
+    'classes.json': 'classes',
+    'backgrounds.json': 'backgrounds',
+    'equipment.json': 'equipment',
+    'weapons.json': 'weapons',
+    'armor.json': 'armor',
+    'tools.json': 'tools',
+    'mounts.json': 'mounts',
+    'feats.json': 'feats',
+    'multiclass_requirements.json': 'multiclass',
+    'abilities.json': 'abilities',
+    'skills.json': 'skills',
+    'rules.json': 'rules',
+    'combat_rules.json': 'combat_rules',
+    'travel.json': 'travel',
+    'rest.json': 'rest',
+    'environment.json': 'environment',
+    'actions.json': 'actions',
+    'conditions.json': 'conditions',
+    'spells.json': 'spells',
+    'deuses.json': 'deities',
+    'planos.json': 'planes',
+    'criaturas.json': 'creatures',
+    'leituras.json': 'leituras',
+    'currency.json': 'currency',
+    'services.json': 'services',
+    'lifestyles.json': 'lifestyles',
+}
+
+# Recursos validados em modelos; os demais são servidos como dicts
+MODELS = {
+    'races': Race,
+    'classes': Class,
+    'backgrounds': Background,
+    'equipment': ItemBase,
+    'weapons': Weapon,
+    'armor': Armor,
+    'tools': Tool,
+    'mounts': Mount,
+    'feats': Feat,
+    'multiclass': MulticlassRequirement,
+    'abilities': Ability,
+    'skills': Skill,
+    'rules': Rule,
+    'travel': TravelRule,
+    'rest': RestRule,
+    'environment': EnvironmentCondition,
+    'conditions': Condition,
+    'spells': Spell,
+    'deities': Deus,
+    'planes': PlanoExistencia,
+    'creatures': Criatura,
+    'leituras': LeituraInspiradora,
+}
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """Snapshot imutável de todos os dados da API, já validados e indexados."""
+    races: Tuple[Race, ...]
+    subraces: Tuple[dict, ...]
+    classes: Tuple[Class, ...]
+    backgrounds: Tuple[Background, ...]
+    equipment: Tuple[ItemBase, ...]
+    weapons: Tuple[Weapon, ...]
+    armor: Tuple[Armor, ...]
+    tools: Tuple[Tool, ...]
+    mounts: Tuple[Mount, ...]
+    feats: Tuple[Feat, ...]
+    multiclass: Tuple[MulticlassRequirement, ...]
+    abilities: Tuple[Ability, ...]
+    skills: Tuple[Skill, ...]
+    rules: Tuple[Rule, ...]
+    combat_rules: Tuple[dict, ...]
+    travel: Tuple[TravelRule, ...]
+    rest: Tuple[RestRule, ...]
+    environment: Tuple[EnvironmentCondition, ...]
+    actions: Tuple[dict, ...]
+    conditions: Tuple[Condition, ...]
+    spells: Tuple[Spell, ...]
+    deities: Tuple[Deus, ...]
+    planes: Tuple[PlanoExistencia, ...]
+    creatures: Tuple[Criatura, ...]
+    leituras: Tuple[LeituraInspiradora, ...]
+    currency: Tuple[dict, ...]
+    services: Tuple[dict, ...]
+    lifestyles: Tuple[dict, ...]
+    spell_index: SpellIndex
+    encounters: EncounterIndex
+    creature_stats: CreatureStatIndex
+    sort_orders: Dict[str, SortIndex]
+    search_keys: Dict[str, SearchKeys]
+    text_index: InvertedIndex
+    fuzzy_index: Dict[str, TrigramIndex]
+    lookups: Dict[str, EntityIndex]
+    version: str
+
+    def fuzzy(self, resource: str, term: str) -> List[Tuple[Any, float]]:
+        """Entidades com nome parecido com o termo, com a similaridade de cada uma."""
+        items = self.search_keys[resource].items
+        return [(items[pos], round(score, 4)) for pos, score in self.fuzzy_index[resource].search(term)]
+
+
+def load_json(filename: str) -> Any:
+    """Lê um arquivo JSON do diretório de dados."""
+    with open(os.path.join(DATA_DIR, filename), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_raw_data() -> Dict[str, Any]:
+    """Lê todos os arquivos de dados, indexados pelo nome do campo no Dataset."""
+    return {field: load_json(filename) for filename, field in DATA_FILES.items()}
+
+
+def build_subraces(races: Tuple[Race, ...]) -> Tuple[dict, ...]:
+    """Achata as sub-raças de todas as raças, com referência ao id da raça."""
+    subraces = []
+    for race in races:
+        if race.subracas:
+            for idx, sub in enumerate(race.subracas):
+                sub_dict = sub.model_dump()
+                sub_dict['race_id'] = race.id
+                sub_dict['subrace_id'] = f"{race.id}_{idx+1}"
+                sub_dict['race_nome'] = race.nome
+                subraces.append(sub_dict)
+    return tuple(subraces)
+
+
+def dice_model(expression: DiceExpression) -> Dados:
+    """Converte uma expressão compilada no modelo exposto pela API."""
+    return Dados(
+        expressao=str(expression),
+        dados=[TermoDados(quantidade=term.sign * term.count, faces=term.faces) for term in expression.terms],
+        modificador=expression.modifier,
+        minimo=expression.minimum,
+        maximo=expression.maximum,
+        media=expression.mean,
+    )
+
+
+def interpret_dice(fields: Dict[str, Any]) -> None:
+    """Preenche uma vez os campos de dados derivados dos textos de criaturas e armas."""
+    for creature in fields['creatures']:
+        _, hit_dice = parse_hit_points(creature.pv)
+        creature.pv_dados = dice_model(hit_dice) if hit_dice else None
+        creature.ataques_detalhados = None if creature.ataques is None else [
+            Ataque(
+                nome=name,
+                bonus_ataque=bonus,
+                dano=[
+                    Dano(valor=value, dados=dice_model(dice) if dice else None, tipo=kind)
+                    for value, dice, kind in damage
+                ],
+            )
+            for name, bonus, damage in map(parse_attack, creature.ataques)
+        ]
+    for weapon in fields['weapons']:
+        try:
+            weapon.dano_dados = dice_model(parse_dice(weapon.dano))
+        except DiceError:
+            weapon.dano_dados = None
+
+
+def build_search_keys(fields: Dict[str, Any]) -> Dict[str, SearchKeys]:
+    """Chaves normalizadas usadas pelos endpoints de busca por nome."""
+    return {
+        'races': SearchKeys(
+            fields['races'],
+            nome=lambda r: r.nome,
+            tamanho=lambda r: r.tamanho,
+            aumento_habilidade=lambda r: r.aumento_habilidade,
+        ),
+        'subraces': SearchKeys(fields['subraces'], nome=lambda s: s['nome']),
+        'backgrounds': SearchKeys(fields['backgrounds'], nome=lambda b: b.nome),
+        'spells': SearchKeys(fields['spells'], nome=lambda s: s.nome),
+        'deities': SearchKeys(fields['deities'], nome=lambda d: d.nome),
+        'conditions': SearchKeys(fields['conditions'], nome=lambda c: c.nome),
+        'creatures': SearchKeys(fields['creatures'], nome=lambda c: c.nome),
+        'planes': SearchKeys(fields['planes'], nome=lambda p: p.nome),
+        'leituras': SearchKeys(fields['leituras'], titulo=lambda l: l.titulo),
+    }
+
+
+# Campo de nome usado pelo índice de trigramas de cada recurso
+NAME_FIELDS = {
+    'races': 'nome',
+    'subraces': 'nome',
+    'backgrounds': 'nome',
+    'spells': 'nome',
+    'deities': 'nome',
+    'conditions': 'nome',
+    'creatures': 'nome',
+    'planes': 'nome',
+    'leituras': 'titulo',
+}
+
+
+def build_sort_orders(fields: Dict[str, Any]) -> Dict[str, SortIndex]:
+    """Ordens usadas por ``sort=`` em cada recurso de lista.
+
+    Criaturas também ordenam pelas colunas numéricas do ``CreatureStatIndex``
+    (``pv`` pelo valor, não pelo texto) e pelo XP do nível de desafio, para
+    que ``1/4`` venha antes de ``2``. ``race_subraces`` ordena os modelos de
+    ``Race.subracas`` de todas as raças, usados por ``/racas/{id}/subracas``.
+    """
+    orders = {
+        resource: SortIndex(items, scalar_columns(items))
+        for resource, items in fields.items()
+        if isinstance(items, tuple)
+    }
+    creatures = fields['creatures']
+    orders['creatures'] = SortIndex(creatures, {
+        **scalar_columns(creatures),
+        **fields['creature_stats'].columns,
+        'nivel_desafio': fields['encounters'].xp,
+    })
+    race_subraces = tuple(sub for race in fields['races'] for sub in race.subracas or ())
+    orders['race_subraces'] = SortIndex(race_subraces, scalar_columns(race_subraces))
+    return orders
+
+
+def build_fuzzy_index(search_keys: Dict[str, SearchKeys]) -> Dict[str, TrigramIndex]:
+    """Índices de trigramas sobre os nomes já normalizados de cada recurso."""
+    return {
+        resource: TrigramIndex(search_keys[resource].keys[field])
+        for resource, field in NAME_FIELDS.items()
+    }
+
+
+# Id usado pela rota de detalhe e nome de cada recurso
+LOOKUP_FIELDS = {
+    'races': (lambda r: r.id, lambda r: r.nome),
+    'subraces': (lambda s: s['subrace_id'], lambda s: s['nome']),
+    'deities': (lambda d: d.id, lambda d: d.nome),
+    'creatures': (lambda c: c.id, lambda c: c.nome),
+    'planes': (lambda p: p.id, lambda p: p.nome),
+    'leituras': (lambda l: l.id, lambda l: l.titulo),
+}
+
+
+def build_lookups(fields: Dict[str, Any], fuzzy_index: Dict[str, TrigramIndex]) -> Dict[str, EntityIndex]:
+    """Mapas de id/slug usados pelas rotas de detalhe, com sugestões via trigramas."""
+    return {
+        resource: EntityIndex(fields[resource], id_of, name_of, fuzzy_index[resource])
+        for resource, (id_of, name_of) in LOOKUP_FIELDS.items()
+    }
+
+
+def build_text_index(fields: Dict[str, Any]) -> InvertedIndex:
+    """Índice de texto completo usado por ``/search``."""
+    index = InvertedIndex()
+    for pos, spell in enumerate(fields['spells'], start=1):
+        index.add(SearchDocument('spells', pos, spell.nome, f"/spells/{pos}"), [spell.nome, spell.texto])
+    for creature in fields['creatures']:
+        index.add(
+            SearchDocument('criaturas', creature.id, creature.nome, f"/criaturas/{creature.id}"),
+            [creature.nome, creature.notas, *(creature.ataques or [])],
+        )
+    for pos, condition in enumerate(fields['conditions'], start=1):
+        index.add(
+            SearchDocument('conditions', pos, condition.nome, f"/conditions/{pos}"),
+            [condition.nome, *condition.efeitos],
+        )
+    for deity in fields['deities']:
+        index.add(SearchDocument('deuses', deity.id, deity.nome, f"/deuses/{deity.id}"), [deity.nome, *deity.dominios])
+    for plane in fields['planes']:
+        index.add(SearchDocument('planos', plane.id, plane.nome, f"/planos/{plane.id}"), [plane.nome, plane.descricao])
+    for leitura in fields['leituras']:
+        index.add(
+            SearchDocument('leituras', leitura.id, leitura.titulo, f"/leituras/{leitura.id}"),
+            [leitura.titulo, leitura.influencia],
+        )
+    for pos, background in enumerate(fields['backgrounds']):
+        index.add(
+            SearchDocument('backgrounds', pos, background.nome, f"/backgrounds/{pos}"),
+            [background.nome, background.descricao, background.habilidade.descricao],
+        )
+    return index
+
+
+def dataset_version(raw: Dict[str, Any]) -> str:
+    """Hash do conteúdo dos dados brutos; muda sempre que algum arquivo muda."""
+    canonical = json.dumps(raw, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def prepare_raw(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """Ajustes nos dados brutos antes da validação."""
+    raw = dict(raw)
+    # O arquivo de multiclasse mistura combinações e regras gerais
+    raw['multiclass'] = [m for m in raw['multiclass'] if 'classe_base' in m and 'classe_desejada' in m]
+    return raw
+
+
+def validate_raw(raw: Dict[str, Any]) -> Dict[str, Tuple[Any, ...]]:
+    """Valida cada recurso no seu modelo; recursos sem modelo ficam como dicts."""
+    fields = {}
+    for field, items in prepare_raw(raw).items():
+        model = MODELS.get(field)
+        if model is None:
+            fields[field] = tuple(items)
+        else:
+            fields[field] = tuple(model(**item) for item in items)
+    return fields
+
+
+def index_dataset(fields: Dict[str, Tuple[Any, ...]], version: str) -> Dataset:
+    """Monta o snapshot a partir dos recursos já validados, construindo os índices."""
+    fields = dict(fields)
+    interpret_dice(fields)
+    fields['subraces'] = build_subraces(fields['races'])
+    fields['spell_index'] = SpellIndex(fields['spells'])
+    fields['encounters'] = EncounterIndex(fields['creatures'])
+    fields['creature_stats'] = CreatureStatIndex(fields['creatures'])
+    fields['sort_orders'] = build_sort_orders(fields)
+    fields['search_keys'] = build_search_keys(fields)
+    fields['text_index'] = build_text_index(fields)
+    fields['fuzzy_index'] = build_fuzzy_index(fields['search_keys'])
+    fields['lookups'] = build_lookups(fields, fields['fuzzy_index'])
+    return Dataset(version=version, **fields)
+
+
+def build_dataset(raw: Dict[str, Any]) -> Dataset:
+    """Valida os dados brutos nos modelos e monta o snapshot."""
+    return index_dataset(validate_raw(raw), dataset_version(raw))
+
+
+def source_hashes() -> Dict[str, str]:
+    """sha256 do conteúdo de cada arquivo de dados presente no disco."""
+    hashes = {}
+    for filename in DATA_FILES:
+        path = os.path.join(DATA_DIR, filename)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                hashes[filename] = hashlib.sha256(f.read()).hexdigest()
+    return hashes
+
+
+def build_snapshot(path: str = SNAPSHOT_PATH) -> str:
+    """Compila ``data/*.json`` no snapshot binário; retorna a versão do dataset."""
+    raw = read_raw_data()
+    # Valida antes de gravar: um snapshot nunca contém dados que a API rejeitaria
+    validate_raw(raw)
+    version = dataset_version(raw)
+    records = {
+        field: [json.dumps(item, ensure_ascii=False, separators=(',', ':')).encode('utf-8') for item in items]
+        for field, items in prepare_raw(raw).items()
+    }
+    write_snapshot(path, version, source_hashes(), records)
+    return version
+
+
+def decode_snapshot(snapshot: Snapshot) -> Dict[str, Tuple[Any, ...]]:
+    """Valida os itens do snapshot direto dos bytes, sem dicts intermediários."""
+    fields = {}
+    for field in DATA_FILES.values():
+        model = MODELS.get(field)
+        decode = json.loads if model is None else model.model_validate_json
+        fields[field] = tuple(decode(item) for item in snapshot.items(field))
+    return fields
+
+
+def open_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Snapshot]:
+    """Snapshot em ``path`` se existir e corresponder aos arquivos de dados atuais."""
+    if not os.path.exists(path):
+        return None
+    try:
+        snapshot = Snapshot(path)
+    except SnapshotError as exc:
+        logger.warning("Snapshot ignorado: %s", exc)
+        return None
+    missing = [field for field in DATA_FILES.values() if field not in snapshot]
+    # Arquivos ausentes no disco não invalidam o snapshot (deploy só com o binário)
+    stale = [name for name, digest in source_hashes().items() if snapshot.sources.get(name) != digest]
+    if missing or stale:
+        logger.warning("Snapshot %s desatualizado (%s); usando os arquivos JSON", path, ", ".join(missing + stale))
+        snapshot.close()
+        return None
+    return snapshot
+
+
+def load_dataset() -> Dataset:
+    """Carrega o snapshot binário, se houver um atualizado; senão lê os arquivos JSON."""
+    snapshot = open_snapshot()
+    if snapshot is None:
+        return build_dataset(read_raw_data())
+    try:
+        return index_dataset(decode_snapshot(snapshot), snapshot.version)
+    finally:
+        snapshot.close()
+
+
+_dataset: Optional[Dataset] = None
+_lock = threading.Lock()
+
+
+def get_dataset() -> Dataset:
+    """Retorna o snapshot atual, carregando-o na primeira chamada."""
+    global _dataset
+    if _dataset is None:
+        with _lock, phase("load"):
+            if _dataset is None:
+                _dataset = load_dataset()
+    return _dataset
+
+
+def is_dataset_loaded() -> bool:
+    """Se a carga inicial já aconteceu (``get_dataset()`` não toca mais o disco)."""
+    return _dataset is not None
+
+
+def data_signature() -> Tuple[Tuple[str, int, int], ...]:
+    """``(arquivo, mtime, tamanho)`` de cada arquivo de dados; muda quando algum é editado."""
+    signature = []
+    for filename in DATA_FILES:
+        try:
+            stat = os.stat(os.path.join(DATA_DIR, filename))
+        except FileNotFoundError:
+            continue
+        signature.append((filename, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def reload_dataset() -> Dataset:
+    """Monta um novo snapshot a partir do disco e o troca pelo atual.
+
+    O novo snapshot e todos os seus índices são construídos antes da troca,
+    que é uma única atribuição: requisições em andamento terminam com o
+    snapshot que já obtiveram e as seguintes veem o novo. Se a leitura ou a
+    validação falhar, a exceção é propagada e o snapshot atual continua.
+    """
+    global _dataset
+    with _lock:
+        dataset = load_dataset()
+        _dataset = dataset
+    return dataset
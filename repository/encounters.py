@@ -0,0 +1,234 @@
+"""Montagem de encontros balanceados pelas regras de XP do Guia do Mestre.
+
+O nível de desafio de cada criatura é convertido em XP uma única vez, na
+carga dos dados (``EncounterIndex``), e as criaturas ficam ordenadas por XP.
+A busca não enumera combinações de criaturas: ela percorre combinações de
+*valores* de XP (criaturas com o mesmo XP são equivalentes para o
+orçamento), em ordem crescente, e corta o ramo assim que o XP ajustado
+passa do teto da dificuldade pedida; como o XP ajustado só cresce quando se
+acrescenta uma criatura, nenhum valor maior precisa ser tentado. Só depois
+as combinações escolhidas recebem criaturas concretas.
+"""
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from models.creature import Criatura
+from repository.text import fold
+
+# XP por nível de desafio
+XP_BY_CHALLENGE = {
+    '0': 10, '1/8': 25, '1/4': 50, '1/2': 100,
+    '1': 200, '2': 450, '3': 700, '4': 1100, '5': 1800,
+    '6': 2300, '7': 2900, '8': 3900, '9': 5000, '10': 5900,
+    '11': 7200, '12': 8400, '13': 10000, '14': 11500, '15': 13000,
+    '16': 15000, '17': 18000, '18': 20000, '19': 22000, '20': 25000,
+    '21': 33000, '22': 41000, '23': 50000, '24': 62000, '25': 75000,
+    '26': 90000, '27': 105000, '28': 120000, '29': 135000, '30': 155000,
+}
+
+DIFFICULTIES = ('facil', 'media', 'dificil', 'mortal')
+
+# Limiares de XP por personagem, por nível: (fácil, média, difícil, mortal)
+XP_THRESHOLDS = {
+    1: (25, 50, 75, 100),
+    2: (50, 100, 150, 200),
+    3: (75, 150, 225, 400),
+    4: (125, 250, 375, 500),
+    5: (250, 500, 750, 1100),
+    6: (300, 600, 900, 1400),
+    7: (350, 750, 1100, 1700),
+    8: (450, 900, 1400, 2100),
+    9: (550, 1100, 1600, 2400),
+    10: (600, 1200, 1900, 2800),
+    11: (800, 1600, 2400, 3600),
+    12: (1000, 2000, 3000, 4500),
+    13: (1100, 2200, 3400, 5100),
+    14: (1250, 2500, 3800, 5700),
+    15: (1400, 2800, 4300, 6400),
+    16: (1600, 3200, 4800, 7200),
+    17: (2000, 3900, 5900, 8800),
+    18: (2100, 4200, 6300, 9500),
+    19: (2400, 4900, 7300, 10900),
+    20: (2800, 5700, 8500, 12700),
+}
+
+# Multiplicadores pelo número de criaturas; as pontas servem ao ajuste pelo tamanho do grupo
+MULTIPLIERS = (0.5, 1, 1.5, 2, 2.5, 3, 4, 5)
+
+# Teto de um encontro mortal, em múltiplos do limiar mortal
+DEADLY_CEILING = 1.5
+
+
+def challenge_xp(challenge: str) -> Optional[int]:
+    """XP de um nível de desafio (``'1/4'`` -> 50); ``None`` se desconhecido."""
+    return XP_BY_CHALLENGE.get(challenge.strip())
+
+
+def multiplier(count: int, party_size: int) -> float:
+    """Multiplicador de XP para ``count`` criaturas contra um grupo de ``party_size``."""
+    if count <= 1:
+        step = 1
+    elif count == 2:
+        step = 2
+    elif count <= 6:
+        step = 3
+    elif count <= 10:
+        step = 4
+    elif count <= 14:
+        step = 5
+    else:
+        step = 6
+    # Grupos pequenos enfrentam o encontro como se fosse maior, e vice-versa
+    if party_size < 3:
+        step += 1
+    elif party_size >= 6:
+        step -= 1
+    return MULTIPLIERS[step]
+
+
+def party_thresholds(levels: Sequence[int]) -> Dict[str, int]:
+    """Limiares de XP do grupo: soma dos limiares de cada personagem."""
+    return {
+        difficulty: sum(XP_THRESHOLDS[level][i] for level in levels)
+        for i, difficulty in enumerate(DIFFICULTIES)
+    }
+
+
+def xp_band(thresholds: Dict[str, int], difficulty: str) -> Tuple[int, int]:
+    """Faixa de XP ajustado ``[mínimo, máximo]`` de uma dificuldade."""
+    i = DIFFICULTIES.index(difficulty)
+    low = thresholds[difficulty]
+    if i + 1 < len(DIFFICULTIES):
+        return low, thresholds[DIFFICULTIES[i + 1]] - 1
+    return low, int(low * DEADLY_CEILING)
+
+
+def rate(thresholds: Dict[str, int], adjusted_xp: float) -> str:
+    """Dificuldade de um encontro com o XP ajustado dado."""
+    rating = 'trivial'
+    for difficulty in DIFFICULTIES:
+        if adjusted_xp >= thresholds[difficulty]:
+            rating = difficulty
+    return rating
+
+
+class Composition(NamedTuple):
+    """Combinação de valores de XP: ``((xp, quantidade), ...)`` em ordem crescente de XP."""
+    counts: Tuple[Tuple[int, int], ...]
+    total: int
+    base_xp: int
+    multiplier: float
+
+    @property
+    def adjusted_xp(self) -> float:
+        return self.base_xp * self.multiplier
+
+
+def search_compositions(
+    xp_values: Sequence[int],
+    party_size: int,
+    band: Tuple[int, int],
+    max_creatures: int,
+    max_kinds: int,
+    limit: int,
+) -> List[Composition]:
+    """As ``limit`` combinações com XP ajustado mais perto do centro de ``band``.
+
+    ``xp_values`` precisa estar em ordem crescente e sem repetições.
+    """
+    low, high = band
+    target = (low + high) / 2
+    top_xp = xp_values[-1] if xp_values else 0
+    ceiling_factor = multiplier(max_creatures, party_size)
+    best: List[Tuple[float, int, int, Tuple[Tuple[int, int], ...], Composition]] = []
+
+    def record(counts: Tuple[Tuple[int, int], ...], total: int, base_xp: int, factor: float) -> None:
+        # Menor distância ao alvo; depois menos criaturas e menos tipos diferentes
+        entry = (-abs(base_xp * factor - target), -total, -len(counts), counts)
+        if len(best) < limit:
+            heapq.heappush(best, (*entry, Composition(counts, total, base_xp, factor)))
+        elif entry > best[0][:4]:
+            heapq.heapreplace(best, (*entry, Composition(counts, total, base_xp, factor)))
+
+    def visit(start: int, counts: Tuple[Tuple[int, int], ...], total: int, base_xp: int) -> None:
+        # Nem completando o grupo com a criatura de maior XP se chega ao piso
+        if (base_xp + (max_creatures - total) * top_xp) * ceiling_factor < low:
+            return
+        if len(counts) + 1 == max_kinds:
+            # Último tipo: o XP que falta para o piso é conhecido, então a
+            # busca binária pula direto para o primeiro valor que serve
+            for count in range(1, max_creatures - total + 1):
+                factor = multiplier(total + count, party_size)
+                first = bisect_left(xp_values, (low / factor - base_xp) / count, start)
+                for i in range(first, len(xp_values)):
+                    xp = xp_values[i]
+                    if (base_xp + xp * count) * factor > high:
+                        break
+                    record(counts + ((xp, count),), total + count, base_xp + xp * count, factor)
+            return
+        for i in range(start, len(xp_values)):
+            xp = xp_values[i]
+            # XP ajustado só cresce com mais criaturas: se uma desta já estoura o
+            # teto, as de XP maior também estouram
+            if (base_xp + xp) * multiplier(total + 1, party_size) > high:
+                break
+            for count in range(1, max_creatures - total + 1):
+                factor = multiplier(total + count, party_size)
+                if (base_xp + xp * count) * factor > high:
+                    break
+                extended = counts + ((xp, count),)
+                if low <= (base_xp + xp * count) * factor:
+                    record(extended, total + count, base_xp + xp * count, factor)
+                visit(i + 1, extended, total + count, base_xp + xp * count)
+
+    visit(0, (), 0, 0)
+    return [entry[-1] for entry in sorted(best, reverse=True)]
+
+
+class EncounterIndex:
+    """XP de cada criatura, calculado na carga, e criaturas agrupadas por XP."""
+
+    def __init__(self, creatures: Sequence[Criatura]):
+        self.creatures = tuple(creatures)
+        self.xp: Tuple[Optional[int], ...] = tuple(challenge_xp(c.nivel_desafio) for c in self.creatures)
+        # Posições em ordem crescente de XP (e de nome, entre XP iguais)
+        self.by_xp: Tuple[int, ...] = tuple(sorted(
+            (pos for pos, xp in enumerate(self.xp) if xp is not None),
+            key=lambda pos: (self.xp[pos], fold(self.creatures[pos].nome)),
+        ))
+
+    def buckets(self, tipo: Optional[str] = None) -> Dict[int, List[int]]:
+        """XP -> posições das criaturas com esse XP, em ordem crescente de XP."""
+        wanted = fold(tipo).strip() if tipo else None
+        buckets: Dict[int, List[int]] = {}
+        for pos in self.by_xp:
+            if wanted is None or fold(self.creatures[pos].tipo).strip() == wanted:
+                buckets.setdefault(self.xp[pos], []).append(pos)
+        return buckets
+
+    def build(
+        self,
+        levels: Sequence[int],
+        difficulty: str,
+        max_creatures: int,
+        max_kinds: int,
+        limit: int,
+        tipo: Optional[str] = None,
+    ) -> List[Tuple[Composition, List[Tuple[Criatura, int, int]]]]:
+        """Encontros mais equilibrados para o grupo: ``(combinação, [(criatura, xp, quantidade)])``.
+
+        Encontros seguidos com a mesma combinação de XP recebem criaturas
+        diferentes de cada faixa de XP, para variar as sugestões.
+        """
+        buckets = self.buckets(tipo)
+        band = xp_band(party_thresholds(levels), difficulty)
+        compositions = search_compositions(sorted(buckets), len(levels), band, max_creatures, max_kinds, limit)
+        encounters = []
+        for rank, composition in enumerate(compositions):
+            group = []
+            for xp, count in composition.counts:
+                bucket = buckets[xp]
+                group.append((self.creatures[bucket[rank % len(bucket)]], xp, count))
+            encounters.append((composition, group))
+        return encounters
@@ -0,0 +1,86 @@
+"""Exportação do catálogo completo em NDJSON (um JSON por linha).
+
+Cada linha é ``{"tipo": "<recurso>", "item": {...}}``, com o recurso pelo
+nome da rota (``criaturas``, ``deuses``) e o item no mesmo formato das rotas
+de detalhe. As linhas são geradas sob demanda a partir do
+snapshot e agrupadas em blocos de ``CHUNK_SIZE`` bytes: a memória usada não
+depende do tamanho do catálogo e o cliente pode processar as primeiras
+linhas antes do fim da transferência.
+"""
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from pydantic import BaseModel
+
+from repository.dataset import Dataset
+from repository.serialization import BACKEND, BACKENDS
+
+MEDIA_TYPE = "application/x-ndjson"
+
+# Tamanho aproximado de cada bloco enviado ao cliente
+CHUNK_SIZE = 64 * 1024
+
+# Tipo exportado (o nome da rota pública, como em ``/search`` e ``/batch``) ->
+# atributo do ``Dataset``, na ordem dos arquivos de dados
+EXPORT_TYPES: Dict[str, str] = {
+    'racas': 'races',
+    'classes': 'classes',
+    'backgrounds': 'backgrounds',
+    'equipment': 'equipment',
+    'weapons': 'weapons',
+    'armor': 'armor',
+    'tools': 'tools',
+    'mounts': 'mounts',
+    'feats': 'feats',
+    'multiclass': 'multiclass',
+    'abilities': 'abilities',
+    'skills': 'skills',
+    'rules': 'rules',
+    'rules/combat': 'combat_rules',
+    'travel': 'travel',
+    'rest': 'rest',
+    'environment': 'environment',
+    'actions': 'actions',
+    'conditions': 'conditions',
+    'spells': 'spells',
+    'deuses': 'deities',
+    'planos': 'planes',
+    'criaturas': 'creatures',
+    'leituras': 'leituras',
+    'currency': 'currency',
+    'services': 'services',
+    'lifestyles': 'lifestyles',
+}
+
+_dumps = BACKENDS[BACKEND]
+
+
+def item_json(item: Any) -> bytes:
+    """JSON de uma entidade; modelos usam o serializador do Pydantic, como as rotas."""
+    if isinstance(item, BaseModel):
+        return item.__pydantic_serializer__.to_json(item, by_alias=True)
+    return _dumps(item)
+
+
+def iter_lines(dataset: Dataset, tipos: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """Uma linha NDJSON por entidade dos recursos pedidos (todos, por padrão)."""
+    for tipo in tipos or EXPORT_TYPES:
+        prefix = b'{"tipo":' + _dumps(tipo) + b',"item":'
+        for item in getattr(dataset, EXPORT_TYPES[tipo]):
+            yield prefix + item_json(item) + b"}\n"
+
+
+def chunked(lines: Iterable[bytes], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Agrupa linhas em blocos de cerca de ``size`` bytes."""
+    buffer = bytearray()
+    for line in lines:
+        buffer += line
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_ndjson(dataset: Dataset, tipos: Optional[Sequence[str]] = None) -> Iterator[bytes]:
+    """Corpo NDJSON do export, em blocos."""
+    return chunked(iter_lines(dataset, tipos))
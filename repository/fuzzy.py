@@ -0,0 +1,83 @@
+"""Índice de trigramas para busca de nomes tolerante a erros de digitação."""
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from repository.search import tokenize
+
+# Similaridade mínima (Jaccard entre trigramas) para um candidato ser retornado
+DEFAULT_THRESHOLD = 0.3
+
+# Termos até este tamanho também são comparados por distância de edição, já que
+# em palavras curtas uma única letra trocada destrói quase todos os trigramas
+SHORT_TERM = 12
+
+# Similaridade mínima por distância de edição (no máximo 40% de letras alteradas)
+EDIT_THRESHOLD = 0.6
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """1 - distância de edição normalizada (com transposição de letras adjacentes)."""
+    if not a or not b:
+        return 0.0
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return 1 - previous[-1] / max(len(a), len(b))
+
+
+def trigrams(text: Optional[str]) -> Set[str]:
+    """Trigramas de cada palavra, com bordas marcadas como no pg_trgm."""
+    grams: Set[str] = set()
+    for word in tokenize(text):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Listas de postagem trigrama -> posições dos nomes que o contêm."""
+
+    def __init__(self, names: Sequence[str]):
+        self.names = [' '.join(tokenize(name)) for name in names]
+        self.sizes: List[int] = []
+        self.postings: Dict[str, Set[int]] = {}
+        for pos, name in enumerate(names):
+            grams = trigrams(name)
+            self.sizes.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, set()).add(pos)
+
+    def search(self, term: str, threshold: float = DEFAULT_THRESHOLD, limit: int = 10) -> List[Tuple[int, float]]:
+        """Pares (posição, similaridade) ordenados do mais ao menos parecido.
+
+        Os candidatos são os nomes que compartilham ao menos um trigrama com o
+        termo; a similaridade é o Jaccard dos trigramas ou, para termos curtos,
+        a distância de edição normalizada, se maior.
+        """
+        query = trigrams(term)
+        folded = ' '.join(tokenize(term))
+        if not query:
+            return []
+        shared: Dict[int, int] = {}
+        for gram in query:
+            for pos in self.postings.get(gram, ()):
+                shared[pos] = shared.get(pos, 0) + 1
+
+        scored = []
+        for pos, count in shared.items():
+            similarity = count / (len(query) + self.sizes[pos] - count)
+            name = self.names[pos]
+            if similarity < threshold and len(folded) <= SHORT_TERM and len(name) <= SHORT_TERM:
+                edit = edit_similarity(folded, name)
+                if edit >= EDIT_THRESHOLD:
+                    similarity = edit
+            if similarity >= threshold:
+                scored.append((pos, similarity))
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
@@ -0,0 +1,303 @@
+"""Índices secundários construídos uma única vez sobre o snapshot de dados."""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from pydantic import BaseModel
+
+from models.creature import Criatura
+from models.spell import Spell
+from repository.dice import parse_hit_points
+from repository.text import fold
+
+
+def _key(value: str) -> str:
+    return value.lower().strip()
+
+
+def _intersect(postings: List[Set[int]]) -> Set[int]:
+    """Interseção de listas de postagem, começando pela menor."""
+    postings = sorted(postings, key=len)
+    result = set(postings[0])
+    for posting in postings[1:]:
+        result &= posting
+        if not result:
+            break
+    return result
+
+
+class SpellIndex:
+    """Listas de postagem para cada campo filtrável das magias.
+
+    Cada campo mapeia um valor para o conjunto de posições das magias que o
+    possuem; consultas com vários filtros são resolvidas por interseção de
+    conjuntos e devolvidas na ordem original do catálogo.
+    """
+
+    def __init__(self, spells: Tuple[Spell, ...]):
+        self.spells = spells
+        self.all: Set[int] = set(range(len(spells)))
+        self.by_level: Dict[int, Set[int]] = {}
+        self.by_school: Dict[str, Set[int]] = {}
+        self.by_class: Dict[str, Set[int]] = {}
+        self.by_component: Dict[str, Set[int]] = {}
+        self.by_ritual: Dict[bool, Set[int]] = {True: set(), False: set()}
+        self.by_concentration: Dict[bool, Set[int]] = {True: set(), False: set()}
+        self.by_range: Dict[str, Set[int]] = {}
+
+        for pos, spell in enumerate(spells):
+            self.by_level.setdefault(spell.nivel, set()).add(pos)
+            self.by_school.setdefault(_key(spell.escola), set()).add(pos)
+            for classe in spell.classes_conjuradoras:
+                self.by_class.setdefault(_key(classe), set()).add(pos)
+            for component in spell.componentes:
+                self.by_component.setdefault(component, set()).add(pos)
+            self.by_ritual[spell.ritual].add(pos)
+            self.by_concentration[spell.concentracao].add(pos)
+            self.by_range.setdefault(_key(spell.alcance), set()).add(pos)
+
+    def _materialize(self, positions: Iterable[int]) -> List[Spell]:
+        return [self.spells[pos] for pos in sorted(positions)]
+
+    def query(
+        self,
+        level: Optional[int] = None,
+        school: Optional[str] = None,
+        class_: Optional[str] = None,
+        component: Optional[str] = None,
+        ritual: Optional[bool] = None,
+        concentration: Optional[bool] = None,
+        range_: Optional[str] = None,
+    ) -> List[Spell]:
+        """Magias que satisfazem todos os filtros informados."""
+        postings: List[Set[int]] = []
+        if level is not None and level >= 0:
+            postings.append(self.by_level.get(level, set()))
+        if school and school.strip():
+            postings.append(self.by_school.get(_key(school), set()))
+        if class_ and class_.strip():
+            postings.append(self.by_class.get(_key(class_), set()))
+        if component and component.strip():
+            postings.append(self.by_component.get(component.upper().strip(), set()))
+        if ritual is not None:
+            postings.append(self.by_ritual[ritual])
+        if concentration is not None:
+            postings.append(self.by_concentration[concentration])
+        if range_ and range_.strip():
+            postings.append(self.by_range.get(_key(range_), set()))
+
+        if not postings:
+            return list(self.spells)
+        return self._materialize(_intersect(postings))
+
+    def at_level(self, level: int) -> List[Spell]:
+        """Magias de um nível exato."""
+        return self._materialize(self.by_level.get(level, set()))
+
+    def by_classes(self, classes: Iterable[str]) -> List[Spell]:
+        """Magias conjuráveis por qualquer uma das classes informadas."""
+        positions: Set[int] = set()
+        for classe in classes:
+            positions |= self.by_class.get(_key(classe), set())
+        return self._materialize(positions)
+
+    def by_school_containing(self, term: str) -> List[Spell]:
+        """Magias cuja escola contém o termo (percorre apenas as escolas distintas)."""
+        term = term.lower()
+        positions: Set[int] = set()
+        for school, posting in self.by_school.items():
+            if term in school:
+                positions |= posting
+        return self._materialize(positions)
+
+
+# Modos de deslocamento reconhecidos em ``deslocamento`` ("9 m, voo 18 m")
+MOVEMENT_MODES = ('voo', 'natacao', 'escalar', 'escavar')
+
+_SPEED = re.compile(r'^\s*(?:(\w+)\s+)?(\d+(?:,\d+)?)\s*m\b')
+# Vírgula que separa modos, não a decimal de "1,5 m"
+_SPEED_SEPARATOR = re.compile(r',\s*(?=\D)')
+_PASSIVE_PERCEPTION = re.compile(r'percep[çc][ãa]o passiva\s+(\d+)', re.IGNORECASE)
+
+
+def _meters(text: str) -> float:
+    return float(text.replace(',', '.'))
+
+
+def parse_speeds(text: str) -> Dict[str, float]:
+    """``"9 m, voo 18 m"`` -> ``{"deslocamento": 9.0, "voo": 18.0}``; modos ausentes valem 0."""
+    speeds = {'deslocamento': 0.0, **{mode: 0.0 for mode in MOVEMENT_MODES}}
+    for part in _SPEED_SEPARATOR.split(text):
+        match = _SPEED.match(part)
+        if match is None:
+            continue
+        mode = fold(match.group(1)) or 'deslocamento'
+        if mode in speeds:
+            speeds[mode] = _meters(match.group(2))
+    return speeds
+
+
+def passive_perception(creature: Criatura) -> int:
+    """Percepção passiva de ``sentidos``; sem ela, 10 + modificador de Sabedoria."""
+    for sense in creature.sentidos or []:
+        match = _PASSIVE_PERCEPTION.search(sense)
+        if match:
+            return int(match.group(1))
+    return 10 + (creature.atributos.get('SAB', 10) - 10) // 2
+
+
+class CreatureStatIndex:
+    """Colunas numéricas das criaturas, extraídas uma vez, com consultas por faixa.
+
+    Cada coluna guarda os valores na ordem do catálogo e as posições
+    ordenadas pelo valor. Uma faixa ``[mínimo, máximo]`` são duas buscas
+    binárias e um recorte da ordem; os filtros são combinados por interseção
+    de conjuntos, como no ``SpellIndex``, sem percorrer as criaturas.
+    """
+
+    COLUMNS = (
+        'ca', 'pv', 'for', 'des', 'con', 'int', 'sab', 'car',
+        'deslocamento', *MOVEMENT_MODES, 'percepcao_passiva',
+    )
+
+    def __init__(self, creatures: Tuple[Criatura, ...]):
+        self.creatures = creatures
+        rows = [self._row(creature) for creature in creatures]
+        self.columns: Dict[str, Tuple[float, ...]] = {
+            column: tuple(row[column] for row in rows) for column in self.COLUMNS
+        }
+        self._order: Dict[str, Tuple[int, ...]] = {}
+        self._sorted: Dict[str, Tuple[float, ...]] = {}
+        for column, values in self.columns.items():
+            order = tuple(sorted(range(len(values)), key=values.__getitem__))
+            self._order[column] = order
+            self._sorted[column] = tuple(values[pos] for pos in order)
+
+    @staticmethod
+    def _row(creature: Criatura) -> Dict[str, float]:
+        hit_points, _ = parse_hit_points(creature.pv)
+        row = {'ca': creature.ca, 'pv': hit_points or 0}
+        for ability in ('FOR', 'DES', 'CON', 'INT', 'SAB', 'CAR'):
+            row[ability.lower()] = creature.atributos.get(ability, 10)
+        row.update(parse_speeds(creature.deslocamento))
+        row['percepcao_passiva'] = passive_perception(creature)
+        return row
+
+    def between(self, column: str, minimum: Optional[float] = None, maximum: Optional[float] = None) -> Set[int]:
+        """Posições com ``mínimo <= valor <= máximo`` na coluna (limites opcionais)."""
+        values = self._sorted[column]
+        start = 0 if minimum is None else bisect_left(values, minimum)
+        end = len(values) if maximum is None else bisect_right(values, maximum)
+        return set(self._order[column][start:end])
+
+    def positive(self, column: str) -> Set[int]:
+        """Posições com valor maior que zero (ex.: criaturas que voam)."""
+        values = self._sorted[column]
+        return set(self._order[column][bisect_right(values, 0):])
+
+    def query(
+        self,
+        ranges: Dict[str, Tuple[Optional[float], Optional[float]]],
+        modes: Dict[str, bool],
+    ) -> List[Criatura]:
+        """Criaturas dentro de todas as faixas e com (ou sem) cada modo de deslocamento."""
+        postings: List[Set[int]] = [
+            self.between(column, minimum, maximum)
+            for column, (minimum, maximum) in ranges.items()
+            if minimum is not None or maximum is not None
+        ]
+        everything = set(range(len(self.creatures)))
+        for mode, wanted in modes.items():
+            if wanted is not None:
+                moving = self.positive(mode)
+                postings.append(moving if wanted else everything - moving)
+        if not postings:
+            return list(self.creatures)
+        return [self.creatures[pos] for pos in sorted(_intersect(postings))]
+
+
+def collation_key(value: Any) -> Tuple:
+    """Chave de ordenação de um valor: números antes de textos; textos sem
+    diferenciar acentos e maiúsculas ('Águia' junto de 'aguia'), com o texto
+    original só como desempate."""
+    if isinstance(value, str):
+        return (1, fold(value), value)
+    return (0, value)
+
+
+def scalar_columns(items: Sequence[Any]) -> Dict[str, Tuple[Any, ...]]:
+    """Campos de primeiro nível que só têm textos, números ou booleanos."""
+    if not items:
+        return {}
+    if isinstance(items[0], BaseModel):
+        names: Iterable[str] = type(items[0]).model_fields
+        values = lambda name: tuple(getattr(item, name) for item in items)
+    else:
+        names = dict.fromkeys(key for item in items for key in item)
+        values = lambda name: tuple(item.get(name) for item in items)
+    columns = {}
+    for name in names:
+        column = values(name)
+        present = [value for value in column if value is not None]
+        if present and all(isinstance(value, (str, int, float)) for value in present):
+            columns[name] = column
+    return columns
+
+
+class SortIndex:
+    """Ordens de um recurso por cada campo, precomputadas na carga.
+
+    Cada coluna vira uma tupla de postos (a posição do valor na ordem de
+    ``collation_key``), alinhada com ``items``; ordenar por vários campos é
+    comparar tuplas de inteiros, e a ordem resultante fica guardada. Uma lista
+    filtrada não é reordenada: a ordem completa é percorrida e só os itens da
+    lista são mantidos. Itens sem valor no campo ficam sempre no fim.
+    """
+
+    # Ordens com vários campos guardadas por recurso
+    MAX_CACHED_ORDERS = 64
+
+    def __init__(self, items: Sequence[Any], columns: Dict[str, Sequence[Any]]):
+        self.items = tuple(items)
+        self._positions = {id(item): pos for pos, item in enumerate(self.items)}
+        self._ascending: Dict[str, Tuple[Tuple[bool, int], ...]] = {}
+        self._descending: Dict[str, Tuple[Tuple[bool, int], ...]] = {}
+        for name, column in columns.items():
+            keys = [None if value is None else collation_key(value) for value in column]
+            rank = {key: r for r, key in enumerate(sorted(set(key for key in keys if key is not None)))}
+            self._ascending[name] = tuple((key is None, 0 if key is None else rank[key]) for key in keys)
+            self._descending[name] = tuple((key is None, 0 if key is None else -rank[key]) for key in keys)
+        self._orders: Dict[Tuple[Tuple[str, bool], ...], Tuple[int, ...]] = {}
+        for name in columns:
+            for descending in (False, True):
+                self._orders[(name, descending),] = self._compute(((name, descending),))
+        self._single = len(self._orders)
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._ascending)
+
+    def _compute(self, spec: Tuple[Tuple[str, bool], ...]) -> Tuple[int, ...]:
+        columns = [(self._descending if descending else self._ascending)[name] for name, descending in spec]
+        if len(columns) == 1:
+            return tuple(sorted(range(len(self.items)), key=columns[0].__getitem__))
+        return tuple(sorted(range(len(self.items)), key=lambda pos: tuple(column[pos] for column in columns)))
+
+    def order(self, spec: Tuple[Tuple[str, bool], ...]) -> Tuple[int, ...]:
+        """Posições na ordem de ``spec`` (``((campo, decrescente), ...)``)."""
+        order = self._orders.get(spec)
+        if order is None:
+            order = self._compute(spec)
+            if len(self._orders) < self._single + self.MAX_CACHED_ORDERS:
+                self._orders[spec] = order
+        return order
+
+    def sort(self, items: Sequence[Any], spec: Tuple[Tuple[str, bool], ...]) -> List[Any]:
+        """``items`` (todos ou parte dos itens do recurso) na ordem de ``spec``."""
+        order = self.order(spec)
+        if len(items) == len(self.items):
+            return [self.items[pos] for pos in order]
+        wanted = bytearray(len(self.items))
+        for item in items:
+            wanted[self._positions[id(item)]] = 1
+        return [self.items[pos] for pos in order if wanted[pos]]
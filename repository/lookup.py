@@ -0,0 +1,54 @@
+"""Acesso direto a entidades por id, slug ou nome, com sugestão em caso de erro."""
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from repository.fuzzy import TrigramIndex
+from repository.text import slugify
+
+
+class EntityIndex:
+    """Mapas de id e de slug para a posição de cada entidade.
+
+    O slug cobre tanto o nome quanto o próprio id normalizados, então
+    ``dragao-vermelho-adulto``, ``Dragão Vermelho Adulto`` e
+    ``dragão vermelho adulto`` levam à mesma entidade. Quando nada é
+    encontrado, o índice de trigramas do recurso sugere o id mais parecido.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[Any],
+        id_of: Callable[[Any], Any],
+        name_of: Callable[[Any], Optional[str]],
+        fuzzy: TrigramIndex,
+    ):
+        self.items = tuple(items)
+        self.ids = tuple(id_of(item) for item in self.items)
+        self.fuzzy = fuzzy
+        self.by_id: Dict[str, int] = {}
+        self.by_slug: Dict[str, int] = {}
+        # Em ids repetidos vale o primeiro, como na busca linear de antes
+        for pos, item_id in enumerate(self.ids):
+            self.by_id.setdefault(str(item_id), pos)
+        for pos, item in enumerate(self.items):
+            self.by_slug.setdefault(slugify(name_of(item)), pos)
+        for pos, item_id in enumerate(self.ids):
+            self.by_slug.setdefault(slugify(str(item_id)), pos)
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Entidade com o id exato ou, em seguida, com o mesmo slug."""
+        pos = self.by_id.get(str(key))
+        if pos is None:
+            pos = self.by_slug.get(slugify(str(key)))
+        return None if pos is None else self.items[pos]
+
+    def suggest(self, key: Any) -> Optional[Any]:
+        """Id da entidade de nome mais parecido com a chave, se houver."""
+        matches = self.fuzzy.search(str(key), limit=1)
+        return self.ids[matches[0][0]] if matches else None
+
+    def not_found(self, key: Any, message: str) -> str:
+        """Mensagem de 404 acrescida de "você quis dizer", quando há sugestão."""
+        suggestion = self.suggest(key)
+        if suggestion is None:
+            return message
+        return f"{message.rstrip('.')}. Você quis dizer '{suggestion}'?"
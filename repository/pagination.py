@@ -0,0 +1,112 @@
+"""Paginação por cursor comum a todos os endpoints de lista.
+
+O corpo continua sendo a lista de itens, para não quebrar clientes atuais; os
+metadados vão nos cabeçalhos:
+
+- ``Link: <...>; rel="next"`` com a URL da próxima página;
+- ``X-Next-Cursor`` com o cursor opaco da próxima página;
+- ``X-Total-Count`` com o total de itens antes do corte.
+
+Sem ``limit``, ``offset`` nem ``cursor`` a lista completa é retornada, como
+antes. O cursor guarda a posição na ordem precomputada da lista e a versão do
+dataset, então um cursor de outra versão dos dados é rejeitado em vez de
+pular ou repetir itens. A versão é a do dataset da requisição
+(``aget_dataset`` como dependência, resolvida uma vez por requisição e
+compartilhada com o handler e a ordenação): uma recarga no meio da
+requisição não mistura versões.
+"""
+import base64
+import binascii
+from typing import List, Optional, Sequence, TypeVar
+from urllib.parse import quote
+
+from fastapi import Depends, HTTPException, Query, Request, Response
+
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+
+T = TypeVar("T")
+
+# Tamanho de página quando só ``offset`` ou ``cursor`` é informado
+DEFAULT_LIMIT = 20
+
+# Maior página aceita em ``limit``
+MAX_LIMIT = 100
+
+
+def encode_cursor(offset: int, version: str) -> str:
+    token = f"{offset}:{version}".encode("ascii")
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, version: str) -> int:
+    """Posição guardada no cursor; 400 se inválido ou de outra versão dos dados."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset, _, cursor_version = base64.urlsafe_b64decode(padded).decode("ascii").partition(":")
+        offset = int(offset)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Cursor inválido.")
+    if cursor_version != version:
+        raise HTTPException(status_code=400, detail="Cursor expirado: os dados mudaram, recomece a paginação.")
+    return offset
+
+
+class Pagination:
+    """Parâmetros de paginação de um endpoint de lista (ver ``get_pagination``)."""
+
+    def __init__(
+        self,
+        request: Request,
+        response: Response,
+        version: str,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ):
+        self.request = request
+        self.response = response
+        self.version = version
+        self.limit = limit
+        self.offset = offset
+        self.cursor = cursor
+
+    @property
+    def active(self) -> bool:
+        """Se algum parâmetro de paginação foi informado."""
+        return self.limit is not None or self.offset is not None or self.cursor is not None
+
+    def apply(self, items: Sequence[T]) -> List[T]:
+        """Recorta a página de ``items`` e preenche os cabeçalhos de navegação."""
+        if not self.active:
+            return items
+        start = decode_cursor(self.cursor, self.version) if self.cursor is not None else (self.offset or 0)
+        limit = self.limit or DEFAULT_LIMIT
+        end = start + limit
+        self.response.headers["X-Total-Count"] = str(len(items))
+        if end < len(items):
+            cursor = encode_cursor(end, self.version)
+            url = self.request.url.remove_query_params("offset").include_query_params(limit=limit, cursor=cursor)
+            # O path do scope vem decodificado ("/spells/escola/Evocação"); cabeçalhos só aceitam ASCII
+            url = url.replace(path=quote(url.path))
+            self.response.headers["X-Next-Cursor"] = cursor
+            self.response.headers["Link"] = f'<{url}>; rel="next"'
+        return list(items[start:end])
+
+
+async def get_pagination(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_LIMIT, description=f"Máximo de itens por página (1-{MAX_LIMIT})"),
+    offset: Optional[int] = Query(None, ge=0, description="Posição do primeiro item da página"),
+    cursor: Optional[str] = Query(None, description="Cursor opaco da próxima página (cabeçalho X-Next-Cursor); tem precedência sobre offset"),
+    dataset: Dataset = Depends(aget_dataset),
+) -> Pagination:
+    """Dependência dos endpoints de lista.
+
+    É uma função assíncrona, e não a própria classe, para rodar direto no
+    event loop: dependências síncronas passam pelo threadpool.
+    """
+    return Pagination(request, response, dataset.version, limit, offset, cursor)
@@ -0,0 +1,141 @@
+"""Projeção de campos (``fields=``) para respostas de lista e de detalhe.
+
+``?fields=nome,nivel,escola`` devolve só esses campos de cada item. Campos
+aninhados usam ponto: ``?fields=nome,niveis.nivel`` mantém apenas ``nivel``
+dentro de cada elemento de ``niveis``.
+
+A projeção acontece antes da serialização: o Pydantic só monta os campos
+pedidos (``model_dump(include=...)``) e o resultado vai direto para o backend
+JSON configurado, sem passar pela validação do ``response_model``.
+"""
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel
+
+from repository.serialization import DefaultJSONResponse
+from repository.timing import phase
+
+# Árvore de campos: nome -> subárvore; subárvore vazia significa o campo inteiro
+FieldTree = Dict[str, "FieldTree"]
+
+
+def parse_fields(fields: str) -> FieldTree:
+    """``"nome,niveis.nivel"`` -> ``{"nome": {}, "niveis": {"nivel": {}}}``."""
+    tree: FieldTree = {}
+    for path in fields.split(","):
+        path = path.strip()
+        if not path:
+            continue
+        node = tree
+        *parents, leaf = path.split(".")
+        for name in parents:
+            # "niveis" inteiro prevalece sobre "niveis.nivel"
+            if name in node and not node[name]:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node[leaf] = {}
+    return tree
+
+
+def project(value: Any, tree: FieldTree) -> Any:
+    """Mantém em ``value`` apenas os campos da árvore, convertendo para JSON."""
+    if isinstance(value, (list, tuple)):
+        return [project(item, tree) for item in value]
+    if isinstance(value, BaseModel):
+        value = value.model_dump(mode="json", by_alias=True, include=set(tree))
+    if isinstance(value, dict):
+        return {name: project(value[name], sub) if sub else value[name] for name, sub in tree.items() if name in value}
+    return value
+
+
+def available_fields(value: Any) -> list:
+    """Campos de primeiro nível dos itens: os do modelo ou, em recursos guardados
+    como dicts, a união das chaves; vazio quando não há como saber."""
+    items = value if isinstance(value, (list, tuple)) else [value]
+    if not items:
+        return []
+    if isinstance(items[0], BaseModel):
+        return list(type(items[0]).model_fields)
+    if isinstance(items[0], dict):
+        return list(dict.fromkeys(key for item in items for key in item))
+    return []
+
+
+def nested_values(value: Any, name: str) -> list:
+    """Valores de ``name`` em todos os itens, com as listas achatadas e sem ``None``."""
+    items = value if isinstance(value, (list, tuple)) else [value]
+    values = []
+    for item in items:
+        if isinstance(item, BaseModel):
+            child = getattr(item, name, None)
+        elif isinstance(item, dict):
+            child = item.get(name)
+        else:
+            continue
+        if isinstance(child, (list, tuple)):
+            values.extend(c for c in child if c is not None)
+        elif child is not None:
+            values.append(child)
+    return values
+
+
+def unknown_fields(value: Any, tree: FieldTree, prefix: str = "") -> list:
+    """Caminhos de ``tree`` que não existem nos itens, inclusive os aninhados
+    (``niveis.xyz``); sem itens para conferir, nada é recusado."""
+    available = available_fields(value)
+    if not available:
+        return []
+    unknown = []
+    for name, sub in tree.items():
+        if name not in available:
+            unknown.append(prefix + name)
+        elif sub:
+            children = nested_values(value, name)
+            if children and not available_fields(children):
+                # Campo sem subcampos (texto, número): nenhum caminho abaixo dele existe
+                unknown.extend(f"{prefix}{name}.{child}" for child in sub)
+            else:
+                unknown.extend(unknown_fields(children, sub, f"{prefix}{name}."))
+    return unknown
+
+
+class Projection:
+    """Parâmetro ``fields`` de um endpoint (ver ``get_projection``)."""
+
+    def __init__(self, response: Response, fields: Optional[str] = None):
+        self.response = response
+        self.tree = parse_fields(fields) if fields else {}
+
+    @property
+    def active(self) -> bool:
+        """Se ``fields`` foi informado."""
+        return bool(self.tree)
+
+    def apply(self, value: Any) -> Any:
+        """Resposta só com os campos pedidos; sem ``fields``, devolve ``value`` intacto."""
+        if not self.active:
+            return value
+        unknown = unknown_fields(value, self.tree)
+        if unknown:
+            available = ", ".join(available_fields(value))
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos inválidos: {', '.join(unknown)}. Campos disponíveis: {available}",
+            )
+        with phase("model"):
+            projected = project(value, self.tree)
+        # Cabeçalhos definidos por outras dependências (ex.: paginação) são preservados
+        return DefaultJSONResponse(projected, headers=dict(self.response.headers))
+
+
+async def get_projection(
+    response: Response,
+    fields: Optional[str] = Query(
+        None,
+        description="Campos a retornar, separados por vírgula; use ponto para campos aninhados, ex: 'nome,nivel,escola' ou 'nome,niveis.nivel'",
+    ),
+) -> Projection:
+    """Dependência de ``fields``; assíncrona para não passar pelo threadpool."""
+    return Projection(response, fields)
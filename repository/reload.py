@@ -0,0 +1,96 @@
+"""Recarga dos arquivos de dados sem reiniciar o processo.
+
+Três gatilhos chamam ``reload_data``:
+
+- ``DataWatcher``, que verifica ``mtime``/tamanho de ``data/*.json`` a cada
+  ``DND_API_RELOAD_INTERVAL`` segundos;
+- o sinal ``SIGHUP`` (o ``server.py`` repassa o sinal a todos os workers);
+- o endpoint ``POST /admin/reload``, que recarrega o worker que o atendeu.
+
+O novo dataset é montado fora do caminho das requisições e trocado de uma
+vez; como a versão faz parte do ETag, do cache das respostas
+pré-serializadas e dos cursores de paginação, tudo isso muda junto.
+"""
+import logging
+import os
+import signal
+import threading
+from typing import Optional, Tuple
+
+from repository.dataset import data_signature, get_dataset, reload_dataset
+from repository.responses import warm_responses
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (segundos) entre verificações dos arquivos; 0 ou ausente desliga o watcher
+RELOAD_INTERVAL = float(os.environ.get("DND_API_RELOAD_INTERVAL", "0"))
+
+_reload_lock = threading.Lock()
+
+
+def reload_data() -> Tuple[str, str]:
+    """Recarrega o dataset e re-renderiza as respostas em cache; ``(versão anterior, nova)``."""
+    with _reload_lock:
+        previous = get_dataset().version
+        dataset = reload_dataset()
+        if dataset.version != previous:
+            warm_responses()
+            logger.info("Dataset recarregado: %s -> %s", previous, dataset.version)
+        return previous, dataset.version
+
+
+def reload_in_background() -> threading.Thread:
+    """Dispara ``reload_data`` numa thread; erros são registrados e o dataset atual continua."""
+    def run():
+        try:
+            reload_data()
+        except Exception:
+            logger.exception("Falha ao recarregar os dados; mantendo a versão atual")
+
+    thread = threading.Thread(target=run, name="dataset-reload", daemon=True)
+    thread.start()
+    return thread
+
+
+class DataWatcher:
+    """Thread que recarrega o dataset quando algum arquivo de dados muda."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = data_signature()
+
+    def check(self) -> bool:
+        """Recarrega se os arquivos mudaram desde a última verificação."""
+        signature = data_signature()
+        if signature == self._signature:
+            return False
+        try:
+            reload_data()
+        except Exception:
+            # Arquivo salvo pela metade ou inválido: tenta de novo na próxima mudança
+            logger.exception("Falha ao recarregar os dados; mantendo a versão atual")
+        self._signature = signature
+        return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def install_reload_signal() -> bool:
+    """Faz ``SIGHUP`` disparar uma recarga; só é possível na thread principal."""
+    if not hasattr(signal, "SIGHUP") or threading.current_thread() is not threading.main_thread():
+        return False
+    signal.signal(signal.SIGHUP, lambda signum, frame: reload_in_background())
+    return True
@@ -0,0 +1,63 @@
+"""Respostas JSON pré-serializadas para os endpoints de lista completa.
+
+Endpoints como ``/spells`` sem filtros devolvem sempre o mesmo payload. Em vez
+de validar pelo ``response_model`` e codificar para JSON a cada chamada, o
+corpo é renderizado uma vez por versão do dataset e servido como bytes, junto
+com as variantes já comprimidas em gzip/br.
+"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+
+from middleware.compression import PrecompressedResponse, precompress
+from repository.dataset import get_dataset
+from repository.timing import phase
+
+
+class CachedResponse:
+    """Corpo JSON de um endpoint, renderizado uma vez por versão do dataset.
+
+    ``produce`` devolve o mesmo valor que a rota retornaria; ele é serializado
+    com o ``response_model`` da rota, na mesma forma que o FastAPI usaria.
+    """
+
+    def __init__(self, produce: Callable[[], Any], response_type: Any = Any):
+        self.produce = produce
+        self.adapter = TypeAdapter(response_type)
+        # (versão do dataset, variantes do corpo); substituído de uma vez para ser seguro entre threads
+        self._entry: Optional[Tuple[str, Dict[str, bytes]]] = None
+
+    def render(self) -> bytes:
+        return self.adapter.dump_json(self.produce(), by_alias=True)
+
+    def variants(self) -> Dict[str, bytes]:
+        """Corpo da versão atual do dataset por codificação, renderizando se a versão mudou."""
+        version = get_dataset().version
+        entry = self._entry
+        if entry is None or entry[0] != version:
+            with phase("serialize"):
+                entry = (version, precompress(self.render()))
+            self._entry = entry
+        return entry[1]
+
+    def body(self) -> bytes:
+        return self.variants()["identity"]
+
+    def __call__(self) -> PrecompressedResponse:
+        return PrecompressedResponse(self.variants())
+
+
+_registry: List[CachedResponse] = []
+
+
+def cached_response(produce: Callable[[], Any], response_type: Any = Any) -> CachedResponse:
+    """Registra uma resposta pré-serializada, renderizada em ``warm_responses``."""
+    response = CachedResponse(produce, response_type)
+    _registry.append(response)
+    return response
+
+
+def warm_responses() -> None:
+    """Renderiza todas as respostas registradas (chamado na inicialização)."""
+    for response in _registry:
+        response.variants()
@@ -0,0 +1,79 @@
+"""Índice invertido com ranqueamento BM25 sobre os textos de todas as entidades."""
+import math
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from repository.text import fold
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Quebra o texto em termos normalizados (sem acento, minúsculos)."""
+    return TOKEN_RE.findall(fold(text))
+
+
+@dataclass(frozen=True)
+class SearchDocument:
+    """Entidade indexada: tipo, identificador usado na rota de detalhe e nome."""
+    tipo: str
+    id: Union[int, str]
+    nome: str
+    url: str
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    document: SearchDocument
+    score: float
+
+
+class InvertedIndex:
+    """Índice invertido termo -> {documento: frequência}, ranqueado com BM25."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.documents: List[SearchDocument] = []
+        self.lengths: List[int] = []
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.avg_length = 0.0
+
+    def add(self, document: SearchDocument, texts: Iterable[Optional[str]]) -> None:
+        doc_id = len(self.documents)
+        tokens = [token for text in texts for token in tokenize(text)]
+        self.documents.append(document)
+        self.lengths.append(len(tokens))
+        for token in tokens:
+            posting = self.postings.setdefault(token, {})
+            posting[doc_id] = posting.get(doc_id, 0) + 1
+        self.avg_length = sum(self.lengths) / len(self.lengths)
+
+    def idf(self, term: str) -> float:
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.documents) - n + 0.5) / (n + 0.5))
+
+    def search(self, query: str, tipos: Optional[Iterable[str]] = None, limit: int = 20) -> List[SearchHit]:
+        """Documentos que contêm algum termo da consulta, do mais ao menos relevante."""
+        tipos = set(tipos) if tipos else None
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / self.avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked: List[Tuple[int, float]] = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        hits = []
+        for doc_id, score in ranked:
+            document = self.documents[doc_id]
+            if tipos is not None and document.tipo not in tipos:
+                continue
+            hits.append(SearchHit(document, score))
+            if len(hits) >= limit:
+                break
+        return hits
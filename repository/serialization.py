@@ -0,0 +1,80 @@
+"""Camada de serialização JSON plugável das respostas da API.
+
+O backend é escolhido pela variável de ambiente ``DND_API_JSON_BACKEND``
+(``orjson`` ou ``json``). Sem ela, usa ``orjson`` quando instalado.
+
+Rotas com ``response_model`` já são serializadas direto para bytes pelo
+núcleo em Rust do Pydantic, caminho mais rápido que qualquer backend e que
+o FastAPI só usa enquanto a classe de resposta é a padrão. Por isso
+``JSONRoute`` troca a classe de resposta apenas das rotas *sem*
+``response_model``, que antes passavam por ``json.dumps``.
+"""
+import json
+import os
+from typing import Any, Callable, Dict, Type
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+
+from repository.timing import timed_endpoint
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+
+def json_dumps(content: Any) -> bytes:
+    """Mesma saída do ``JSONResponse`` do Starlette."""
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+BACKENDS: Dict[str, Callable[[Any], bytes]] = {"json": json_dumps}
+if orjson is not None:
+    BACKENDS["orjson"] = orjson_dumps
+
+DEFAULT_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def response_class(backend: str) -> Type[JSONResponse]:
+    """Classe de resposta JSON que renderiza com o backend informado."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend JSON '{backend}' indisponível. Opções: {', '.join(sorted(BACKENDS))}")
+    dumps = BACKENDS[backend]
+
+    class BackendJSONResponse(JSONResponse):
+        def render(self, content: Any) -> bytes:
+            return dumps(content)
+
+    BackendJSONResponse.__name__ = f"{backend.capitalize()}JSONResponse"
+    return BackendJSONResponse
+
+
+BACKEND = os.environ.get("DND_API_JSON_BACKEND", DEFAULT_BACKEND)
+DefaultJSONResponse = response_class(BACKEND)
+
+
+class JSONRoute(APIRoute):
+    """Rota que serializa respostas sem ``response_model`` com o backend configurado.
+
+    A função da rota é envolvida por ``timed_endpoint`` para que o
+    ``MetricsMiddleware`` separe o tempo da rota do tempo de serialização.
+    """
+
+    default_response_class: Type[JSONResponse] = DefaultJSONResponse
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        super().__init__(path, timed_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        # Classe explícita na rota é respeitada; com response_model, mantém o caminho do Pydantic
+        if self.response_field is None and isinstance(self.response_class, DefaultPlaceholder):
+            self.response_class = Default(self.default_response_class)
+        return super().get_route_handler()
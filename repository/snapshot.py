@@ -0,0 +1,138 @@
+"""Formato binário do snapshot de dados, gerado no build e mapeado em memória.
+
+Layout do arquivo::
+
+    MAGIC (8 bytes) | FORMAT_VERSION (u32 LE) | tamanho do cabeçalho (u32 LE)
+    cabeçalho JSON  | bloco de cada recurso ...
+
+O cabeçalho guarda a versão do dataset, o sha256 de cada arquivo de origem
+(para detectar snapshot desatualizado) e ``[offset, quantidade]`` do bloco
+de cada recurso. Um bloco é a tabela de offsets dos itens (u32 LE,
+``quantidade + 1`` entradas) seguida do JSON compacto de cada item, já com
+os ajustes de ``prepare_raw``.
+
+A leitura usa ``mmap``: abrir o snapshot só lê o cabeçalho, e cada item é
+copiado e decodificado apenas quando pedido. Os itens são validados pelo
+Pydantic direto dos bytes (``model_validate_json``), sem passar por
+``json.load`` nem por dicts intermediários.
+"""
+import json
+import mmap
+import os
+import struct
+from typing import Dict, Iterator, List, Mapping, Sequence, Tuple
+
+MAGIC = b"DNDSNAP\x00"
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sII")
+
+
+class SnapshotError(ValueError):
+    """Arquivo que não é um snapshot válido desta versão do formato."""
+
+
+def pack_block(items: Sequence[bytes]) -> bytes:
+    """Tabela de offsets seguida dos itens concatenados."""
+    offsets = [0]
+    for item in items:
+        offsets.append(offsets[-1] + len(item))
+    return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(items)
+
+
+def write_snapshot(path: str, version: str, sources: Mapping[str, str], records: Mapping[str, Sequence[bytes]]) -> None:
+    """Grava o snapshot de forma atômica (arquivo temporário + rename).
+
+    ``records`` mapeia cada recurso para o JSON de cada um dos seus itens.
+    """
+    blocks = {field: pack_block(items) for field, items in records.items()}
+    layout: Dict[str, Tuple[int, int]] = {}
+    offset = 0
+    for field, block in blocks.items():
+        layout[field] = (offset, len(records[field]))
+        offset += len(block)
+    header = json.dumps(
+        {"version": version, "sources": dict(sources), "blocks": layout},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode("utf-8")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        for block in blocks.values():
+            f.write(block)
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """Snapshot aberto via ``mmap``; os blocos são lidos sob demanda."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"{path}: arquivo vazio")
+        try:
+            self._read_header()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _read_header(self) -> None:
+        """Valida o preâmbulo e o cabeçalho e localiza o bloco de cada recurso."""
+        path = self.path
+        try:
+            magic, format_version, header_size = _PREAMBLE.unpack_from(self._mmap, 0)
+        except struct.error:
+            raise SnapshotError(f"{path}: arquivo truncado")
+        if magic != MAGIC:
+            raise SnapshotError(f"{path}: não é um snapshot de dados")
+        if format_version != FORMAT_VERSION:
+            raise SnapshotError(f"{path}: formato {format_version}, esperado {FORMAT_VERSION}")
+        start = _PREAMBLE.size
+        try:
+            header = json.loads(self._mmap[start:start + header_size])
+            self.version: str = header["version"]
+            self.sources: Dict[str, str] = header["sources"]
+            blocks = [(field, int(offset), int(count)) for field, (offset, count) in header["blocks"].items()]
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            # JSON truncado ou inválido, chaves ausentes ou com o tipo errado
+            raise SnapshotError(f"{path}: cabeçalho inválido ({exc.__class__.__name__}: {exc})")
+        if not isinstance(self.version, str) or not isinstance(self.sources, dict):
+            raise SnapshotError(f"{path}: cabeçalho inválido (version ou sources com o tipo errado)")
+        data_start = start + header_size
+        # Recurso -> (início dos itens no arquivo, offsets relativos de cada item)
+        self._blocks: Dict[str, Tuple[int, Tuple[int, ...]]] = {}
+        for field, offset, count in blocks:
+            table_start = data_start + offset
+            try:
+                offsets = struct.unpack_from(f"<{count + 1}I", self._mmap, table_start)
+            except struct.error:
+                raise SnapshotError(f"{path}: arquivo truncado")
+            items_start = table_start + 4 * (count + 1)
+            if items_start + offsets[-1] > len(self._mmap):
+                raise SnapshotError(f"{path}: arquivo truncado")
+            self._blocks[field] = (items_start, offsets)
+
+    def __contains__(self, field: str) -> bool:
+        return field in self._blocks
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._blocks)
+
+    def count(self, field: str) -> int:
+        return len(self._blocks[field][1]) - 1
+
+    def item(self, field: str, index: int) -> bytes:
+        """Bytes JSON de um item, copiados do mapeamento."""
+        start, offsets = self._blocks[field]
+        return self._mmap[start + offsets[index]:start + offsets[index + 1]]
+
+    def items(self, field: str) -> List[bytes]:
+        """Bytes JSON de todos os itens do recurso."""
+        return [self.item(field, index) for index in range(self.count(field))]
+
+    def close(self) -> None:
+        self._mmap.close()
@@ -0,0 +1,77 @@
+"""Ordenação (``sort=``) comum a todos os endpoints de lista.
+
+``?sort=-nivel,nome`` ordena pelo primeiro campo e desempata pelos seguintes;
+``-`` na frente do campo inverte a ordem. Textos são comparados sem
+diferenciar acentos e maiúsculas (``Águia`` fica junto de ``aguia``), e
+itens sem o campo vão para o fim.
+
+A lista não é ordenada durante a requisição: a ordem de cada campo é
+precomputada na carga dos dados (``SortIndex``), combinações de campos são
+calculadas no primeiro uso e guardadas, e a lista já filtrada é só recortada
+dessa ordem. A ordenação acontece antes da paginação, então o cursor
+percorre a lista na ordem pedida. As ordens vêm do dataset da requisição,
+o mesmo de onde o handler tirou os itens, mesmo que uma recarga aconteça no
+meio do caminho.
+"""
+from typing import Optional, Sequence, Tuple, TypeVar
+
+from fastapi import Depends, HTTPException, Query
+
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+
+T = TypeVar("T")
+
+# ((campo, decrescente), ...)
+SortSpec = Tuple[Tuple[str, bool], ...]
+
+
+def parse_sort(sort: str) -> SortSpec:
+    """``"-nivel,nome"`` -> ``(("nivel", True), ("nome", False))``."""
+    spec = []
+    seen = set()
+    for part in sort.split(","):
+        part = part.strip()
+        name = part.lstrip("+-").strip()
+        # Só o primeiro pedido de cada campo conta; os demais não mudariam a ordem
+        if name and name not in seen:
+            seen.add(name)
+            spec.append((name, part.startswith("-")))
+    return tuple(spec)
+
+
+class Sorting:
+    """Parâmetro ``sort`` de um endpoint de lista (ver ``get_sorting``)."""
+
+    def __init__(self, dataset: Dataset, sort: Optional[str] = None):
+        self.dataset = dataset
+        self.spec = parse_sort(sort) if sort else ()
+
+    @property
+    def active(self) -> bool:
+        """Se ``sort`` foi informado."""
+        return bool(self.spec)
+
+    def apply(self, items: Sequence[T], resource: str) -> Sequence[T]:
+        """``items`` do recurso na ordem pedida; sem ``sort``, devolve ``items`` intacto."""
+        if not self.active:
+            return items
+        index = self.dataset.sort_orders[resource]
+        unknown = [name for name, _ in self.spec if name not in index.fields]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos de ordenação inválidos: {', '.join(unknown)}. Campos disponíveis: {', '.join(index.fields)}",
+            )
+        return index.sort(items, self.spec)
+
+
+async def get_sorting(
+    sort: Optional[str] = Query(
+        None,
+        description="Campos de ordenação, separados por vírgula; '-' inverte a ordem, ex: '-nivel,nome'",
+    ),
+    dataset: Dataset = Depends(aget_dataset),
+) -> Sorting:
+    """Dependência de ``sort``; assíncrona para não passar pelo threadpool."""
+    return Sorting(dataset, sort)
@@ -0,0 +1,60 @@
+"""Normalização de texto para buscas sem acento e sem diferenciar maiúsculas."""
+import unicodedata
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+
+def fold(text: Optional[str]) -> str:
+    """Remove acentos e converte para minúsculas: 'Dragão' -> 'dragao'."""
+    if not text:
+        return ""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def slugify(text: Optional[str]) -> str:
+    """Converte um nome em slug: 'Cão de Guarda' -> 'cao-de-guarda'."""
+    return '-'.join(fold(text).split())
+
+
+class SearchKeys:
+    """Chaves de busca normalizadas, calculadas uma vez por entidade.
+
+    ``keys[campo]`` é uma tupla alinhada com ``items``; as consultas trabalham
+    com posições, de modo que filtros podem ser encadeados sem recalcular
+    nenhuma normalização além da do termo buscado.
+    """
+
+    def __init__(self, items: Sequence[Any], **fields: Callable[[Any], Optional[str]]):
+        self.items = tuple(items)
+        self.keys = {
+            name: tuple(fold(getter(item)) for item in self.items)
+            for name, getter in fields.items()
+        }
+
+    def positions(self) -> range:
+        return range(len(self.items))
+
+    def contains(self, field: str, term: str, positions: Optional[Iterable[int]] = None) -> List[int]:
+        """Posições cuja chave contém o termo."""
+        term = fold(term)
+        keys = self.keys[field]
+        if positions is None:
+            positions = self.positions()
+        return [pos for pos in positions if term in keys[pos]]
+
+    def equals(self, field: str, term: str) -> List[int]:
+        """Posições cuja chave é igual ao termo."""
+        term = fold(term)
+        return [pos for pos, key in enumerate(self.keys[field]) if key == term]
+
+    def sort(self, field: str, positions: Iterable[int]) -> List[int]:
+        """Ordena posições pela chave normalizada do campo."""
+        keys = self.keys[field]
+        return sorted(positions, key=lambda pos: keys[pos])
+
+    def take(self, positions: Iterable[int]) -> List[Any]:
+        return [self.items[pos] for pos in positions]
+
+    def search(self, field: str, term: str) -> List[Any]:
+        """Entidades cuja chave contém o termo, na ordem original."""
+        return self.take(self.contains(field, term))
@@ -0,0 +1,94 @@
+"""Divisão do tempo de cada requisição em fases, para ``/metrics``.
+
+Fases medidas:
+
+- ``load``: carga dos dados feita durante a requisição (só acontece se a
+  requisição encontrar o dataset ainda não carregado; depois disso o acesso
+  é só leitura de memória e não conta aqui);
+- ``model``: montagem de modelos e projeções de resposta nas rotas
+  (``with phase("model"):``);
+- ``filter``: o restante do tempo da rota (filtros, buscas, paginação);
+- ``serialize``: do retorno da rota até o início da resposta (validação do
+  ``response_model`` e codificação JSON feitas pelo FastAPI), somado à
+  renderização das respostas pré-serializadas.
+
+O ``MetricsMiddleware`` abre um ``RequestTimings`` por requisição; fora de
+uma requisição instrumentada os ganchos não fazem nada.
+"""
+import functools
+import inspect
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Callable, Dict, Iterator, Optional
+
+PHASES = ("load", "filter", "model", "serialize")
+
+
+class RequestTimings:
+    """Tempos acumulados por fase de uma requisição."""
+
+    __slots__ = ("phases", "endpoint_start", "endpoint_end")
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+        self.endpoint_start: Optional[float] = None
+        self.endpoint_end: Optional[float] = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def finish(self, response_start: Optional[float]) -> Dict[str, float]:
+        """Fases completas, com ``filter`` e ``serialize`` derivadas dos marcos da rota."""
+        phases = dict(self.phases)
+        if self.endpoint_start is not None and self.endpoint_end is not None:
+            # Ganchos rodam dentro da rota; o que sobra do tempo dela é filtro
+            endpoint = self.endpoint_end - self.endpoint_start
+            phases["filter"] = max(endpoint - sum(phases.values()), 0.0)
+            if response_start is not None:
+                phases["serialize"] = phases.get("serialize", 0.0) + max(response_start - self.endpoint_end, 0.0)
+        return phases
+
+
+current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("current_timings", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Acumula o tempo do bloco na fase ``name`` da requisição atual."""
+    timings = current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, perf_counter() - start)
+
+
+def timed_endpoint(endpoint: Callable) -> Callable:
+    """Envolve a função da rota marcando início e fim; mantém assinatura e nome."""
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            timings.endpoint_start = perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_end = perf_counter()
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            timings = current_timings.get()
+            if timings is None:
+                return endpoint(*args, **kwargs)
+            timings.endpoint_start = perf_counter()
+            try:
+                return endpoint(*args, **kwargs)
+            finally:
+                timings.endpoint_end = perf_counter()
+    return wrapper
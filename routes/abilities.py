@@ -1,25 +1,28 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
 from models.ability import Ability
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/abilities.json', encoding='utf-8') as f:
-    abilities_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_ability_by_id(idx: int):
-    if 0 <= idx < len(abilities_data):
-        return abilities_data[idx]
+    abilities = get_dataset().abilities
+    if 0 <= idx < len(abilities):
+        return abilities[idx]
     return None
 
 @router.get('/abilities', response_model=List[Ability], tags=["Habilidades"], summary="Listar todas as habilidades", description="Retorna uma lista das 6 habilidades do personagem (Força, Destreza, Constituição, Inteligência, Sabedoria, Carisma).")
-def list_abilities():
-    return abilities_data
+async def list_abilities(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    return projection.apply(page.apply(sorting.apply(dataset.abilities, 'abilities')))
 
 @router.get('/abilities/{id}', response_model=Ability, tags=["Habilidades"], summary="Detalhes de uma habilidade", description="Retorna os detalhes de uma habilidade específica pelo índice (0 a 5).")
-def get_ability(id: int):
+async def get_ability(id: int, projection: Projection = Depends(get_projection)):
     item = get_ability_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Habilidade não encontrada')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Optional
-import json
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/actions.json', encoding='utf-8') as f:
-    actions_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/actions', tags=["Ações"], summary="Listar todas as ações de combate", description="Retorna uma lista de todas as ações possíveis no combate. Permite filtrar por tipo de ação.")
-def list_actions(type: Optional[str] = Query(None, description="Filtrar por tipo de ação, ex: bonus, reação, movimento")):
-    results = actions_data
+async def list_actions(type: Optional[str] = Query(None, description="Filtrar por tipo de ação, ex: bonus, reação, movimento"), dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    results = dataset.actions
     if type:
         results = [a for a in results if type.lower() in a['tipo'].lower()]
-    return results 
\ No newline at end of file
+    return projection.apply(page.apply(sorting.apply(results, 'actions'))) 
\ No newline at end of file
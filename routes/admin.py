@@ -0,0 +1,37 @@
+import hmac
+import os
+from fastapi import APIRouter, Header, HTTPException
+from typing import Optional
+from repository.aio import areload_data
+from repository.serialization import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+# Token exigido em X-Admin-Token; sem ele definido, os endpoints de administração ficam desligados
+ADMIN_TOKEN = os.environ.get("DND_API_ADMIN_TOKEN")
+
+@router.post(
+    "/admin/reload",
+    tags=["Administração"],
+    summary="Recarrega os arquivos de dados",
+    description="""Relê `data/*.json`, monta um novo dataset com todos os índices e o troca pelo atual sem reiniciar o processo.
+
+**Funcionamento:**
+- Requisições em andamento terminam com os dados antigos; as seguintes já veem os novos
+- ETags, respostas em cache e cursores de paginação mudam junto com a versão dos dados
+- Se algum arquivo for inválido, nada é trocado e o erro é retornado (422)
+- Recarrega apenas o worker que atendeu; com vários workers, envie `SIGHUP` ao `server.py` ou use `DND_API_RELOAD_INTERVAL`
+
+**Autenticação:** cabeçalho `X-Admin-Token` igual à variável de ambiente `DND_API_ADMIN_TOKEN` (sem ela, o endpoint fica desativado)."""
+)
+async def reload(x_admin_token: Optional[str] = Header(None, description="Token de administração")):
+    """Recarrega o dataset e informa a versão anterior e a nova."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Recarga via API desativada: defina DND_API_ADMIN_TOKEN")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Token de administração inválido")
+    try:
+        previous, version = await areload_data()
+    except Exception as exc:
+        raise HTTPException(status_code=422, detail=f"Falha ao recarregar os dados: {exc}")
+    return {"versao_anterior": previous, "versao": version, "alterado": previous != version}
@@ -1,27 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
 from models.armor import Armor
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/armor.json', encoding='utf-8') as f:
-    armor_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_armor_by_id(idx: int):
-    if 0 <= idx < len(armor_data):
-        return armor_data[idx]
+    armor = get_dataset().armor
+    if 0 <= idx < len(armor):
+        return armor[idx]
     return None
 
 @router.get('/armor', response_model=List[Armor], tags=["Armaduras"], summary="Listar todas as armaduras", description="Retorna uma lista de todas as armaduras disponíveis.")
-def list_armor():
+async def list_armor(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as armaduras do PHB."""
-    return armor_data
+    return projection.apply(page.apply(sorting.apply(dataset.armor, 'armor')))
 
 @router.get('/armor/{id}', response_model=Armor, tags=["Armaduras"], summary="Detalhes de uma armadura", description="Retorna os detalhes de uma armadura específica pelo índice.")
-def get_armor(id: int):
+async def get_armor(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma armadura pelo índice."""
     item = get_armor_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Armadura não encontrada')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
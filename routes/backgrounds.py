@@ -1,71 +1,70 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-import json
 from models.background import Background
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-# Carregar dados do JSON
-with open('data/backgrounds.json', encoding='utf-8') as f:
-    backgrounds_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 # Função utilitária para buscar por índice (id)
 def get_background_by_id(idx: int):
-    if 0 <= idx < len(backgrounds_data):
-        return backgrounds_data[idx]
+    backgrounds = get_dataset().backgrounds
+    if 0 <= idx < len(backgrounds):
+        return backgrounds[idx]
     else:
         return None
 
 @router.get('/backgrounds', response_model=List[Background], tags=["Antecedentes"], summary="Listar todos os antecedentes", description="Retorna uma lista de todos os antecedentes disponíveis, com filtros por nome, proficiência e ideal.")
-def list_backgrounds(
+async def list_backgrounds(
     name: Optional[str] = Query(None, description="Filtrar por nome"),
     prof: Optional[str] = Query(None, description="Filtrar por proficiência"),
-    ideal: Optional[str] = Query(None, description="Filtrar por ideal")
+    ideal: Optional[str] = Query(None, description="Filtrar por ideal"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todos os antecedentes, com filtros opcionais por nome, proficiência e ideal."""
-    results = backgrounds_data
+    results = dataset.backgrounds
     if name:
-        results = [bg for bg in results if name.lower() in bg['nome'].lower()]
+        results = dataset.search_keys['backgrounds'].search('nome', name)
     if prof:
-        results = [bg for bg in results if any(prof.lower() in p.lower() for p in bg.get('proficiencias', []))]
+        results = [bg for bg in results if any(prof.lower() in p.lower() for p in bg.proficiencias)]
     if ideal:
-        results = [bg for bg in results if any(ideal.lower() in i.lower() for i in bg.get('personalidade', {}).get('ideais', []))]
-    return results
+        results = [bg for bg in results if any(ideal.lower() in i.lower() for i in bg.personalidade.ideais)]
+    return projection.apply(page.apply(sorting.apply(results, 'backgrounds')))
 
 @router.get('/backgrounds/{id}', response_model=Background, tags=["Antecedentes"], summary="Detalhes de um antecedente", description="Retorna os detalhes de um antecedente específico pelo índice.")
-def get_background(id: int):
+async def get_background(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de um antecedente pelo índice."""
     bg = get_background_by_id(id)
     if not bg:
         raise HTTPException(status_code=404, detail='Antecedente não encontrado')
-    return bg
+    return projection.apply(bg)
 
 @router.get('/backgrounds/{id}/traits', tags=["Antecedentes"], summary="Traços de personalidade de um antecedente", description="Retorna apenas os traços de personalidade do antecedente pelo índice.")
-def get_background_traits(id: int):
+async def get_background_traits(id: int):
     """Retorna apenas os traços de personalidade do antecedente."""
     bg = get_background_by_id(id)
     if not bg:
         raise HTTPException(status_code=404, detail='Antecedente não encontrado')
-    return bg['personalidade']
-
-with open('data/currency.json', encoding='utf-8') as f:
-    currency_data = json.load(f)
-with open('data/services.json', encoding='utf-8') as f:
-    services_data = json.load(f)
-with open('data/lifestyles.json', encoding='utf-8') as f:
-    lifestyles_data = json.load(f)
+    return bg.personalidade
 
 @router.get('/currency', tags=["Moedas"], summary="Listar moedas e conversões", description="Retorna todas as moedas do PHB e suas conversões.")
-def list_currency():
+async def list_currency(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as moedas e conversões do PHB."""
-    return currency_data
+    return projection.apply(page.apply(sorting.apply(dataset.currency, 'currency')))
 
 @router.get('/services', tags=["Serviços"], summary="Listar serviços", description="Retorna todos os serviços e preços aproximados do PHB.")
-def list_services():
+async def list_services(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todos os serviços e preços aproximados do PHB."""
-    return services_data
+    return projection.apply(page.apply(sorting.apply(dataset.services, 'services')))
 
 @router.get('/lifestyles', tags=["Estilos de Vida"], summary="Listar estilos de vida", description="Retorna todos os estilos de vida e custos diários do PHB.")
-def list_lifestyles():
+async def list_lifestyles(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todos os estilos de vida e custos diários do PHB."""
-    return lifestyles_data 
\ No newline at end of file
+    return projection.apply(page.apply(sorting.apply(dataset.lifestyles, 'lifestyles'))) 
\ No newline at end of file
@@ -0,0 +1,42 @@
+from fastapi import APIRouter
+from typing import List
+from models.batch import BatchRequest, BatchResult
+from repository.batch import resolve
+from repository.aio import aget_dataset
+from repository.serialization import JSONRoute
+from repository.timing import phase
+
+router = APIRouter(route_class=JSONRoute)
+
+@router.post(
+    "/batch",
+    response_model=List[BatchResult],
+    tags=["Lote"],
+    summary="Busca várias entidades de uma vez",
+    description="""Resolve uma lista de referências `(tipo, id)` em uma única chamada, direto dos índices em memória.
+
+Útil para montar uma ficha de personagem sem uma requisição por raça, classe, antecedente, magia e talento.
+
+**Tipos suportados** (mesmos ids das rotas de detalhe):
+- `racas`, `subracas`, `classes`, `backgrounds`, `feats`, `spells`
+- `conditions`, `deuses`, `planos`, `criaturas`, `leituras`
+
+**Resposta:**
+- Um resultado por referência, na mesma ordem do pedido
+- `status` é o que a rota de detalhe retornaria: 200 com `item`, ou 400/404/422 com `erro`
+- Uma referência inválida não afeta as demais; a chamada em si retorna 200
+
+**Exemplo de corpo:**
+```json
+{"itens": [{"tipo": "racas", "id": 1}, {"tipo": "classes", "id": 5}, {"tipo": "spells", "id": 3}]}
+```"""
+)
+async def batch(request: BatchRequest):
+    """Resolve várias referências, com resultado e erro por item."""
+    dataset = await aget_dataset()
+    resolved = [(ref, *resolve(dataset, ref.tipo, ref.id)) for ref in request.itens]
+    with phase("model"):
+        return [
+            BatchResult(tipo=ref.tipo, id=ref.id, status=status, item=item, erro=erro)
+            for ref, status, item, erro in resolved
+        ]
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
 class VersionChange(BaseModel):
     """Modelo para mudanças em uma versão."""
@@ -587,8 +589,12 @@ def get_changelog_data() -> List[Version]:
 - **v1.1.0:** Sub-raças
 - **v1.0.0:** Raças (Fundação da API)"""
 )
-def get_changelog():
+async def get_changelog():
     """Retorna o changelog completo da API."""
+    return changelog_response()
+
+def build_changelog() -> ChangelogResponse:
+    """Monta o changelog completo a partir dos dados de versões."""
     versions = get_changelog_data()
     return ChangelogResponse(
         current_version="2.4.0",
@@ -596,6 +602,9 @@ def get_changelog():
         versions=versions
     )
 
+# Changelog pré-serializado, renderizado uma vez na inicialização
+changelog_response = cached_response(build_changelog, ChangelogResponse)
+
 @router.get(
     "/changelog/latest",
     response_model=Version,
@@ -615,7 +624,7 @@ def get_changelog():
 - Mudanças recentes
 - Status da API"""
 )
-def get_latest_version():
+async def get_latest_version():
     """Retorna a versão mais recente da API."""
     versions = get_changelog_data()
     return versions[0]  # A primeira versão é sempre a mais recente
@@ -656,7 +665,7 @@ def get_latest_version():
 - Documentação de mudanças
 - Referência para desenvolvedores"""
 )
-def get_version_details(version: str):
+async def get_version_details(version: str):
     """Retorna os detalhes de uma versão específica."""
     versions = get_changelog_data()
     
@@ -1,17 +1,14 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
 from models.class_ import Class, ClassLevel, Feature
-import json
-import os
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/classes.json')
-
-def load_classes() -> List[Class]:
-    with open(DATA_PATH, encoding='utf-8') as f:
-        data = json.load(f)
-        return [Class(**cls) for cls in data]
+router = APIRouter(route_class=JSONRoute)
 
 @router.get(
     "/classes",
@@ -20,13 +17,17 @@ def load_classes() -> List[Class]:
     summary="Lista todas as classes",
     description="Lista todas as classes disponíveis. Permite filtrar por magia, dado de vida e proficiência em armaduras."
 )
-def get_classes(
+async def get_classes(
     magic: Optional[bool] = Query(None, description="Filtra classes que possuem magia", examples=[True]),
     hit_die: Optional[str] = Query(None, description="Filtra classes pelo dado de vida, ex: '1d10'", examples=["1d10"]),
-    armor: Optional[str] = Query(None, description="Filtra classes por proficiência em armaduras, ex: 'leve', 'média', 'todas'", examples=["leve"])
+    armor: Optional[str] = Query(None, description="Filtra classes por proficiência em armaduras, ex: 'leve', 'média', 'todas'", examples=["leve"]),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as classes do PHB, com filtros opcionais."""
-    classes = load_classes()
+    classes = dataset.classes
     if magic is not None:
         def has_magic(cls):
             for nivel in cls.niveis:
@@ -39,7 +40,7 @@ def get_classes(
     if armor:
         armor_norm = armor.lower()
         classes = [cls for cls in classes if any(armor_norm in prof.lower() for prof in cls.proficiencias if 'armadura' in prof.lower() or 'armaduras' in prof.lower())]
-    return classes
+    return projection.apply(page.apply(sorting.apply(classes, 'classes')))
 
 @router.get(
     "/classes/{class_id}",
@@ -48,11 +49,11 @@ def get_classes(
     summary="Detalhes de uma classe",
     description="Retorna todos os detalhes de uma classe pelo seu ID."
 )
-def get_class(class_id: int):
+async def get_class(class_id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma classe pelo ID."""
-    classes = load_classes()
+    classes = get_dataset().classes
     if 1 <= class_id <= len(classes):
-        return classes[class_id - 1]
+        return projection.apply(classes[class_id - 1])
     raise HTTPException(status_code=404, detail="Classe não encontrada")
 
 @router.get(
@@ -62,11 +63,11 @@ def get_class(class_id: int):
     summary="Habilidades por nível",
     description="Lista todas as habilidades e magias adquiridas por nível da classe."
 )
-def get_class_levels(class_id: int):
+async def get_class_levels(class_id: int, projection: Projection = Depends(get_projection)):
     """Lista todas as habilidades e magias adquiridas por nível da classe."""
-    classes = load_classes()
+    classes = get_dataset().classes
     if 1 <= class_id <= len(classes):
-        return classes[class_id - 1].niveis
+        return projection.apply(classes[class_id - 1].niveis)
     raise HTTPException(status_code=404, detail="Classe não encontrada")
 
 @router.get(
@@ -75,9 +76,9 @@ def get_class_levels(class_id: int):
     summary="Magias conhecidas da classe",
     description="Lista todas as magias conhecidas pela classe, se aplicável."
 )
-def get_class_spells(class_id: int):
+async def get_class_spells(class_id: int):
     """Lista todas as magias conhecidas pela classe, se aplicável."""
-    classes = load_classes()
+    classes = get_dataset().classes
     if 1 <= class_id <= len(classes):
         spells = []
         for level in classes[class_id - 1].niveis:
@@ -1,15 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-import json
+from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import List, Optional, Union
 from models.condition import Condition
+from models.search import FuzzyMatch
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
+from repository.timing import phase
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-def load_conditions() -> List[Condition]:
-    """Carrega as condições do arquivo JSON."""
-    with open('data/conditions.json', encoding='utf-8') as f:
-        data = json.load(f)
-    return [Condition(**condition) for condition in data]
+# Lista completa pré-serializada, servida quando não há filtros
+all_conditions_response = cached_response(lambda: list(get_dataset().conditions), List[Condition])
 
 @router.get(
     '/conditions', 
@@ -70,12 +75,19 @@ def load_conditions() -> List[Condition]:
 - Ajuda para mestres e jogadores
 - Planejamento estratégico de combate"""
 )
-def list_conditions(
+async def list_conditions(
     effect: Optional[str] = Query(None, description="Filtra condições por efeito específico", examples=["desvantagem", "vantagem", "ataque", "movimento"]),
-    source: Optional[str] = Query(None, description="Filtra condições por fonte", examples=["magia", "veneno", "trauma", "armadilha"])
+    source: Optional[str] = Query(None, description="Filtra condições por fonte", examples=["magia", "veneno", "trauma", "armadilha"]),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as condições de combate com filtros opcionais."""
-    conditions = load_conditions()
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (effect, source)) and not page.active and not sorting.active and not projection.active:
+        return all_conditions_response()
+    conditions = dataset.conditions
     
     # Aplicar filtros sequencialmente
     if effect and effect.strip():
@@ -92,7 +104,7 @@ def list_conditions(
             if condition.fontes_comuns and any(source_lower in fonte.lower() for fonte in condition.fontes_comuns)
         ]
     
-    return conditions
+    return projection.apply(page.apply(sorting.apply(conditions, 'conditions')))
 
 @router.get(
     '/conditions/{condition_id}',
@@ -139,19 +151,19 @@ def list_conditions(
 - **13:** Atordoado
 - **14:** Inconsciente"""
 )
-def get_condition(condition_id: int):
+async def get_condition(condition_id: int, projection: Projection = Depends(get_projection)):
     """Retorna uma condição específica pelo ID."""
-    conditions = load_conditions()
+    conditions = get_dataset().conditions
     if condition_id < 1 or condition_id > len(conditions):
         raise HTTPException(
             status_code=404, 
             detail=f"Condição com ID {condition_id} não encontrada. IDs válidos: 1-{len(conditions)}"
         )
-    return conditions[condition_id - 1]
+    return projection.apply(conditions[condition_id - 1])
 
 @router.get(
     '/conditions/busca/{nome}',
-    response_model=List[Condition],
+    response_model=Union[List[Condition], List[FuzzyMatch[Condition]]],
     tags=["Condições"],
     summary="Buscar condições por nome",
     description="""Busca condições que contenham o termo especificado no nome.
@@ -197,13 +209,24 @@ def get_condition(condition_id: int):
 - `GET /conditions/busca/Paralis` - Condição de paralisia
 - `GET /conditions/busca/Invis` - Condição de invisibilidade
 - `GET /conditions/busca/Exausto` - Condição de exaustão
-- `GET /conditions/busca/Enfeiti` - Condição de encantamento"""
+- `GET /conditions/busca/Enfeiti` - Condição de encantamento
+
+**Busca tolerante a erros (`fuzzy=true`):**
+Retorna candidatos ranqueados por similaridade com o nome, no formato `{"similaridade": 0.62, "item": {...}}`.
+- `GET /conditions/busca/envenendo?fuzzy=true` - Envenenado
+- `GET /conditions/busca/paralizado?fuzzy=true` - Paralisado
+
+**Campos (`fields=`):** `GET /conditions/busca/cego?fields=nome` devolve só os campos pedidos; com `fuzzy=true` os caminhos partem de `{similaridade, item}`, ex: `fields=similaridade,item.nome`."""
 )
-def search_conditions_by_name(nome: str):
+async def search_conditions_by_name(
+    nome: str,
+    fuzzy: bool = Query(False, description="Busca tolerante a erros de digitação, com candidatos ranqueados por similaridade"),
+    projection: Projection = Depends(get_projection)
+):
     """Busca condições por nome."""
-    conditions = load_conditions()
-    filtered_conditions = [
-        condition for condition in conditions 
-        if nome.lower() in condition.nome.lower()
-    ]
-    return filtered_conditions 
\ No newline at end of file
+    if fuzzy:
+        candidates = get_dataset().fuzzy('conditions', nome)
+        with phase("model"):
+            matches = [FuzzyMatch[Condition](similaridade=score, item=condition) for condition, score in candidates]
+        return projection.apply(matches)
+    return projection.apply(get_dataset().search_keys['conditions'].search('nome', nome)) 
\ No newline at end of file
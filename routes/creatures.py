@@ -1,20 +1,79 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-import json
-import os
+from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import Dict, List, Optional, Tuple, Union
 from models.creature import Criatura
+from models.search import FuzzyMatch
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
+from repository.timing import phase
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-def load_creatures_data() -> List[dict]:
-    """Carrega os dados das criaturas do arquivo JSON."""
-    try:
-        with open("data/criaturas.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+
+class StatFilters:
+    """Faixas numéricas e modos de deslocamento pedidos em ``/criaturas`` (ver ``get_stat_filters``)."""
+
+    def __init__(self, ranges: Dict[str, Tuple[Optional[float], Optional[float]]], modes: Dict[str, Optional[bool]]):
+        self.ranges = {column: bounds for column, bounds in ranges.items() if bounds != (None, None)}
+        self.modes = {mode: wanted for mode, wanted in modes.items() if wanted is not None}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.ranges or self.modes)
+
+
+async def get_stat_filters(
+    ca_min: Optional[int] = Query(None, description="Classe de Armadura mínima"),
+    ca_max: Optional[int] = Query(None, description="Classe de Armadura máxima"),
+    pv_min: Optional[int] = Query(None, description="Pontos de vida médios mínimos"),
+    pv_max: Optional[int] = Query(None, description="Pontos de vida médios máximos"),
+    for_min: Optional[int] = Query(None, description="Força mínima"),
+    for_max: Optional[int] = Query(None, description="Força máxima"),
+    des_min: Optional[int] = Query(None, description="Destreza mínima"),
+    des_max: Optional[int] = Query(None, description="Destreza máxima"),
+    con_min: Optional[int] = Query(None, description="Constituição mínima"),
+    con_max: Optional[int] = Query(None, description="Constituição máxima"),
+    int_min: Optional[int] = Query(None, description="Inteligência mínima"),
+    int_max: Optional[int] = Query(None, description="Inteligência máxima"),
+    sab_min: Optional[int] = Query(None, description="Sabedoria mínima"),
+    sab_max: Optional[int] = Query(None, description="Sabedoria máxima"),
+    car_min: Optional[int] = Query(None, description="Carisma mínimo"),
+    car_max: Optional[int] = Query(None, description="Carisma máximo"),
+    deslocamento_min: Optional[float] = Query(None, description="Deslocamento em terra mínimo, em metros"),
+    deslocamento_max: Optional[float] = Query(None, description="Deslocamento em terra máximo, em metros"),
+    voo_min: Optional[float] = Query(None, description="Deslocamento de voo mínimo, em metros"),
+    voo_max: Optional[float] = Query(None, description="Deslocamento de voo máximo, em metros"),
+    percepcao_passiva_min: Optional[int] = Query(None, description="Percepção passiva mínima"),
+    percepcao_passiva_max: Optional[int] = Query(None, description="Percepção passiva máxima"),
+    voo: Optional[bool] = Query(None, description="true: só criaturas que voam; false: só as que não voam"),
+    natacao: Optional[bool] = Query(None, description="true: só criaturas com deslocamento de natação"),
+    escalar: Optional[bool] = Query(None, description="true: só criaturas com deslocamento de escalada"),
+    escavar: Optional[bool] = Query(None, description="true: só criaturas com deslocamento de escavação"),
+) -> StatFilters:
+    """Declara os filtros por faixa de ``/criaturas`` como parâmetros de query."""
+    return StatFilters(
+        {
+            'ca': (ca_min, ca_max),
+            'pv': (pv_min, pv_max),
+            'for': (for_min, for_max),
+            'des': (des_min, des_max),
+            'con': (con_min, con_max),
+            'int': (int_min, int_max),
+            'sab': (sab_min, sab_max),
+            'car': (car_min, car_max),
+            'deslocamento': (deslocamento_min, deslocamento_max),
+            'voo': (voo_min, voo_max),
+            'percepcao_passiva': (percepcao_passiva_min, percepcao_passiva_max),
+        },
+        {'voo': voo, 'natacao': natacao, 'escalar': escalar, 'escavar': escavar},
+    )
+
+# Lista completa pré-serializada, servida quando não há filtros
+all_creatures_response = cached_response(lambda: list(get_dataset().creatures), List[Criatura])
 
 @router.get(
     "/criaturas",
@@ -34,12 +93,22 @@ def load_creatures_data() -> List[dict]:
 - `tamanho`: Filtra por tamanho (Miúdo, Pequeno, Médio, Grande, Enorme)
 - `nd`: Filtra por nível de desafio (0, 1/8, 1/4, 1/2, etc.)
 
+**Filtros numéricos** (limites inclusivos, `_min` e/ou `_max`):
+- `ca`: Classe de Armadura
+- `pv`: Pontos de vida médios (o número antes dos dados em `pv`)
+- `for`, `des`, `con`, `int`, `sab`, `car`: Atributos
+- `deslocamento`, `voo`: Deslocamento em terra e de voo, em metros
+- `percepcao_passiva`: Percepção passiva (de `sentidos`; sem ela, 10 + modificador de Sabedoria)
+- `voo`, `natacao`, `escalar`, `escavar` (`true`/`false`): Se a criatura tem esse modo de deslocamento
+
 **Exemplos de uso:**
 - `GET /criaturas` - Todas as criaturas
 - `GET /criaturas?tipo=Besta` - Apenas bestas
 - `GET /criaturas?tamanho=Médio` - Criaturas médias
 - `GET /criaturas?nd=1/4` - Criaturas com ND 1/4
 - `GET /criaturas?tipo=Besta&tamanho=Miúdo` - Bestas miúdas
+- `GET /criaturas?ca_min=13&pv_max=20` - CA 13 ou mais e até 20 PV
+- `GET /criaturas?for_min=14&voo=true` - Criaturas fortes que voam
 
 **Uso típico:**
 - Consulta geral de criaturas
@@ -47,43 +116,46 @@ def load_creatures_data() -> List[dict]:
 - Busca por nível de desafio
 - Referência para mestres e jogadores"""
 )
-def get_creatures(
+async def get_creatures(
     tipo: Optional[str] = Query(None, alias="tipo", description="Filtrar por tipo de criatura"),
     tamanho: Optional[str] = Query(None, alias="tamanho", description="Filtrar por tamanho da criatura"),
-    nd: Optional[str] = Query(None, alias="nd", description="Filtrar por nível de desafio")
+    nd: Optional[str] = Query(None, alias="nd", description="Filtrar por nível de desafio"),
+    stats: StatFilters = Depends(get_stat_filters),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Retorna todas as criaturas com filtros opcionais."""
-    creatures_data = load_creatures_data()
-    
-    if not creatures_data:
-        return []
-    
-    # Aplicar filtros
-    filtered_creatures = creatures_data
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (tipo, tamanho, nd)) and not stats.active and not page.active and not sorting.active and not projection.active:
+        return all_creatures_response()
+    # Filtros numéricos resolvidos no índice de colunas; os demais, sobre o resultado
+    filtered_creatures = dataset.creature_stats.query(stats.ranges, stats.modes)
     
     if tipo:
         filtered_creatures = [
             creature for creature in filtered_creatures 
-            if creature.get("tipo", "").lower().strip() == tipo.lower().strip()
+            if creature.tipo.lower().strip() == tipo.lower().strip()
         ]
     
     if tamanho:
         filtered_creatures = [
             creature for creature in filtered_creatures 
-            if creature.get("tamanho", "").lower().strip() == tamanho.lower().strip()
+            if creature.tamanho.lower().strip() == tamanho.lower().strip()
         ]
     
     if nd:
         filtered_creatures = [
             creature for creature in filtered_creatures 
-            if creature.get("nivel_desafio", "").lower().strip() == nd.lower().strip()
+            if creature.nivel_desafio.lower().strip() == nd.lower().strip()
         ]
     
-    return [Criatura(**creature) for creature in filtered_creatures]
+    return projection.apply(page.apply(sorting.apply(filtered_creatures, 'creatures')))
 
 @router.get(
     "/criaturas/{creature_id}",
-    response_model=Criatura,
+    response_model=Union[Criatura, List[FuzzyMatch[Criatura]]],
     tags=["Criaturas"],
     summary="Detalhes de uma Criatura",
     description="""Retorna os detalhes completos de uma criatura específica.
@@ -111,24 +183,35 @@ def get_creatures(
 - `aguia-gigante`, `cavalo-guerra`, `corvo`
 - `cao-guarda`, `cavalo-ponei`, `lagarto-gigante`
 - `esqueleto`, `zumbi`, `lobo`, `gato`
-- E muitos outros..."""
+- E muitos outros...
+
+**Busca tolerante a erros (`fuzzy=true`):**
+Se o ID não for encontrado, retorna candidatos ranqueados por similaridade com o nome, no formato `{"similaridade": 0.75, "item": {...}}`.
+- `GET /criaturas/esquleto?fuzzy=true` - Esqueleto
+- `GET /criaturas/tartaruga-gigante?fuzzy=true` - Tartaruga"""
 )
-def get_creature_by_id(creature_id: str):
+async def get_creature_by_id(
+    creature_id: str,
+    fuzzy: bool = Query(False, description="Se o ID não for encontrado, retorna candidatos ranqueados por similaridade"),
+    projection: Projection = Depends(get_projection)
+):
     """Retorna os detalhes de uma criatura específica."""
-    creatures_data = load_creatures_data()
+    # Busca pelo ID ou pelo slug do nome (sem acentos)
+    lookup = get_dataset().lookups['creatures']
+    creature = lookup.get(creature_id)
+    if creature is not None:
+        return projection.apply(creature)
     
-    for creature in creatures_data:
-        if creature.get("id") == creature_id:
-            return Criatura(**creature)
-    
-    # Se não encontrou, tenta buscar por nome (case-insensitive)
-    for creature in creatures_data:
-        if creature.get("nome", "").lower().replace(" ", "-").replace("ã", "a").replace("ç", "c") == creature_id.lower():
-            return Criatura(**creature)
+    if fuzzy:
+        candidates = get_dataset().fuzzy('creatures', creature_id)
+        with phase("model"):
+            matches = [FuzzyMatch[Criatura](similaridade=score, item=creature) for creature, score in candidates]
+        if matches:
+            return matches
     
     raise HTTPException(
         status_code=404,
-        detail=f"Criatura '{creature_id}' não encontrada. Use /criaturas para ver todas as criaturas disponíveis."
+        detail=lookup.not_found(creature_id, f"Criatura '{creature_id}' não encontrada. Use /criaturas para ver todas as criaturas disponíveis.")
     )
 
 @router.get(
@@ -158,13 +241,11 @@ def get_creature_by_id(creature_id: str):
 - Referência para invocação
 - Contexto para aventuras"""
 )
-def get_creatures_by_type(tipo: str):
+async def get_creatures_by_type(tipo: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todas as criaturas de um tipo específico."""
-    creatures_data = load_creatures_data()
-    
     filtered_creatures = [
-        creature for creature in creatures_data 
-        if creature.get("tipo", "").lower().strip() == tipo.lower().strip()
+        creature for creature in dataset.creatures 
+        if creature.tipo.lower().strip() == tipo.lower().strip()
     ]
     
     if not filtered_creatures:
@@ -173,7 +254,7 @@ def get_creatures_by_type(tipo: str):
             detail=f"Nenhuma criatura encontrada do tipo '{tipo}'. Tipos disponíveis: Besta, Morto-vivo, Humanoide, Dragão, Elemental, Fada"
         )
     
-    return [Criatura(**creature) for creature in filtered_creatures]
+    return projection.apply(page.apply(sorting.apply(filtered_creatures, 'creatures')))
 
 @router.get(
     "/criaturas/tamanhos/{tamanho}",
@@ -202,13 +283,11 @@ def get_creatures_by_type(tipo: str):
 - Referência para espaços
 - Contexto para ambientes"""
 )
-def get_creatures_by_size(tamanho: str):
+async def get_creatures_by_size(tamanho: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todas as criaturas de um tamanho específico."""
-    creatures_data = load_creatures_data()
-    
     filtered_creatures = [
-        creature for creature in creatures_data 
-        if creature.get("tamanho", "").lower().strip() == tamanho.lower().strip()
+        creature for creature in dataset.creatures 
+        if creature.tamanho.lower().strip() == tamanho.lower().strip()
     ]
     
     if not filtered_creatures:
@@ -217,7 +296,7 @@ def get_creatures_by_size(tamanho: str):
             detail=f"Nenhuma criatura encontrada do tamanho '{tamanho}'. Tamanhos disponíveis: Miúdo, Pequeno, Médio, Grande, Enorme, Colossal"
         )
     
-    return [Criatura(**creature) for creature in filtered_creatures]
+    return projection.apply(page.apply(sorting.apply(filtered_creatures, 'creatures')))
 
 @router.get(
     "/criaturas/niveis/{nd}",
@@ -246,16 +325,14 @@ def get_creatures_by_size(tamanho: str):
 - Balanceamento de combate
 - Referência para mestres"""
 )
-def get_creatures_by_challenge_rating(nd: str):
+async def get_creatures_by_challenge_rating(nd: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todas as criaturas de um nível de desafio específico."""
-    creatures_data = load_creatures_data()
-    
     # Converter underscore para slash para compatibilidade
     nd_normalized = nd.replace("_", "/")
     
     filtered_creatures = [
-        creature for creature in creatures_data 
-        if creature.get("nivel_desafio", "").lower().strip() == nd_normalized.lower().strip()
+        creature for creature in dataset.creatures 
+        if creature.nivel_desafio.lower().strip() == nd_normalized.lower().strip()
     ]
     
     if not filtered_creatures:
@@ -264,4 +341,4 @@ def get_creatures_by_challenge_rating(nd: str):
             detail=f"Nenhuma criatura encontrada com nível de desafio '{nd_normalized}'. Use /criaturas para ver todos os níveis disponíveis."
         )
     
-    return [Criatura(**creature) for creature in filtered_creatures] 
\ No newline at end of file
+    return projection.apply(page.apply(sorting.apply(filtered_creatures, 'creatures'))) 
\ No newline at end of file
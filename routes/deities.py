@@ -1,15 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
-import json
+from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import List, Optional, Union
 from models.deity import Deus
+from models.search import FuzzyMatch
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
+from repository.timing import phase
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-def load_deities() -> List[Deus]:
-    """Carrega as divindades do arquivo JSON."""
-    with open('data/deuses.json', encoding='utf-8') as f:
-        data = json.load(f)
-    return [Deus(**deity) for deity in data]
+# Lista completa pré-serializada, servida quando não há filtros
+all_deities_response = cached_response(lambda: list(get_dataset().deities), List[Deus])
 
 @router.get(
     '/deuses',
@@ -77,13 +82,20 @@ def load_deities() -> List[Deus]:
 - Informações sobre panteões e divindades
 - Pesquisa por domínios específicos"""
 )
-def list_deities(
+async def list_deities(
     panteao: Optional[str] = Query(None, description="Filtra divindades por panteão", examples=["Faerûn", "Grego", "Nórdico", "Egípcio", "Greyhawk", "Dragonlance"]),
     dominio: Optional[str] = Query(None, description="Filtra divindades por domínio", examples=["Guerra", "Vida", "Morte", "Magia", "Natureza", "Amor"]),
-    alinhamento: Optional[str] = Query(None, description="Filtra divindades por alinhamento", examples=["LG", "NG", "CG", "LN", "N", "CN", "LE", "NE", "CE"])
+    alinhamento: Optional[str] = Query(None, description="Filtra divindades por alinhamento", examples=["LG", "NG", "CG", "LN", "N", "CN", "LE", "NE", "CE"]),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as divindades com filtros opcionais."""
-    deities = load_deities()
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (panteao, dominio, alinhamento)) and not page.active and not sorting.active and not projection.active:
+        return all_deities_response()
+    deities = dataset.deities
     
     # Aplicar filtros sequencialmente
     if panteao and panteao.strip():
@@ -107,7 +119,7 @@ def list_deities(
             if alinhamento_upper == deity.alinhamento
         ]
     
-    return deities
+    return projection.apply(page.apply(sorting.apply(deities, 'deities')))
 
 @router.get(
     '/deuses/{deity_id}',
@@ -130,26 +142,29 @@ def list_deities(
 - `GET /deuses/lathander` - Detalhes de Lathander
 - `GET /deuses/zeus` - Detalhes de Zeus
 - `GET /deuses/odin` - Detalhes de Odin
+- `GET /deuses/Selûne` - Também aceita o nome, com ou sem acentos
+
+Se o ID não existir, a mensagem de erro sugere a divindade de nome mais parecido.
 
 **Uso típico:**
 - Após listar divindades com filtros, use o ID para obter detalhes completos
 - Consulta rápida durante criação de personagens
 - Referência para mestres e jogadores"""
 )
-def get_deity(deity_id: str):
+async def get_deity(deity_id: str, projection: Projection = Depends(get_projection)):
     """Retorna uma divindade específica pelo ID."""
-    deities = load_deities()
-    for deity in deities:
-        if deity.id == deity_id:
-            return deity
+    lookup = get_dataset().lookups['deities']
+    deity = lookup.get(deity_id)
+    if deity is not None:
+        return projection.apply(deity)
     raise HTTPException(
         status_code=404,
-        detail=f"Divindade com ID '{deity_id}' não encontrada"
+        detail=lookup.not_found(deity_id, f"Divindade com ID '{deity_id}' não encontrada")
     )
 
 @router.get(
     '/deuses/busca/{nome}',
-    response_model=List[Deus],
+    response_model=Union[List[Deus], List[FuzzyMatch[Deus]]],
     tags=["Divindades"],
     summary="Buscar divindades por nome",
     description="""Busca divindades que contenham o termo especificado no nome.
@@ -181,13 +196,24 @@ def get_deity(deity_id: str):
 - `GET /deuses/busca/Apolo` - Deus grego da luz e música
 - `GET /deuses/busca/Atena` - Deusa grega da sabedoria
 - `GET /deuses/busca/Lathander` - Deus de Faerûn da aurora
-- `GET /deuses/busca/Mystra` - Deusa de Faerûn da magia"""
+- `GET /deuses/busca/Mystra` - Deusa de Faerûn da magia
+
+**Busca tolerante a erros (`fuzzy=true`):**
+Retorna candidatos ranqueados por similaridade com o nome, no formato `{"similaridade": 0.75, "item": {...}}`.
+- `GET /deuses/busca/zues?fuzzy=true` - Zeus
+- `GET /deuses/busca/lathandr?fuzzy=true` - Lathander
+
+**Campos (`fields=`):** `GET /deuses/busca/tyr?fields=nome` devolve só os campos pedidos; com `fuzzy=true` os caminhos partem de `{similaridade, item}`, ex: `fields=similaridade,item.nome`."""
 )
-def search_deities_by_name(nome: str):
+async def search_deities_by_name(
+    nome: str,
+    fuzzy: bool = Query(False, description="Busca tolerante a erros de digitação, com candidatos ranqueados por similaridade"),
+    projection: Projection = Depends(get_projection)
+):
     """Busca divindades por nome."""
-    deities = load_deities()
-    filtered_deities = [
-        deity for deity in deities
-        if nome.lower() in deity.nome.lower()
-    ]
-    return filtered_deities 
\ No newline at end of file
+    if fuzzy:
+        candidates = get_dataset().fuzzy('deities', nome)
+        with phase("model"):
+            matches = [FuzzyMatch[Deus](similaridade=score, item=deity) for deity, score in candidates]
+        return projection.apply(matches)
+    return projection.apply(get_dataset().search_keys['deities'].search('nome', nome)) 
\ No newline at end of file
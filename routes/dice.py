@@ -0,0 +1,133 @@
+import random
+import secrets
+from fastapi import APIRouter, HTTPException, Query
+from functools import lru_cache
+from models.dice import MAX_ROLL_ITEMS, MAX_ROLLS, EstatisticasDados, ParteRolagem, PedidoRolagem, ProbabilidadeResultado, RespostaRolagem, ResultadoRolagem
+from repository.dice import (
+    MAX_CONVOLUTION_WORK, MAX_DICE, MAX_FACES, PERCENTILES, DiceError, DiceExpression,
+    distribution, parse_dice, parse_roll, roll, standard_deviation,
+)
+from repository.serialization import JSONRoute
+from repository.timing import phase
+
+router = APIRouter(route_class=JSONRoute)
+
+
+@lru_cache(maxsize=256)
+def dice_stats(expression: DiceExpression, with_distribution: bool) -> EstatisticasDados:
+    """Estatísticas de uma expressão já compilada; a mesma expressão não é recalculada."""
+    dist = distribution(expression)
+    with phase("model"):
+        return EstatisticasDados(
+            expressao=str(expression),
+            minimo=expression.minimum,
+            maximo=expression.maximum,
+            media=expression.mean,
+            desvio_padrao=round(standard_deviation(expression), 4),
+            percentis={f"p{p}": dist.percentile(p) for p in PERCENTILES},
+            distribuicao=[
+                ProbabilidadeResultado(valor=value, probabilidade=probability)
+                for value, probability in dist.items()
+            ] if with_distribution else None,
+        )
+
+
+@router.get(
+    "/dice/stats",
+    response_model=EstatisticasDados,
+    tags=["Rolagens"],
+    summary="Estatísticas de uma Expressão de Dados",
+    description=f"""Calcula a distribuição exata dos resultados de uma expressão de dados.
+
+**Expressões aceitas:**
+- Dados no formato `XdY` (`2d6`, `d20`) e valores fixos, somados ou subtraídos: `2d6 + 3`, `1d20 - 1d4`, `19d12 + 133`
+- Na query string, `+` sem codificar chega como espaço e é aceito como soma (`?expr=2d6+3`)
+- Até {MAX_DICE} dados por expressão, de até {MAX_FACES} faces
+
+**Informações retornadas:**
+- Mínimo, máximo, média e desvio padrão
+- Percentis p10, p25, p50, p75 e p90
+- Probabilidade exata de cada resultado (`distribuicao=false` omite a lista)
+
+**Exemplos de uso:**
+- `GET /dice/stats?expr=2d6+3` - Dano de uma espada grande com Força 16
+- `GET /dice/stats?expr=8d6` - Dano de Bola de Fogo
+- `GET /dice/stats?expr=19d12+133&distribuicao=false` - PV de um dragão, só o resumo
+
+As mesmas expressões aparecem já interpretadas em `/criaturas` (`pv_dados`, `ataques_detalhados`) e em `/weapons` (`dano_dados`)."""
+)
+async def get_dice_stats(
+    expr: str = Query(..., description="Expressão de dados (ex: 2d6+3)", examples=["2d6+3"]),
+    distribuicao: bool = Query(True, description="Inclui a probabilidade de cada resultado")
+):
+    """Distribuição exata, média e percentis de uma expressão de dados."""
+    try:
+        expression = parse_dice(expr)
+    except DiceError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return dice_stats(expression, distribuicao)
+
+
+@router.post(
+    "/dice/roll",
+    response_model=RespostaRolagem,
+    tags=["Rolagens"],
+    summary="Rola várias expressões de dados de uma vez",
+    description=f"""Rola uma lista de expressões em uma única chamada, várias vezes cada.
+
+**Cada item aceita:**
+- Uma expressão de dados: `1d20 + 5`, `8d6`, `2d6 - 1d4`
+- O `dano` de uma arma (`/weapons`): `1d8`
+- O texto de um ataque de criatura (`/criaturas`): cada dano do texto é rolado separadamente, com o seu tipo, e `totais` traz a soma
+
+**Rolagens:**
+- O total de cada rolagem é sorteado direto da distribuição exata da expressão, então `100d100` custa o mesmo que `1d20`
+- `semente` torna o resultado reproduzível; sem ela, uma semente é sorteada e devolvida na resposta
+- Até {MAX_ROLL_ITEMS} itens e {MAX_ROLLS} rolagens (soma de `vezes`) por chamada
+- As distribuições são calculadas uma vez por combinação de dados: `100d100 + 1` e `100d100 + 2` contam como uma só; o cálculo somado das combinações distintas tem um teto de {MAX_CONVOLUTION_WORK} (dados × amplitude dos resultados; `100d100` vale cerca de 1 milhão)
+
+**Exemplo de corpo:**
+```json
+{{"rolagens": [{{"expr": "1d20 + 5", "vezes": 4}}, {{"expr": "2d6 + 3"}}], "semente": 42}}
+```"""
+)
+async def roll_dice(request: PedidoRolagem):
+    """Rola todas as expressões do pedido com um único gerador."""
+    total = sum(item.vezes for item in request.rolagens)
+    if total > MAX_ROLLS:
+        raise HTTPException(status_code=400, detail=f"Máximo de {MAX_ROLLS} rolagens por chamada (pedidas: {total})")
+    parsed = []
+    for position, item in enumerate(request.rolagens):
+        try:
+            parsed.append(parse_roll(item.expr))
+        except DiceError as exc:
+            raise HTTPException(status_code=400, detail=f"Item {position}: {exc}")
+    # O modificador só desloca a distribuição: o custo é o das combinações de dados distintas
+    work = sum({expression.terms: expression.convolution_work for parts in parsed for expression, _ in parts}.values())
+    if work > MAX_CONVOLUTION_WORK:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Dados demais para uma chamada: cálculo de {work} acima do máximo de {MAX_CONVOLUTION_WORK} (dados × amplitude, somados por combinação de dados distinta)",
+        )
+
+    seed = request.semente if request.semente is not None else secrets.randbits(32)
+    rng = random.Random(seed)
+    rolled = [
+        [(expression, kind, roll(expression, item.vezes, rng)) for expression, kind in parts]
+        for item, parts in zip(request.rolagens, parsed)
+    ]
+    with phase("model"):
+        return RespostaRolagem(
+            semente=seed,
+            resultados=[
+                ResultadoRolagem(
+                    expr=item.expr,
+                    partes=[
+                        ParteRolagem(expressao=str(expression), tipo=kind, resultados=results)
+                        for expression, kind, results in parts
+                    ],
+                    totais=[sum(results) for results in zip(*(results for _, _, results in parts))],
+                )
+                for item, parts in zip(request.rolagens, rolled)
+            ],
+        )
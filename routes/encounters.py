@@ -0,0 +1,72 @@
+from fastapi import APIRouter
+from models.encounter import CriaturaEncontro, Encontro, PedidoEncontro, RespostaEncontro
+from repository.aio import aget_dataset
+from repository.encounters import party_thresholds, rate, xp_band
+from repository.serialization import JSONRoute
+from repository.timing import phase
+
+router = APIRouter(route_class=JSONRoute)
+
+@router.post(
+    "/encounters/build",
+    response_model=RespostaEncontro,
+    tags=["Encontros"],
+    summary="Monta encontros balanceados para um grupo",
+    description="""Sugere grupos de criaturas de `/criaturas` para o grupo de personagens, pelas regras de XP do Guia do Mestre.
+
+**Cálculo:**
+- Os limiares de XP do grupo são a soma dos limiares de cada personagem (fácil, média, difícil, mortal)
+- O XP das criaturas vem do nível de desafio (`1/4` = 50 XP) e é multiplicado pelo número de criaturas (×1 a ×4), com ajuste para grupos de menos de 3 ou 6+ personagens
+- A faixa aceita vai do limiar pedido até o limiar seguinte (mortal: até 1,5× o limiar mortal)
+- Os encontros vêm ordenados pela distância do XP ajustado ao centro da faixa; em empate, menos criaturas primeiro
+
+**Resposta:**
+- `limiares`, `xp_minimo` e `xp_maximo` do grupo
+- Para cada encontro: criaturas e quantidades, XP base, multiplicador, XP ajustado e a dificuldade resultante
+- Lista vazia quando nenhuma combinação das criaturas disponíveis cabe na faixa
+
+**Exemplo de corpo:**
+```json
+{"niveis": [1, 1, 1, 1], "dificuldade": "media", "max_criaturas": 6, "tipo": "Besta"}
+```"""
+)
+async def build_encounters(request: PedidoEncontro):
+    """Encontros mais equilibrados para o grupo e a dificuldade pedidos."""
+    dataset = await aget_dataset()
+    thresholds = party_thresholds(request.niveis)
+    low, high = xp_band(thresholds, request.dificuldade)
+    encounters = dataset.encounters.build(
+        request.niveis,
+        request.dificuldade,
+        max_creatures=request.max_criaturas,
+        max_kinds=request.max_criaturas_diferentes,
+        limit=request.max_resultados,
+        tipo=request.tipo,
+    )
+    with phase("model"):
+        return RespostaEncontro(
+            limiares=thresholds,
+            dificuldade=request.dificuldade,
+            xp_minimo=low,
+            xp_maximo=high,
+            encontros=[
+                Encontro(
+                    criaturas=[
+                        CriaturaEncontro(
+                            id=creature.id,
+                            nome=creature.nome,
+                            nivel_desafio=creature.nivel_desafio,
+                            xp=xp,
+                            quantidade=count,
+                        )
+                        for creature, xp, count in group
+                    ],
+                    total_criaturas=composition.total,
+                    xp_base=composition.base_xp,
+                    multiplicador=composition.multiplier,
+                    xp_ajustado=composition.adjusted_xp,
+                    dificuldade=rate(thresholds, composition.adjusted_xp),
+                )
+                for composition, group in encounters
+            ],
+        )
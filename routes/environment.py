@@ -1,13 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import List
-import json
 from models.environment_condition import EnvironmentCondition
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/environment.json', encoding='utf-8') as f:
-    environment_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/environment', response_model=List[EnvironmentCondition], tags=["Ambiente"], summary="Listar condições ambientais", description="Retorna regras de terreno, visibilidade, clima, obstáculos e ambientes especiais.")
-def list_environment():
-    return environment_data 
\ No newline at end of file
+async def list_environment(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    return projection.apply(page.apply(sorting.apply(dataset.environment, 'environment'))) 
\ No newline at end of file
@@ -1,27 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
 from models.item import ItemBase
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/equipment.json', encoding='utf-8') as f:
-    equipment_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_equipment_by_id(idx: int):
-    if 0 <= idx < len(equipment_data):
-        return equipment_data[idx]
+    equipment = get_dataset().equipment
+    if 0 <= idx < len(equipment):
+        return equipment[idx]
     return None
 
 @router.get('/equipment', response_model=List[ItemBase], tags=["Equipamentos"], summary="Listar todos os equipamentos", description="Retorna uma lista de todos os equipamentos de aventura disponíveis.")
-def list_equipment():
+async def list_equipment(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todos os equipamentos de aventura do PHB."""
-    return equipment_data
+    return projection.apply(page.apply(sorting.apply(dataset.equipment, 'equipment')))
 
 @router.get('/equipment/{id}', response_model=ItemBase, tags=["Equipamentos"], summary="Detalhes de um equipamento", description="Retorna os detalhes de um equipamento específico pelo índice.")
-def get_equipment(id: int):
+async def get_equipment(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de um equipamento de aventura pelo índice."""
     item = get_equipment_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Equipamento não encontrado')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
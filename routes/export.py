@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+from repository.aio import aget_dataset, aiterate
+from repository.export import EXPORT_TYPES, MEDIA_TYPE, iter_ndjson
+from repository.serialization import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+EXPORT_FORMATS = ["ndjson"]
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    tags=["Exportação"],
+    summary="Exporta o catálogo completo em NDJSON",
+    description=f"""Transmite todas as entidades da API como JSON delimitado por linhas (NDJSON), para jobs de sincronização.
+
+**Formato:**
+- Uma entidade por linha: `{{"tipo": "spells", "item": {{...}}}}`
+- `item` tem o mesmo formato da rota de detalhe
+- As linhas são geradas sob demanda: a memória não cresce com o catálogo e o processamento pode começar antes do fim da transferência
+- Todas as linhas vêm da mesma versão dos dados (cabeçalho `ETag`)
+
+**Tipos disponíveis** (os mesmos nomes de rota aceitos por `/search` e `/batch`): {", ".join(EXPORT_TYPES)}
+
+**Exemplos de uso:**
+- `GET /export?format=ndjson` - Catálogo completo
+- `GET /export?format=ndjson&tipo=spells&tipo=criaturas` - Apenas magias e criaturas"""
+)
+async def export(
+    format: str = Query("ndjson", description="Formato da exportação", examples=EXPORT_FORMATS),
+    tipo: Optional[List[str]] = Query(None, description="Restringe a exportação a tipos de entidade", examples=[["spells", "criaturas"]])
+):
+    """Exportação em streaming de todas as entidades."""
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato '{format}' não suportado. Formatos disponíveis: {', '.join(EXPORT_FORMATS)}")
+    unknown = [t for t in tipo or [] if t not in EXPORT_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Tipos inválidos: {', '.join(unknown)}. Tipos disponíveis: {', '.join(EXPORT_TYPES)}")
+    # O snapshot é capturado aqui para o stream inteiro ser de uma só versão
+    return StreamingResponse(aiterate(iter_ndjson(await aget_dataset(), tipo)), media_type=MEDIA_TYPE)
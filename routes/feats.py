@@ -1,35 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-import json
 from models.feat import Feat
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/feats.json', encoding='utf-8') as f:
-    feats_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_feat_by_id(idx: int):
-    if 0 <= idx < len(feats_data):
-        return feats_data[idx]
+    feats = get_dataset().feats
+    if 0 <= idx < len(feats):
+        return feats[idx]
     return None
 
 @router.get('/feats', response_model=List[Feat], tags=["Talentos"], summary="Listar todos os talentos", description="Retorna uma lista de todos os talentos (feats) disponíveis no Livro do Jogador. Permite filtrar por classe e raça.")
-def list_feats(
+async def list_feats(
     class_: Optional[str] = Query(None, alias="class", description="Filtrar por classe"),
-    race: Optional[str] = Query(None, description="Filtrar por raça")
+    race: Optional[str] = Query(None, description="Filtrar por raça"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todos os talentos, com filtros opcionais por classe e raça."""
-    results = feats_data
+    results = dataset.feats
     if class_:
-        results = [f for f in results if f.get('requisitos', {}).get('classe', '').lower() == class_.lower()]
+        results = [f for f in results if (f.requisitos or {}).get('classe', '').lower() == class_.lower()]
     if race:
-        results = [f for f in results if f.get('requisitos', {}).get('raça', '').lower() == race.lower()]
-    return results
+        results = [f for f in results if (f.requisitos or {}).get('raça', '').lower() == race.lower()]
+    return projection.apply(page.apply(sorting.apply(results, 'feats')))
 
 @router.get('/feats/{id}', response_model=Feat, tags=["Talentos"], summary="Detalhes de um talento", description="Retorna os detalhes completos de um talento (feat) específico pelo índice na lista.")
-def get_feat(id: int):
+async def get_feat(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de um talento pelo índice."""
     item = get_feat_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Talento não encontrado')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
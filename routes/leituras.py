@@ -1,20 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-import json
-import os
 from models.leitura import LeituraInspiradora
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-def load_leituras_data() -> List[dict]:
-    """Carrega os dados das leituras inspiradoras do arquivo JSON."""
-    try:
-        with open("data/leituras.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+# Lista completa pré-serializada, servida quando não há filtros
+all_leituras_response = cached_response(lambda: list(get_dataset().leituras), List[LeituraInspiradora])
 
 @router.get(
     "/leituras",
@@ -47,39 +45,41 @@ def load_leituras_data() -> List[dict]:
 - Busca por autor específico
 - Referência para mestres e jogadores"""
 )
-def get_leituras(
+async def get_leituras(
     categoria: Optional[str] = Query(None, alias="categoria", description="Filtrar por categoria da obra"),
     autor: Optional[str] = Query(None, alias="autor", description="Filtrar por autor da obra"),
-    influencia: Optional[str] = Query(None, alias="influencia", description="Filtrar por influência específica em D&D")
+    influencia: Optional[str] = Query(None, alias="influencia", description="Filtrar por influência específica em D&D"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Retorna todas as leituras inspiradoras com filtros opcionais."""
-    leituras_data = load_leituras_data()
-    
-    if not leituras_data:
-        return []
-    
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (categoria, autor, influencia)) and not page.active and not sorting.active and not projection.active:
+        return all_leituras_response()
     # Aplicar filtros
-    filtered_leituras = leituras_data
+    filtered_leituras = dataset.leituras
     
     if categoria:
         filtered_leituras = [
             leitura for leitura in filtered_leituras 
-            if leitura.get("categoria", "").lower().strip() == categoria.lower().strip()
+            if leitura.categoria.lower().strip() == categoria.lower().strip()
         ]
     
     if autor:
         filtered_leituras = [
             leitura for leitura in filtered_leituras 
-            if leitura.get("autor", "").lower().strip() == autor.lower().strip()
+            if leitura.autor.lower().strip() == autor.lower().strip()
         ]
     
     if influencia:
         filtered_leituras = [
             leitura for leitura in filtered_leituras 
-            if influencia.lower().strip() in leitura.get("influencia", "").lower().strip()
+            if influencia.lower().strip() in (leitura.influencia or "").lower().strip()
         ]
     
-    return [LeituraInspiradora(**leitura) for leitura in filtered_leituras]
+    return projection.apply(page.apply(sorting.apply(filtered_leituras, 'leituras')))
 
 @router.get(
     "/leituras/{leitura_id}",
@@ -111,22 +111,17 @@ def get_leituras(
 - `mitologia-nordica`, `mitologia-grega`, `mitologia-celta`
 - E muitos outros..."""
 )
-def get_leitura_by_id(leitura_id: str):
+async def get_leitura_by_id(leitura_id: str, projection: Projection = Depends(get_projection)):
     """Retorna os detalhes de uma leitura inspiradora específica."""
-    leituras_data = load_leituras_data()
-    
-    for leitura in leituras_data:
-        if leitura.get("id") == leitura_id:
-            return LeituraInspiradora(**leitura)
-    
-    # Se não encontrou, tenta buscar por título (case-insensitive)
-    for leitura in leituras_data:
-        if leitura.get("titulo", "").lower().replace(" ", "-").replace("ã", "a").replace("ç", "c") == leitura_id.lower():
-            return LeituraInspiradora(**leitura)
+    # Busca pelo ID ou pelo slug do título (sem acentos)
+    lookup = get_dataset().lookups['leituras']
+    leitura = lookup.get(leitura_id)
+    if leitura is not None:
+        return projection.apply(leitura)
     
     raise HTTPException(
         status_code=404,
-        detail=f"Leitura inspiradora '{leitura_id}' não encontrada. Use /leituras para ver todas as leituras disponíveis."
+        detail=lookup.not_found(leitura_id, f"Leitura inspiradora '{leitura_id}' não encontrada. Use /leituras para ver todas as leituras disponíveis.")
     )
 
 @router.get(
@@ -155,13 +150,13 @@ def get_leitura_by_id(leitura_id: str):
 - Referência para mestres
 - Contexto para campanhas"""
 )
-def get_leituras_by_category(categoria: str):
+async def get_leituras_by_category(categoria: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todas as leituras de uma categoria específica."""
-    leituras_data = load_leituras_data()
+    leituras_data = dataset.leituras
     
     filtered_leituras = [
         leitura for leitura in leituras_data 
-        if leitura.get("categoria", "").lower().strip() == categoria.lower().strip()
+        if leitura.categoria.lower().strip() == categoria.lower().strip()
     ]
     
     if not filtered_leituras:
@@ -170,7 +165,7 @@ def get_leituras_by_category(categoria: str):
             detail=f"Nenhuma leitura encontrada da categoria '{categoria}'. Categorias disponíveis: Fantasia, Mitologia, Espada e Feitiçaria, Ficção Científica, Terror"
         )
     
-    return [LeituraInspiradora(**leitura) for leitura in filtered_leituras]
+    return projection.apply(page.apply(sorting.apply(filtered_leituras, 'leituras')))
 
 @router.get(
     "/leituras/autores/{autor}",
@@ -200,13 +195,13 @@ def get_leituras_by_category(categoria: str):
 - Referência para mestres
 - Contexto para campanhas"""
 )
-def get_leituras_by_author(autor: str):
+async def get_leituras_by_author(autor: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todas as leituras de um autor específico."""
-    leituras_data = load_leituras_data()
+    leituras_data = dataset.leituras
     
     filtered_leituras = [
         leitura for leitura in leituras_data 
-        if leitura.get("autor", "").lower().strip() == autor.lower().strip()
+        if leitura.autor.lower().strip() == autor.lower().strip()
     ]
     
     if not filtered_leituras:
@@ -215,4 +210,4 @@ def get_leituras_by_author(autor: str):
             detail=f"Nenhuma leitura encontrada do autor '{autor}'. Use /leituras para ver todos os autores disponíveis."
         )
     
-    return [LeituraInspiradora(**leitura) for leitura in filtered_leituras] 
\ No newline at end of file
+    return projection.apply(page.apply(sorting.apply(filtered_leituras, 'leituras'))) 
\ No newline at end of file
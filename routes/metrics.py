@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from middleware.metrics import CONTENT_TYPE, REGISTRY
+from repository.serialization import JSONRoute
+
+router = APIRouter(route_class=JSONRoute)
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    tags=["Métricas"],
+    summary="Métricas no formato Prometheus",
+    description="""Métricas de cada rota no formato de texto do Prometheus.
+
+**Métricas expostas:**
+- `dnd_api_requests_total` - Requisições por método, rota e status
+- `dnd_api_request_duration_seconds` - Histograma da latência total
+- `dnd_api_response_size_bytes` - Histograma do tamanho das respostas
+- `dnd_api_request_phase_seconds` - Histograma por fase: `load` (carga dos dados), `filter` (lógica da rota), `model` (montagem de modelos) e `serialize` (validação e JSON)
+
+As rotas aparecem com os parâmetros (`/spells/{spell_id}`); URLs que não existem são agrupadas em `<unmatched>`.
+Com vários workers, cada coleta mostra os números do worker que a atendeu."""
+)
+async def metrics():
+    """Métricas acumuladas deste worker."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
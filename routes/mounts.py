@@ -1,27 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
 from models.mount import Mount
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/mounts.json', encoding='utf-8') as f:
-    mounts_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_mount_by_id(idx: int):
-    if 0 <= idx < len(mounts_data):
-        return mounts_data[idx]
+    mounts = get_dataset().mounts
+    if 0 <= idx < len(mounts):
+        return mounts[idx]
     return None
 
 @router.get('/mounts', response_model=List[Mount], tags=["Montarias e Veículos"], summary="Listar todas as montarias e veículos", description="Retorna uma lista de todas as montarias, veículos e equipamentos relacionados disponíveis.")
-def list_mounts():
+async def list_mounts(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as montarias, veículos e equipamentos relacionados do PHB."""
-    return mounts_data
+    return projection.apply(page.apply(sorting.apply(dataset.mounts, 'mounts')))
 
 @router.get('/mounts/{id}', response_model=Mount, tags=["Montarias e Veículos"], summary="Detalhes de uma montaria ou veículo", description="Retorna os detalhes de uma montaria ou veículo específico pelo índice.")
-def get_mount(id: int):
+async def get_mount(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma montaria ou veículo pelo índice."""
     item = get_mount_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Montaria/veículo não encontrado')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
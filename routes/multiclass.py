@@ -1,22 +1,28 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Optional
-import json
 from models.multiclass_requirement import MulticlassRequirement
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/multiclass_requirements.json', encoding='utf-8') as f:
-    multiclass_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/multiclass', response_model=List[MulticlassRequirement], tags=["Multiclasse"], summary="Listar todas as combinações de multiclasses", description="Retorna todas as combinações possíveis de multiclasses, requisitos de atributos, benefícios e regras gerais. Permite filtrar por classe base (from) e classe desejada (to).")
-def list_multiclass(
+async def list_multiclass(
     from_: Optional[str] = Query(None, alias="from", description="Classe base"),
-    to: Optional[str] = Query(None, description="Classe desejada")
+    to: Optional[str] = Query(None, description="Classe desejada"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as combinações possíveis de multiclasses, com filtros opcionais."""
-    results = [m for m in multiclass_data if 'classe_base' in m and 'classe_desejada' in m]
+    results = dataset.multiclass
     if from_:
-        results = [m for m in results if m.get('classe_base', '').lower() == from_.lower()]
+        results = [m for m in results if m.classe_base.lower() == from_.lower()]
     if to:
-        results = [m for m in results if m.get('classe_desejada', '').lower() == to.lower()]
-    return results 
\ No newline at end of file
+        results = [m for m in results if m.classe_desejada.lower() == to.lower()]
+    return projection.apply(page.apply(sorting.apply(results, 'multiclass'))) 
\ No newline at end of file
@@ -1,20 +1,18 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-import json
-import os
 from models.plane import PlanoExistencia
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-def load_planes_data() -> List[dict]:
-    """Carrega os dados dos planos do arquivo JSON."""
-    try:
-        with open("data/planos.json", "r", encoding="utf-8") as file:
-            return json.load(file)
-    except FileNotFoundError:
-        return []
-    except json.JSONDecodeError:
-        return []
+# Lista completa pré-serializada, servida quando não há filtros
+all_planes_response = cached_response(lambda: list(get_dataset().planes), List[PlanoExistencia])
 
 @router.get(
     "/planos",
@@ -46,39 +44,41 @@ def load_planes_data() -> List[dict]:
 - Busca por alinhamento
 - Referência para mestres e jogadores"""
 )
-def get_planes(
+async def get_planes(
     tipo: Optional[str] = Query(None, alias="tipo", description="Filtrar por tipo de plano"),
     alinhamento: Optional[str] = Query(None, alias="alinhamento", description="Filtrar por alinhamento"),
-    associado_a: Optional[str] = Query(None, alias="associado_a", description="Filtrar por deus, elemento ou energia associada")
+    associado_a: Optional[str] = Query(None, alias="associado_a", description="Filtrar por deus, elemento ou energia associada"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Retorna todos os planos com filtros opcionais."""
-    planes_data = load_planes_data()
-    
-    if not planes_data:
-        return []
-    
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (tipo, alinhamento, associado_a)) and not page.active and not sorting.active and not projection.active:
+        return all_planes_response()
     # Aplicar filtros
-    filtered_planes = planes_data
+    filtered_planes = dataset.planes
     
     if tipo:
         filtered_planes = [
             plane for plane in filtered_planes 
-            if plane.get("tipo", "").lower().strip() == tipo.lower().strip()
+            if plane.tipo.lower().strip() == tipo.lower().strip()
         ]
     
     if alinhamento:
         filtered_planes = [
             plane for plane in filtered_planes 
-            if plane.get("alinhamento", "").lower().strip() == alinhamento.lower().strip()
+            if (plane.alinhamento or "").lower().strip() == alinhamento.lower().strip()
         ]
     
     if associado_a:
         filtered_planes = [
             plane for plane in filtered_planes 
-            if associado_a.lower().strip() in plane.get("associado_a", "").lower().strip()
+            if associado_a.lower().strip() in (plane.associado_a or "").lower().strip()
         ]
     
-    return [PlanoExistencia(**plane) for plane in filtered_planes]
+    return projection.apply(page.apply(sorting.apply(filtered_planes, 'planes')))
 
 @router.get(
     "/planos/{plane_id}",
@@ -111,22 +111,17 @@ def get_planes(
 - `abismo`, `inferno`, `limbo`, `acheron`
 - E muitos outros..."""
 )
-def get_plane_by_id(plane_id: str):
+async def get_plane_by_id(plane_id: str, projection: Projection = Depends(get_projection)):
     """Retorna os detalhes de um plano específico."""
-    planes_data = load_planes_data()
-    
-    for plane in planes_data:
-        if plane.get("id") == plane_id:
-            return PlanoExistencia(**plane)
-    
-    # Se não encontrou, tenta buscar por nome (case-insensitive)
-    for plane in planes_data:
-        if plane.get("nome", "").lower().replace(" ", "-").replace("ã", "a").replace("ç", "c") == plane_id.lower():
-            return PlanoExistencia(**plane)
+    # Busca pelo ID ou pelo slug do nome (sem acentos)
+    lookup = get_dataset().lookups['planes']
+    plane = lookup.get(plane_id)
+    if plane is not None:
+        return projection.apply(plane)
     
     raise HTTPException(
         status_code=404,
-        detail=f"Plano '{plane_id}' não encontrado. Use /planos para ver todos os planos disponíveis."
+        detail=lookup.not_found(plane_id, f"Plano '{plane_id}' não encontrado. Use /planos para ver todos os planos disponíveis.")
     )
 
 @router.get(
@@ -154,13 +149,13 @@ def get_plane_by_id(plane_id: str):
 - Referência para conjuração
 - Contexto para aventuras"""
 )
-def get_planes_by_type(tipo: str):
+async def get_planes_by_type(tipo: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todos os planos de um tipo específico."""
-    planes_data = load_planes_data()
+    planes_data = dataset.planes
     
     filtered_planes = [
         plane for plane in planes_data 
-        if plane.get("tipo", "").lower().strip() == tipo.lower().strip()
+        if plane.tipo.lower().strip() == tipo.lower().strip()
     ]
     
     if not filtered_planes:
@@ -169,7 +164,7 @@ def get_planes_by_type(tipo: str):
             detail=f"Nenhum plano encontrado do tipo '{tipo}'. Tipos disponíveis: Material, Interior, Exterior, Transitivo"
         )
     
-    return [PlanoExistencia(**plane) for plane in filtered_planes]
+    return projection.apply(page.apply(sorting.apply(filtered_planes, 'planes')))
 
 @router.get(
     "/planos/alinhamentos/{alinhamento}",
@@ -195,13 +190,13 @@ def get_planes_by_type(tipo: str):
 - Contexto para narrativa
 - Referência para deuses"""
 )
-def get_planes_by_alignment(alinhamento: str):
+async def get_planes_by_alignment(alinhamento: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Retorna todos os planos de um alinhamento específico."""
-    planes_data = load_planes_data()
+    planes_data = dataset.planes
     
     filtered_planes = [
         plane for plane in planes_data 
-        if plane.get("alinhamento", "").lower().strip() == alinhamento.lower().strip()
+        if (plane.alinhamento or "").lower().strip() == alinhamento.lower().strip()
     ]
     
     if not filtered_planes:
@@ -210,4 +205,4 @@ def get_planes_by_alignment(alinhamento: str):
             detail=f"Nenhum plano encontrado com alinhamento '{alinhamento}'. Use /planos para ver todos os alinhamentos disponíveis."
         )
     
-    return [PlanoExistencia(**plane) for plane in filtered_planes] 
\ No newline at end of file
+    return projection.apply(page.apply(sorting.apply(filtered_planes, 'planes'))) 
\ No newline at end of file
@@ -1,50 +1,32 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from models.race import Race, SubRace
 from typing import List, Optional
-import json
-import os
-import unicodedata
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/races.json')
-
-def normalize(text: str) -> str:
-    if not text:
-        return ""
-    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII').lower()
-
-def load_races() -> List[Race]:
-    with open(DATA_PATH, encoding='utf-8') as f:
-        data = json.load(f)
-        return [Race(**race) for race in data]
-
-def load_all_subraces() -> List[dict]:
-    """Retorna todas as sub-raças do arquivo, com referência ao id da raça."""
-    races = load_races()
-    subraces = []
-    for race in races:
-        if race.subracas:
-            for idx, sub in enumerate(race.subracas):
-                sub_dict = sub.model_dump() if hasattr(sub, 'model_dump') else (sub.dict() if hasattr(sub, 'dict') else dict(sub))
-                sub_dict['race_id'] = race.id
-                sub_dict['subrace_id'] = f"{race.id}_{idx+1}"
-                sub_dict['race_nome'] = race.nome
-                subraces.append(sub_dict)
-    return subraces
+router = APIRouter(route_class=JSONRoute)
 
 @router.get("/racas", response_model=List[Race], tags=["Raças"], summary="Lista todas as raças ou filtra por nome/tamanho", description="Lista todas as raças do PHB ou filtra por nome, tamanho, característica, bônus e permite ordenação.")
-def get_races(name: Optional[str] = Query(None, description="Busca parcial pelo nome da raça, ex: 'anão' ou 'anao'"), size: Optional[str] = Query(None, alias="size", description="Filtra raças pelo tamanho, ex: 'médio' ou 'medio'"), order: Optional[str] = Query(None, description="Ordena as raças pelo campo especificado, ex: 'nome'"), filter: Optional[str] = Query(None, description="Filtra raças por característica, ex: 'visao_no_escuro', 'resiliencia', 'proficiencias', etc."), bonus: Optional[str] = Query(None, description="Filtra raças por bônus de habilidade, ex: 'forca', 'destreza', etc.")):
+async def get_races(name: Optional[str] = Query(None, description="Busca parcial pelo nome da raça, ex: 'anão' ou 'anao'"), size: Optional[str] = Query(None, alias="size", description="Filtra raças pelo tamanho, ex: 'médio' ou 'medio'"), order: Optional[str] = Query(None, description="Ordena as raças pelo nome ('nome'); equivale a sort=nome"), filter: Optional[str] = Query(None, description="Filtra raças por característica, ex: 'visao_no_escuro', 'resiliencia', 'proficiencias', etc."), bonus: Optional[str] = Query(None, description="Filtra raças por bônus de habilidade, ex: 'forca', 'destreza', etc."), dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as raças ou filtra por nome/tamanho, característica, bônus e permite ordenação."""
-    races = load_races()
+    keys = dataset.search_keys['races']
+    positions = keys.positions()
     if name:
-        name_norm = normalize(name)
-        races = [race for race in races if name_norm in normalize(race.nome)]
+        positions = keys.contains('nome', name, positions)
     if size:
-        size_norm = normalize(size)
-        races = [race for race in races if size_norm in normalize(race.tamanho)]
+        positions = keys.contains('tamanho', size, positions)
+    if bonus:
+        positions = keys.contains('aumento_habilidade', bonus, positions)
+    races = keys.take(positions)
+    # ``order=nome`` é anterior a ``sort=`` e continua aceito
+    if order == "nome" and not sorting.active:
+        sorting = Sorting(dataset, "nome")
+    races = sorting.apply(races, 'races')
     if filter:
-        filter_norm = normalize(filter)
         filtered = []
         for race in races:
             value = getattr(race, filter, None)
@@ -54,51 +36,36 @@ def get_races(name: Optional[str] = Query(None, description="Busca parcial pelo
                 elif isinstance(value, str) and value.strip():
                     filtered.append(race)
         races = filtered
-    if bonus:
-        bonus_norm = normalize(bonus)
-        filtered = []
-        for race in races:
-            if bonus_norm in normalize(race.aumento_habilidade):
-                filtered.append(race)
-        races = filtered
-    if order == "nome":
-        races = sorted(races, key=lambda r: normalize(r.nome))
-    return races
+    return projection.apply(page.apply(races))
 
 @router.get("/racas/{race_id}", response_model=Race, tags=["Raças"], summary="Detalhes de uma raça", description="Retorna todos os detalhes de uma raça específica pelo seu ID.")
-def get_race(race_id: int):
+async def get_race(race_id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma raça pelo ID."""
-    races = load_races()
-    for race in races:
-        if race.id == race_id:
-            return race
-    raise HTTPException(status_code=404, detail="Raça não encontrada")
+    race = get_dataset().lookups['races'].get(race_id)
+    if race is None:
+        raise HTTPException(status_code=404, detail="Raça não encontrada")
+    return projection.apply(race)
 
 @router.get("/racas/{race_id}/subracas", response_model=List[SubRace], tags=["Raças"], summary="Lista sub-raças de uma raça", description="Lista todas as sub-raças de uma raça específica pelo ID.")
-def get_subraces_of_race(race_id: int):
+async def get_subraces_of_race(race_id: int, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as sub-raças de uma raça pelo ID."""
-    races = load_races()
-    for race in races:
-        if race.id == race_id:
-            if not race.subracas:
-                return []
-            return race.subracas
-    raise HTTPException(status_code=404, detail="Raça não encontrada")
+    race = dataset.lookups['races'].get(race_id)
+    if race is None:
+        raise HTTPException(status_code=404, detail="Raça não encontrada")
+    return projection.apply(page.apply(sorting.apply(race.subracas or [], 'race_subraces')))
 
-@router.get("/subracas/{subrace_id}", tags=["Sub-raças"], summary="Detalhes de uma sub-raça", description="Retorna todos os detalhes de uma sub-raça específica pelo seu ID.")
-def get_subrace_by_id(subrace_id: str):
+@router.get("/subracas/{subrace_id}", tags=["Sub-raças"], summary="Detalhes de uma sub-raça", description="Retorna todos os detalhes de uma sub-raça específica pelo seu ID (ex: '1_1') ou pelo nome sem acentos (ex: 'anao-da-colina').")
+async def get_subrace_by_id(subrace_id: str, projection: Projection = Depends(get_projection)):
     """Detalhes de uma sub-raça pelo ID."""
-    subraces = load_all_subraces()
-    for sub in subraces:
-        if sub["subrace_id"] == subrace_id:
-            return sub
-    raise HTTPException(status_code=404, detail="Sub-raça não encontrada")
+    lookup = get_dataset().lookups['subraces']
+    sub = lookup.get(subrace_id)
+    if sub is None:
+        raise HTTPException(status_code=404, detail=lookup.not_found(subrace_id, "Sub-raça não encontrada"))
+    return projection.apply(sub)
 
 @router.get("/subracas", tags=["Sub-raças"], summary="Busca sub-raças por nome", description="Busca sub-raças do PHB por nome.")
-def search_subraces(name: Optional[str] = Query(None, description="Busca parcial pelo nome da sub-raça")):
+async def search_subraces(name: Optional[str] = Query(None, description="Busca parcial pelo nome da sub-raça"), dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Busca sub-raças por nome."""
-    subraces = load_all_subraces()
-    if name:
-        name_norm = normalize(name)
-        subraces = [sub for sub in subraces if name_norm in normalize(sub["nome"])]
-    return subraces 
\ No newline at end of file
+    keys = dataset.search_keys['subraces']
+    subraces = keys.search('nome', name) if name else keys.items
+    return projection.apply(page.apply(sorting.apply(subraces, 'subraces'))) 
\ No newline at end of file
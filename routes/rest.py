@@ -1,13 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import List
-import json
 from models.rest_rule import RestRule
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/rest.json', encoding='utf-8') as f:
-    rest_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/rest', response_model=List[RestRule], tags=["Descanso"], summary="Listar regras de descanso", description="Retorna regras de descanso curto, longo, exaustão, fome e sede.")
-def list_rest():
-    return rest_data 
\ No newline at end of file
+async def list_rest(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    return projection.apply(page.apply(sorting.apply(dataset.rest, 'rest'))) 
\ No newline at end of file
@@ -1,29 +1,29 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Optional
-import json
 from models.rule import Rule
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/rules.json', encoding='utf-8') as f:
-    rules_data = json.load(f)
-
-with open('data/combat_rules.json', encoding='utf-8') as f:
-    combat_rules_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/rules', response_model=List[Rule], tags=["Regras"], summary="Listar regras gerais", description="Retorna uma lista de regras gerais aplicáveis a testes, CD, vantagem/desvantagem, passivo, ajuda, etc.")
-def list_rules(type: Optional[str] = Query(None, description="Filtrar por tipo de regra, ex: exaustao, percepcao")):
-    results = rules_data
+async def list_rules(type: Optional[str] = Query(None, description="Filtrar por tipo de regra, ex: exaustao, percepcao"), dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    results = dataset.rules
     if type:
-        results = [r for r in results if type.lower() in r['nome'].lower()]
-    return results 
+        results = [r for r in results if type.lower() in r.nome.lower()]
+    return projection.apply(page.apply(sorting.apply(results, 'rules'))) 
 
 @router.get('/rules/combat', tags=["Regras de Combate"], summary="Listar regras de combate", description="Retorna uma lista de regras específicas de combate. Permite filtrar por tipo.")
-def list_combat_rules(type: Optional[str] = Query(None, description="Filtrar por tipo de regra, ex: iniciativa, rodada, dano")):
-    results = combat_rules_data
+async def list_combat_rules(type: Optional[str] = Query(None, description="Filtrar por tipo de regra, ex: iniciativa, rodada, dano"), dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
+    results = dataset.combat_rules
     if type:
         results = [r for r in results if type.lower() in r['tipo'].lower()]
-    return results
+    return projection.apply(page.apply(sorting.apply(results, 'combat_rules')))
 
 @router.get('/rules/spells', tags=["Regras de Conjuração"], summary="Regras gerais de conjuração", description="""Retorna as regras gerais de conjuração de magias, incluindo espaços de magia, preparação, habilidade de conjuração e mais.
 
@@ -50,7 +50,7 @@ def list_combat_rules(type: Optional[str] = Query(None, description="Filtrar por
 - Apenas uma magia de concentração por vez
 - Magias podem gerar ataques de oportunidade"""
 )
-def get_spellcasting_rules():
+async def get_spellcasting_rules():
     """Regras gerais de conjuração de magias."""
     spellcasting_rules = {
         "titulo": "Regras Gerais de Conjuração",
@@ -138,7 +138,7 @@ def get_spellcasting_rules():
 - Componentes com custo específico devem ser fornecidos mesmo com foco
 - Componentes são consumidos apenas se especificado na descrição da magia"""
 )
-def get_spell_components():
+async def get_spell_components():
     """Explicação dos componentes de magia."""
     components_rules = {
         "titulo": "Componentes de Magia",
@@ -209,7 +209,7 @@ def get_spell_components():
 - Alarme
 - Purificar Comida e Bebida"""
 )
-def get_spell_rituals():
+async def get_spell_rituals():
     """Diferença entre magia normal e ritual."""
     ritual_rules = {
         "titulo": "Magias Rituais",
@@ -288,8 +288,12 @@ def get_spell_rituals():
 **Exemplo:**
 - Mago nível 5: 4 espaços de 1º nível, 3 espaços de 2º nível, 2 espaços de 3º nível"""
 )
-def get_spell_slot_table():
+async def get_spell_slot_table():
     """Tabela de espaços de magia por nível e classe."""
+    return spell_slot_table_response()
+
+def build_spell_slot_table() -> dict:
+    """Monta a tabela de espaços de magia por nível e classe."""
     slot_table = {
         "titulo": "Tabela de Espaços de Magia",
         "descricao": "Número de espaços de magia disponíveis por nível de personagem e classe conjuradora",
@@ -377,4 +381,7 @@ def get_spell_slot_table():
             "Truques (nível 0) não consomem espaços de magia"
         ]
     }
-    return slot_table 
\ No newline at end of file
+    return slot_table
+
+# Tabela pré-serializada, renderizada uma vez na inicialização
+spell_slot_table_response = cached_response(build_spell_slot_table)
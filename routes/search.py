@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import List, Optional
+from models.search import SearchResult
+from repository.dataset import get_dataset
+from repository.serialization import JSONRoute
+from repository.timing import phase
+
+router = APIRouter(route_class=JSONRoute)
+
+SEARCH_TYPES = ["spells", "criaturas", "conditions", "deuses", "planos", "leituras", "backgrounds"]
+
+@router.get(
+    "/search",
+    response_model=List[SearchResult],
+    tags=["Busca"],
+    summary="Busca de texto completo",
+    description="""Busca termos em todos os textos da API com um índice invertido construído na inicialização.
+
+**Textos indexados:**
+- **Magias:** nome e texto
+- **Criaturas:** nome, ataques e notas
+- **Condições:** nome e efeitos
+- **Divindades:** nome e domínios
+- **Planos:** nome e descrição
+- **Leituras:** título e influência
+- **Antecedentes:** nome, descrição e habilidade especial
+
+**Funcionamento:**
+- Busca sem acentos e sem diferenciar maiúsculas/minúsculas
+- Resultados ranqueados por relevância (BM25)
+- Cada resultado traz o tipo, o ID e a rota de detalhe da entidade
+- `tipo` aceita: spells, criaturas, conditions, deuses, planos, leituras e backgrounds; outros valores retornam 400
+
+**Exemplos de uso:**
+- `GET /search?q=desvantagem` - Tudo que menciona desvantagem
+- `GET /search?q=fogo&tipo=spells` - Apenas magias
+- `GET /search?q=veneno&tipo=criaturas&tipo=conditions` - Criaturas e condições"""
+)
+async def search(
+    q: str = Query(..., min_length=1, description="Termos da busca", examples=["desvantagem", "fogo", "morte"]),
+    tipo: Optional[List[str]] = Query(None, description="Restringe a busca a tipos de entidade", examples=[["spells", "criaturas"]]),
+    limit: int = Query(20, ge=1, le=100, description="Número máximo de resultados")
+):
+    """Busca de texto completo em todas as entidades."""
+    unknown = [t for t in tipo or [] if t not in SEARCH_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Tipos inválidos: {', '.join(unknown)}. Tipos disponíveis: {', '.join(SEARCH_TYPES)}")
+    hits = get_dataset().text_index.search(q, tipos=tipo, limit=limit)
+    with phase("model"):
+        return [
+            SearchResult(
+                tipo=hit.document.tipo,
+                id=hit.document.id,
+                nome=hit.document.nome,
+                url=hit.document.url,
+                score=round(hit.score, 4),
+            )
+            for hit in hits
+        ]
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Optional
-import json
 from models.skill import Skill
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/skills.json', encoding='utf-8') as f:
-    skills_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/skills', response_model=List[Skill], tags=["Perícias"], summary="Listar todas as perícias", description="Retorna uma lista de todas as perícias do sistema, com habilidade associada e descrição. Permite filtrar por habilidade associada.")
-def list_skills(
-    ability: Optional[str] = Query(None, description="Filtrar por habilidade associada (ex: Destreza)")
+async def list_skills(
+    ability: Optional[str] = Query(None, description="Filtrar por habilidade associada (ex: Destreza)"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
-    results = skills_data
+    results = dataset.skills
     if ability:
-        results = [s for s in results if s['habilidade_associada'].lower() == ability.lower()]
-    return results 
\ No newline at end of file
+        results = [s for s in results if s.habilidade_associada.lower() == ability.lower()]
+    return projection.apply(page.apply(sorting.apply(results, 'skills'))) 
\ No newline at end of file
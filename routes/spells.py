@@ -1,17 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Depends
+from typing import List, Optional, Union
 from models.spell import Spell
-import json
-import os
+from models.search import FuzzyMatch
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.responses import cached_response
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
+from repository.timing import phase
 
-router = APIRouter()
+router = APIRouter(route_class=JSONRoute)
 
-DATA_PATH = os.path.join(os.path.dirname(__file__), '../data/spells.json')
-
-def load_spells() -> List[Spell]:
-    with open(DATA_PATH, encoding='utf-8') as f:
-        data = json.load(f)
-        return [Spell(**spell) for spell in data]
+# Lista completa pré-serializada, servida quando não há filtros
+all_spells_response = cached_response(lambda: list(get_dataset().spells), List[Spell])
 
 @router.get(
     "/spells",
@@ -39,41 +42,34 @@ def load_spells() -> List[Spell]:
 
 **Alcances:** Pessoal, Toque, 9 metros, 18 metros, 36 metros, 45 metros, etc."""
 )
-def get_spells(
+async def get_spells(
     level: Optional[int] = Query(None, description="Filtra magias por nível (0-9)", examples=[0, 1, 3, 5, 9]),
     school: Optional[str] = Query(None, description="Filtra magias por escola", examples=["Evocação", "Abjuração", "Ilusão", "Necromancia"]),
     class_: Optional[str] = Query(None, description="Filtra magias por classe conjuradora", examples=["Mago", "Clérigo", "Druida", "Bardo"]),
     component: Optional[str] = Query(None, description="Filtra magias por componente (V, S, M)", examples=["V", "S", "M"]),
     ritual: Optional[bool] = Query(None, description="Filtra magias que podem ser conjuradas como ritual", examples=[True, False]),
     concentration: Optional[bool] = Query(None, description="Filtra magias que requerem concentração", examples=[True, False]),
-    range_: Optional[str] = Query(None, description="Filtra magias por alcance", examples=["Toque", "Pessoal", "9 metros", "45 metros"])
+    range_: Optional[str] = Query(None, description="Filtra magias por alcance", examples=["Toque", "Pessoal", "9 metros", "45 metros"]),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as magias do PHB, com filtros opcionais."""
-    spells = load_spells()
-    
-    # Aplicar filtros sequencialmente
-    if level is not None and level >= 0:
-        spells = [spell for spell in spells if spell.nivel == level]
-    
-    if school and school.strip():
-        spells = [spell for spell in spells if school.lower().strip() == spell.escola.lower()]
-    
-    if class_ and class_.strip():
-        spells = [spell for spell in spells if any(class_.lower().strip() == c.lower() for c in spell.classes_conjuradoras)]
-    
-    if component and component.strip():
-        spells = [spell for spell in spells if component.upper().strip() in spell.componentes]
-    
-    if ritual is not None:
-        spells = [spell for spell in spells if spell.ritual == ritual]
-    
-    if concentration is not None:
-        spells = [spell for spell in spells if spell.concentracao == concentration]
-    
-    if range_ and range_.strip():
-        spells = [spell for spell in spells if range_.lower().strip() == spell.alcance.lower()]
-    
-    return spells
+    # Sem filtros, serve os bytes pré-renderizados da lista completa
+    if all(param is None for param in (level, school, class_, component, ritual, concentration, range_)) and not page.active and not sorting.active and not projection.active:
+        return all_spells_response()
+    # Filtros resolvidos por interseção dos índices secundários
+    spells = dataset.spell_index.query(
+        level=level,
+        school=school,
+        class_=class_,
+        component=component,
+        ritual=ritual,
+        concentration=concentration,
+        range_=range_,
+    )
+    return projection.apply(page.apply(sorting.apply(spells, 'spells')))
 
 @router.get(
     "/spells/ritual",
@@ -101,11 +97,9 @@ Magias rituais podem ser conjuradas sem gastar espaço de magia, mas levam 10 mi
 - Tempo muito maior
 - Não pode ser usado em combate"""
 )
-def get_ritual_spells():
+async def get_ritual_spells(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias que podem ser conjuradas como ritual."""
-    spells = load_spells()
-    ritual_spells = [spell for spell in spells if spell.ritual]
-    return ritual_spells
+    return projection.apply(page.apply(sorting.apply(dataset.spell_index.query(ritual=True), 'spells')))
 
 @router.get(
     "/spells/concentracao",
@@ -135,11 +129,9 @@ Magias de concentração mantêm seu efeito ativo enquanto o conjurador mantém
 - Proteja o conjurador para manter a concentração
 - Tenha planos alternativos caso a concentração seja quebrada"""
 )
-def get_concentration_spells():
+async def get_concentration_spells(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias que requerem concentração."""
-    spells = load_spells()
-    concentration_spells = [spell for spell in spells if spell.concentracao]
-    return concentration_spells
+    return projection.apply(page.apply(sorting.apply(dataset.spell_index.query(concentration=True), 'spells')))
 
 @router.get(
     "/spells/nivel/{nivel}",
@@ -167,13 +159,12 @@ def get_concentration_spells():
 - **Nível 5:** Magias de grupo e controle
 - **Nível 7-9:** Magias épicas e transformadoras"""
 )
-def get_spells_by_level(nivel: int):
+async def get_spells_by_level(nivel: int, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias de um nível específico."""
-    spells = load_spells()
-    filtered_spells = [spell for spell in spells if spell.nivel == nivel]
+    filtered_spells = dataset.spell_index.at_level(nivel)
     if not filtered_spells:
         raise HTTPException(status_code=404, detail=f"Nenhuma magia encontrada para o nível {nivel}")
-    return filtered_spells
+    return projection.apply(page.apply(sorting.apply(filtered_spells, 'spells')))
 
 @router.get(
     "/spells/escola/{escola}",
@@ -221,13 +212,12 @@ def get_spells_by_level(nivel: int):
 - `GET /spells/escola/Abjuração` - Magias de proteção
 - `GET /spells/escola/Ilusão` - Magias de engano"""
 )
-def get_spells_by_school(escola: str):
+async def get_spells_by_school(escola: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias de uma escola específica."""
-    spells = load_spells()
-    filtered_spells = [spell for spell in spells if escola.lower() in spell.escola.lower()]
+    filtered_spells = dataset.spell_index.by_school_containing(escola)
     if not filtered_spells:
         raise HTTPException(status_code=404, detail=f"Nenhuma magia encontrada para a escola {escola}")
-    return filtered_spells
+    return projection.apply(page.apply(sorting.apply(filtered_spells, 'spells')))
 
 @router.get(
     "/spells/classe/{classe}",
@@ -283,17 +273,16 @@ def get_spells_by_school(escola: str):
 - `GET /spells/classe/Clérigo` - Magias do clérigo
 - `GET /spells/classe/Druida` - Magias do druida"""
 )
-def get_spells_by_class(classe: str):
+async def get_spells_by_class(classe: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias que uma classe específica pode conjurar."""
-    spells = load_spells()
-    filtered_spells = [spell for spell in spells if classe.lower() in [c.lower() for c in spell.classes_conjuradoras]]
+    filtered_spells = dataset.spell_index.by_classes([classe])
     if not filtered_spells:
         raise HTTPException(status_code=404, detail=f"Nenhuma magia encontrada para a classe {classe}")
-    return filtered_spells
+    return projection.apply(page.apply(sorting.apply(filtered_spells, 'spells')))
 
 @router.get(
     "/spells/busca/{nome}",
-    response_model=List[Spell],
+    response_model=Union[List[Spell], List[FuzzyMatch[Spell]]],
     tags=["Magias"],
     summary="Busca magias por nome",
     description="""Busca magias que contenham o termo especificado no nome.
@@ -320,15 +309,32 @@ def get_spells_by_class(classe: str):
 - `GET /spells/busca/Bola` - Bola de Fogo
 - `GET /spells/busca/Curar` - Curar Ferimentos
 - `GET /spells/busca/Invis` - Invisibilidade
-- `GET /spells/busca/Missil` - Mísseis Mágicos"""
+- `GET /spells/busca/Missil` - Mísseis Mágicos
+
+**Busca tolerante a erros (`fuzzy=true`):**
+Retorna candidatos ranqueados por similaridade com o nome, no formato `{"similaridade": 0.67, "item": {...}}`.
+- `GET /spells/busca/bola de fgo?fuzzy=true` - Bola de Fogo
+- `GET /spells/busca/envisibilidade?fuzzy=true` - Invisibilidade
+
+**Campos (`fields=`):** `GET /spells/busca/fogo?fields=nome` devolve só os campos pedidos; com `fuzzy=true` os caminhos partem de `{similaridade, item}`, ex: `fields=similaridade,item.nome`."""
 )
-def search_spells_by_name(nome: str):
+async def search_spells_by_name(
+    nome: str,
+    fuzzy: bool = Query(False, description="Busca tolerante a erros de digitação, com candidatos ranqueados por similaridade"),
+    projection: Projection = Depends(get_projection)
+):
     """Busca magias que contenham o termo especificado no nome."""
-    spells = load_spells()
-    filtered_spells = [spell for spell in spells if nome.lower() in spell.nome.lower()]
+    if fuzzy:
+        candidates = get_dataset().fuzzy('spells', nome)
+        with phase("model"):
+            matches = [FuzzyMatch[Spell](similaridade=score, item=spell) for spell, score in candidates]
+        if not matches:
+            raise HTTPException(status_code=404, detail=f"Nenhuma magia encontrada parecida com '{nome}'")
+        return projection.apply(matches)
+    filtered_spells = get_dataset().search_keys['spells'].search('nome', nome)
     if not filtered_spells:
         raise HTTPException(status_code=404, detail=f"Nenhuma magia encontrada contendo '{nome}'")
-    return filtered_spells
+    return projection.apply(filtered_spells)
 
 @router.get(
     "/spells/classes/{class_name}",
@@ -365,10 +371,8 @@ Este endpoint oferece mapeamento inteligente de nomes e suporte a variações, s
 **Uso recomendado:**
 Para aplicações que precisam de flexibilidade na entrada do usuário."""
 )
-def get_spells_by_class_name(class_name: str):
+async def get_spells_by_class_name(class_name: str, dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as magias conhecidas/preparadas por uma classe específica."""
-    spells = load_spells()
-    
     # Normalizar o nome da classe para comparação
     class_name_lower = class_name.lower().strip()
     
@@ -396,12 +400,7 @@ def get_spells_by_class_name(class_name: str):
     target_classes = class_mapping.get(class_name_lower, [class_name])
     
     # Filtrar magias que a classe pode conjurar
-    filtered_spells = []
-    for spell in spells:
-        for target_class in target_classes:
-            if any(target_class.lower() == c.lower() for c in spell.classes_conjuradoras):
-                filtered_spells.append(spell)
-                break
+    filtered_spells = dataset.spell_index.by_classes(target_classes)
     
     if not filtered_spells:
         raise HTTPException(
@@ -409,7 +408,7 @@ def get_spells_by_class_name(class_name: str):
             detail=f"Nenhuma magia encontrada para a classe '{class_name}'. Classes disponíveis: Mago, Clérigo, Druida, Bardo, Feiticeiro, Warlock, Paladino, Ranger"
         )
     
-    return filtered_spells
+    return projection.apply(page.apply(sorting.apply(filtered_spells, 'spells')))
 
 @router.get(
     "/spells/{spell_id}",
@@ -444,9 +443,9 @@ def get_spells_by_class_name(class_name: str):
 **Uso típico:**
 Após listar magias com filtros, use o ID para obter detalhes completos."""
 )
-def get_spell(spell_id: int):
+async def get_spell(spell_id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma magia pelo ID."""
-    spells = load_spells()
+    spells = get_dataset().spells
     if 1 <= spell_id <= len(spells):
-        return spells[spell_id - 1]
+        return projection.apply(spells[spell_id - 1])
     raise HTTPException(status_code=404, detail="Magia não encontrada") 
\ No newline at end of file
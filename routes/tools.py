@@ -1,27 +1,30 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from typing import List
-import json
 from models.tool import Tool
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/tools.json', encoding='utf-8') as f:
-    tools_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_tool_by_id(idx: int):
-    if 0 <= idx < len(tools_data):
-        return tools_data[idx]
+    tools = get_dataset().tools
+    if 0 <= idx < len(tools):
+        return tools[idx]
     return None
 
 @router.get('/tools', response_model=List[Tool], tags=["Ferramentas"], summary="Listar todas as ferramentas", description="Retorna uma lista de todas as ferramentas e instrumentos disponíveis.")
-def list_tools():
+async def list_tools(dataset: Dataset = Depends(aget_dataset), page: Pagination = Depends(get_pagination), sorting: Sorting = Depends(get_sorting), projection: Projection = Depends(get_projection)):
     """Lista todas as ferramentas e instrumentos do PHB."""
-    return tools_data
+    return projection.apply(page.apply(sorting.apply(dataset.tools, 'tools')))
 
 @router.get('/tools/{id}', response_model=Tool, tags=["Ferramentas"], summary="Detalhes de uma ferramenta", description="Retorna os detalhes de uma ferramenta específica pelo índice.")
-def get_tool(id: int):
+async def get_tool(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma ferramenta ou instrumento pelo índice."""
     item = get_tool_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Ferramenta não encontrada')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
@@ -1,18 +1,24 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Optional
-import json
 from models.travel_rule import TravelRule
+from repository.aio import aget_dataset
+from repository.dataset import Dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/travel.json', encoding='utf-8') as f:
-    travel_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 @router.get('/travel', response_model=List[TravelRule], tags=["Viagem"], summary="Listar ritmos de viagem", description="Retorna todos os ritmos de viagem e regras relacionadas. Permite filtrar por ritmo (pace).")
-def list_travel(
-    pace: Optional[str] = Query(None, description="Filtrar por ritmo de viagem: lento, normal, rápido")
+async def list_travel(
+    pace: Optional[str] = Query(None, description="Filtrar por ritmo de viagem: lento, normal, rápido"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
-    results = travel_data
+    results = dataset.travel
     if pace:
-        results = [t for t in results if t.get('ritmo', '').lower() == pace.lower()]
-    return results 
\ No newline at end of file
+        results = [t for t in results if (t.ritmo or '').lower() == pace.lower()]
+    return projection.apply(page.apply(sorting.apply(results, 'travel'))) 
\ No newline at end of file
@@ -1,35 +1,42 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Depends
 from typing import List, Optional
-import json
 from models.weapon import Weapon
+from repository.aio import aget_dataset
+from repository.dataset import Dataset, get_dataset
+from repository.pagination import Pagination, get_pagination
+from repository.projection import Projection, get_projection
+from repository.serialization import JSONRoute
+from repository.sorting import Sorting, get_sorting
 
-router = APIRouter()
-
-with open('data/weapons.json', encoding='utf-8') as f:
-    weapons_data = json.load(f)
+router = APIRouter(route_class=JSONRoute)
 
 def get_weapon_by_id(idx: int):
-    if 0 <= idx < len(weapons_data):
-        return weapons_data[idx]
+    weapons = get_dataset().weapons
+    if 0 <= idx < len(weapons):
+        return weapons[idx]
     return None
 
 @router.get('/weapons', response_model=List[Weapon], tags=["Armas"], summary="Listar todas as armas", description="Retorna uma lista de todas as armas disponíveis. Permite filtrar por tipo e propriedade.")
-def list_weapons(
+async def list_weapons(
     type: Optional[str] = Query(None, description="Filtrar por categoria da arma (ex: simples, marcial)"),
-    property: Optional[str] = Query(None, description="Filtrar por propriedade da arma (ex: leve, pesada, acuidade)")
+    property: Optional[str] = Query(None, description="Filtrar por propriedade da arma (ex: leve, pesada, acuidade)"),
+    dataset: Dataset = Depends(aget_dataset),
+    page: Pagination = Depends(get_pagination),
+    sorting: Sorting = Depends(get_sorting),
+    projection: Projection = Depends(get_projection)
 ):
     """Lista todas as armas do PHB, com filtros opcionais por tipo e propriedade."""
-    results = weapons_data
+    results = dataset.weapons
     if type:
-        results = [w for w in results if type.lower() in w.get('categoria', '').lower()]
+        results = [w for w in results if type.lower() in w.categoria.lower()]
     if property:
-        results = [w for w in results if any(property.lower() in p.lower() for p in w.get('propriedades', []))]
-    return results
+        results = [w for w in results if any(property.lower() in p.lower() for p in w.propriedades)]
+    return projection.apply(page.apply(sorting.apply(results, 'weapons')))
 
 @router.get('/weapons/{id}', response_model=Weapon, tags=["Armas"], summary="Detalhes de uma arma", description="Retorna os detalhes de uma arma específica pelo índice.")
-def get_weapon(id: int):
+async def get_weapon(id: int, projection: Projection = Depends(get_projection)):
     """Detalhes de uma arma pelo índice."""
     item = get_weapon_by_id(id)
     if not item:
         raise HTTPException(status_code=404, detail='Arma não encontrada')
-    return item 
\ No newline at end of file
+    return projection.apply(item) 
\ No newline at end of file
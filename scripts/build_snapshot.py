@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""
+Compila os arquivos data/*.json no snapshot binário carregado pela API.
+Uso: python scripts/build_snapshot.py [--output caminho]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from repository.dataset import SNAPSHOT_PATH, build_snapshot
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=SNAPSHOT_PATH, help="Caminho do snapshot gerado")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    version = build_snapshot(args.output)
+    elapsed = (time.perf_counter() - start) * 1000
+    size = os.path.getsize(args.output) / 1024
+    print(f"✅ Snapshot {version} gravado em {args.output} ({size:.1f} KiB, {elapsed:.1f} ms)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Servidor com vários workers que compartilham o mesmo dataset em memória.
+
+``uvicorn main:app --workers N`` inicia cada worker com ``spawn``: cada
+processo importa a aplicação e monta sua própria cópia do dataset, dos
+índices e das respostas pré-serializadas. Aqui o processo principal importa
+``main`` uma única vez (o dataset vem do snapshot mapeado em memória),
+congela o heap com ``gc.freeze()`` e cria os workers com ``fork``. Os
+workers herdam essas páginas em copy-on-write e, como o dataset é imutável
+e o coletor de lixo não percorre objetos congelados, elas continuam
+compartilhadas: cada worker extra custa só a memória das suas requisições.
+
+``SIGTERM``/``SIGINT`` param todos os workers; ``SIGHUP`` é repassado a
+cada um deles, que recarrega os arquivos de dados (``repository.reload``).
+Um worker que cai é recriado (``Supervisor``), com espera crescente se ele
+morre logo ao iniciar; se os reinícios passam do limite, o processo
+principal para os demais e sai com código 1.
+
+Uso:
+    python server.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+
+import asyncio
+
+import httpx
+import uvicorn
+
+# Requisições feitas no processo principal antes do fork: inicializações
+# preguiçosas do primeiro acesso (imports, schemas, threads do anyio) ficam
+# nas páginas compartilhadas em vez de serem repetidas em cada worker
+WARM_PATHS = ("/", "/spells", "/spells/1", "/criaturas/corvo", "/criaturas?limit=1&fields=nome")
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Socket de escuta criado antes do fork e herdado por todos os workers."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def warm_app(app) -> None:
+    """Executa ``WARM_PATHS`` direto na aplicação ASGI, sem abrir sockets.
+
+    As métricas dessas requisições são descartadas: sem isso cada worker
+    nasceria com elas em ``/metrics``.
+    """
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+            for path in WARM_PATHS:
+                await client.get(path, headers={"Accept-Encoding": "gzip"})
+
+    from middleware.metrics import REGISTRY
+
+    asyncio.run(run())
+    REGISTRY.reset()
+
+
+def run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    """Executa o uvicorn no processo filho, atendendo no socket herdado."""
+    # Os sinais voltam ao padrão até o uvicorn instalar os seus
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
+    # Objetos criados depois do fork voltam a ser coletados normalmente
+    gc.enable()
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+
+def spawn(config: uvicorn.Config, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(config, sock)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+# Worker que morre antes de MIN_UPTIME segundos conta como falha na
+# inicialização (snapshot inválido, erro de import): o próximo só é criado
+# depois de BACKOFF segundos, tempo que dobra a cada falha seguida até MAX_BACKOFF
+MIN_UPTIME = 5.0
+BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+# O processo principal desiste, para os workers restantes e sai com código 1
+# depois de MAX_STARTUP_FAILURES falhas seguidas na inicialização (com as
+# esperas, cerca de um minuto) ou de mais de MAX_RESTARTS reinícios em
+# RESTART_WINDOW segundos
+MAX_STARTUP_FAILURES = 8
+MAX_RESTARTS = 10
+RESTART_WINDOW = 60.0
+
+
+class Supervisor:
+    """Mantém os workers vivos e repassa os sinais do processo principal.
+
+    ``spawn`` cria um worker e devolve o pid; ``wait``, ``kill``, ``sleep`` e
+    ``clock`` são os de ``os``/``time`` e só mudam nos testes.
+    """
+
+    def __init__(
+        self,
+        spawn: Callable[[], int],
+        wait: Callable[[], Tuple[int, int]] = os.wait,
+        kill: Callable[[int, int], None] = os.kill,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.spawn = spawn
+        self.wait = wait
+        self.kill = kill
+        self.sleep = sleep
+        self.clock = clock
+        # pid -> instante em que o worker foi criado
+        self.children: Dict[int, float] = {}
+        self.stopping = False
+        self.failures = 0
+        self.restarts: Deque[float] = deque()
+
+    def start(self, workers: int) -> None:
+        for _ in range(workers):
+            self.children[self.spawn()] = self.clock()
+
+    def signal_children(self, signum: int) -> None:
+        for pid in list(self.children):
+            try:
+                self.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def stop(self, signum=None, frame=None) -> None:
+        """``SIGTERM``/``SIGINT``: para todos os workers, sem recriá-los."""
+        self.stopping = True
+        self.signal_children(signal.SIGTERM)
+
+    def reload(self, signum=None, frame=None) -> None:
+        """``SIGHUP``: cada worker recarrega o próprio dataset (``repository.reload``)."""
+        self.signal_children(signal.SIGHUP)
+
+    def backoff(self, uptime: float) -> float:
+        """Espera antes de recriar um worker que viveu ``uptime`` segundos."""
+        if uptime >= MIN_UPTIME:
+            self.failures = 0
+            return 0.0
+        self.failures += 1
+        return min(BACKOFF * 2 ** min(self.failures - 1, 16), MAX_BACKOFF)
+
+    def _pause(self, delay: float) -> None:
+        # Em fatias, para que um SIGTERM durante a espera não a prolongue
+        deadline = self.clock() + delay
+        while not self.stopping:
+            remaining = deadline - self.clock()
+            if remaining <= 0:
+                break
+            self.sleep(min(remaining, 0.1))
+
+    def replace(self, pid: int) -> bool:
+        """Trata a saída de um worker; ``False`` se as falhas passaram do limite."""
+        started = self.children.pop(pid, None)
+        # Na parada (ou para filhos desconhecidos), só aguarda os demais
+        if self.stopping or started is None:
+            return True
+        now = self.clock()
+        self.restarts.append(now)
+        while self.restarts and self.restarts[0] <= now - RESTART_WINDOW:
+            self.restarts.popleft()
+        if len(self.restarts) > MAX_RESTARTS:
+            return False
+        delay = self.backoff(now - started)
+        if self.failures >= MAX_STARTUP_FAILURES:
+            return False
+        self._pause(delay)
+        if not self.stopping:
+            self.children[self.spawn()] = self.clock()
+        return True
+
+    def run(self) -> int:
+        """Aguarda os workers até todos saírem; devolve o código de saída do processo principal."""
+        code = 0
+        while self.children:
+            try:
+                pid, _ = self.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            if not self.replace(pid) and code == 0:
+                print("Workers caindo seguidamente; encerrando", file=sys.stderr, flush=True)
+                code = 1
+                self.stop()
+        return code
+
+
+def serve(host: str, port: int, workers: int, log_level: str = "info") -> int:
+    """Carrega a aplicação uma vez e mantém ``workers`` processos filhos atendendo."""
+    # Sem coletas durante a carga: evita tocar (e copiar) páginas que serão compartilhadas
+    gc.disable()
+    from main import app
+
+    # load() importa os protocolos HTTP e o loop aqui, antes do fork, e não em cada worker
+    config = uvicorn.Config(app, log_level=log_level)
+    config.load()
+    warm_app(app)
+    sock = bind_socket(host, port)
+    # Tudo o que foi carregado até aqui fica fora do coletor, inclusive nos workers
+    gc.freeze()
+
+    supervisor = Supervisor(lambda: spawn(config, sock))
+    signal.signal(signal.SIGTERM, supervisor.stop)
+    signal.signal(signal.SIGINT, supervisor.stop)
+    signal.signal(signal.SIGHUP, supervisor.reload)
+
+    supervisor.start(workers)
+    print(f"🎲 {workers} workers em http://{host}:{port} (pid {os.getpid()})", flush=True)
+    code = supervisor.run()
+    sock.close()
+    return code
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor da API D&D 5e com dataset compartilhado entre workers")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    if not hasattr(os, "fork"):
+        sys.exit("server.py precisa de os.fork(); use 'uvicorn main:app --workers N' nesta plataforma")
+    sys.exit(serve(args.host, args.port, args.workers, args.log_level))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import json
 import pytest
 from fastapi.testclient import TestClient
 from main import app
@@ -2480,6 +2481,1468 @@ def test_changelog_statistics():
     for stat in expected_stats:
         assert stat in statistics
 
+# ============================================================================
+# TESTES DO REPOSITÓRIO DE DADOS
+# ============================================================================
+
+def test_dataset_loaded_once():
+    """Testa que o snapshot de dados é compartilhado entre chamadas."""
+    from repository.dataset import get_dataset
+    assert get_dataset() is get_dataset()
+
+def test_dataset_is_immutable():
+    """Testa que o snapshot expõe coleções imutáveis."""
+    import dataclasses
+    from repository.dataset import get_dataset
+    dataset = get_dataset()
+    assert isinstance(dataset.spells, tuple)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        dataset.spells = ()
+
+def test_dataset_models_validated():
+    """Testa que os registros já vêm validados nos modelos."""
+    from repository.dataset import get_dataset
+    from models.spell import Spell
+    from models.creature import Criatura
+    dataset = get_dataset()
+    assert all(isinstance(spell, Spell) for spell in dataset.spells)
+    assert all(isinstance(creature, Criatura) for creature in dataset.creatures)
+    assert all("subrace_id" in sub for sub in dataset.subraces)
+
+def test_dataset_matches_endpoints():
+    """Testa que os endpoints servem os dados do snapshot."""
+    from repository.dataset import get_dataset
+    dataset = get_dataset()
+    assert len(client.get("/spells").json()) == len(dataset.spells)
+    assert len(client.get("/criaturas").json()) == len(dataset.creatures)
+    assert len(client.get("/multiclass").json()) == len(dataset.multiclass)
+
+def test_feats_filter_without_requirements():
+    """Testa filtro de talentos quando algum talento não tem requisitos."""
+    resp = client.get("/feats?class=Guerreiro")
+    assert resp.status_code == 200
+
+def test_travel_filter_without_pace():
+    """Testa filtro de viagem quando alguma regra não tem ritmo."""
+    resp = client.get("/travel?pace=normal")
+    assert resp.status_code == 200
+
+# ============================================================================
+# TESTES DO ÍNDICE DE MAGIAS
+# ============================================================================
+
+def test_spell_index_matches_linear_scan():
+    """Testa que o índice retorna o mesmo que uma varredura linear."""
+    from repository.dataset import get_dataset
+    dataset = get_dataset()
+    expected = [
+        s for s in dataset.spells
+        if s.nivel == 1 and "Mago" in s.classes_conjuradoras and "V" in s.componentes
+    ]
+    assert dataset.spell_index.query(level=1, class_="mago", component="v") == expected
+
+def test_spell_index_preserves_catalog_order():
+    """Testa que o resultado mantém a ordem original do catálogo."""
+    from repository.dataset import get_dataset
+    dataset = get_dataset()
+    result = dataset.spell_index.query(concentration=True)
+    positions = [dataset.spells.index(s) for s in result]
+    assert positions == sorted(positions)
+
+def test_spell_index_no_filters_returns_all():
+    """Testa que a consulta sem filtros retorna todas as magias."""
+    from repository.dataset import get_dataset
+    dataset = get_dataset()
+    assert dataset.spell_index.query() == list(dataset.spells)
+
+def test_spell_index_unknown_value():
+    """Testa que valores inexistentes resultam em lista vazia."""
+    from repository.dataset import get_dataset
+    assert get_dataset().spell_index.query(school="Inexistente", level=1) == []
+
+def test_spells_multiple_filters_intersection():
+    """Testa interseção de filtros no endpoint de magias."""
+    resp = client.get("/spells?level=3&school=Evocação&ritual=false")
+    assert resp.status_code == 200
+    for spell in resp.json():
+        assert spell["nivel"] == 3
+        assert spell["escola"] == "Evocação"
+        assert spell["ritual"] is False
+
+# ============================================================================
+# TESTES DE BUSCA SEM ACENTOS
+# ============================================================================
+
+def test_fold_removes_accents():
+    """Testa a normalização de texto compartilhada."""
+    from repository.text import fold, slugify
+    assert fold("Mísseis Mágicos") == "misseis magicos"
+    assert fold(None) == ""
+    assert slugify("Cão de Guarda") == "cao-de-guarda"
+
+def test_spells_search_accent_insensitive():
+    """Testa busca de magias sem acento."""
+    resp = client.get("/spells/busca/misseis")
+    assert resp.status_code == 200
+    assert any(spell["nome"] == "Mísseis Mágicos" for spell in resp.json())
+
+def test_deities_search_accent_insensitive():
+    """Testa busca de divindades sem acento."""
+    resp = client.get("/deuses/busca/selune")
+    assert resp.status_code == 200
+    assert any(deity["nome"] == "Selûne" for deity in resp.json())
+
+def test_conditions_search_accent_insensitive():
+    """Testa busca de condições sem acento."""
+    resp = client.get("/conditions/busca/invisivel")
+    assert resp.status_code == 200
+    assert any(condition["nome"] == "Invisível" for condition in resp.json())
+
+def test_creature_slug_fallback_accent_insensitive():
+    """Testa busca de criatura pelo slug do nome."""
+    resp = client.get("/criaturas/cao-de-guarda")
+    assert resp.status_code == 200
+    assert resp.json()["nome"] == "Cão de Guarda"
+
+def test_search_keys_precomputed():
+    """Testa que as chaves de busca são calculadas no carregamento."""
+    from repository.dataset import get_dataset
+    keys = get_dataset().search_keys['spells']
+    assert len(keys.keys['nome']) == len(get_dataset().spells)
+    assert "misseis magicos" in keys.keys['nome']
+
+# ============================================================================
+# TESTES DE BUSCA DE TEXTO COMPLETO
+# ============================================================================
+
+def test_search_finds_across_entities():
+    """Testa que a busca encontra termos em vários tipos de entidade."""
+    resp = client.get("/search?q=desvantagem&limit=100")
+    assert resp.status_code == 200
+    results = resp.json()
+    assert len(results) > 0
+    assert {"tipo", "id", "nome", "url", "score"} <= set(results[0])
+    assert "conditions" in {r["tipo"] for r in results}
+
+def test_search_results_ranked():
+    """Testa que os resultados vêm ordenados por relevância."""
+    results = client.get("/search?q=fogo").json()
+    scores = [r["score"] for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+def test_search_filter_by_type():
+    """Testa a restrição da busca por tipo de entidade."""
+    results = client.get("/search?q=fogo&tipo=spells").json()
+    assert len(results) > 0
+    assert all(r["tipo"] == "spells" for r in results)
+
+def test_search_invalid_type():
+    """Testa tipo inexistente retornando 400 com os tipos válidos, como em /export."""
+    resp = client.get("/search?q=fogo&tipo=spells&tipo=magias")
+    assert resp.status_code == 400
+    assert "magias" in resp.json()["detail"] and "criaturas" in resp.json()["detail"]
+    from repository.dataset import get_dataset
+    from routes.search import SEARCH_TYPES
+    assert {doc.tipo for doc in get_dataset().text_index.documents} == set(SEARCH_TYPES)
+
+def test_search_accent_insensitive():
+    """Testa que a busca ignora acentos."""
+    with_accent = client.get("/search?q=dragão").json()
+    without_accent = client.get("/search?q=dragao").json()
+    assert with_accent == without_accent
+
+def test_search_result_url_resolves():
+    """Testa que a rota de detalhe de cada resultado existe."""
+    for result in client.get("/search?q=magia&limit=10").json():
+        assert client.get(result["url"]).status_code == 200
+
+def test_search_requires_query():
+    """Testa que o parâmetro q é obrigatório."""
+    assert client.get("/search").status_code == 422
+    assert client.get("/search?q=termoinexistentexyz").json() == []
+
+# ============================================================================
+# TESTES DE BUSCA TOLERANTE A ERROS (FUZZY)
+# ============================================================================
+
+def test_trigram_index_ranks_by_similarity():
+    """Testa o índice de trigramas isoladamente."""
+    from repository.fuzzy import TrigramIndex
+    index = TrigramIndex(["bola de fogo", "raio de gelo", "escudo"])
+    results = index.search("bola de fgo")
+    assert results[0][0] == 0
+    assert all(results[i][1] >= results[i + 1][1] for i in range(len(results) - 1))
+
+def test_trigram_index_tolerates_transposition():
+    """Testa letras trocadas em nomes curtos."""
+    from repository.fuzzy import TrigramIndex
+    index = TrigramIndex(["zeus", "odin"])
+    assert index.search("zues")[0][0] == 0
+
+def test_spells_search_fuzzy():
+    """Testa busca de magias com erro de digitação."""
+    resp = client.get("/spells/busca/bola de fgo?fuzzy=true")
+    assert resp.status_code == 200
+    matches = resp.json()
+    assert matches[0]["item"]["nome"] == "Bola de Fogo"
+    assert 0 < matches[0]["similaridade"] <= 1
+
+def test_spells_search_fuzzy_not_found():
+    """Testa busca fuzzy sem candidatos."""
+    resp = client.get("/spells/busca/xq?fuzzy=true")
+    assert resp.status_code == 404
+
+def test_deities_search_fuzzy():
+    """Testa busca de divindades com letras trocadas."""
+    matches = client.get("/deuses/busca/zues?fuzzy=true").json()
+    assert matches[0]["item"]["nome"] == "Zeus"
+
+def test_conditions_search_fuzzy():
+    """Testa busca de condições com erro de digitação."""
+    matches = client.get("/conditions/busca/envenendo?fuzzy=true").json()
+    assert matches[0]["item"]["nome"] == "Envenenado"
+
+def test_creature_fuzzy_candidates():
+    """Testa candidatos de criatura quando o ID não existe."""
+    resp = client.get("/criaturas/esquleto?fuzzy=true")
+    assert resp.status_code == 200
+    assert resp.json()[0]["item"]["id"] == "esqueleto"
+
+def test_creature_fuzzy_exact_id_unchanged():
+    """Testa que IDs exatos continuam retornando a criatura."""
+    resp = client.get("/criaturas/corvo?fuzzy=true")
+    assert resp.status_code == 200
+    assert resp.json()["id"] == "corvo"
+    assert client.get("/criaturas/esquleto").status_code == 404
+
+# ============================================================================
+# TESTES DE ACESSO DIRETO POR ID
+# ============================================================================
+
+def test_entity_index_lookup_by_id_and_slug():
+    """Testa o índice de id/slug isoladamente."""
+    from repository.dataset import get_dataset
+    lookup = get_dataset().lookups['creatures']
+    assert lookup.get("cao-guarda").nome == "Cão de Guarda"
+    assert lookup.get("Cão de Guarda").id == "cao-guarda"
+    assert lookup.get("inexistente") is None
+
+def test_entity_index_suggestion():
+    """Testa a sugestão de id para chaves inexistentes."""
+    from repository.dataset import get_dataset
+    lookup = get_dataset().lookups['deities']
+    assert lookup.suggest("zues") == "zeus"
+    assert lookup.suggest("xyz123") is None
+
+def test_deity_by_name_with_accents():
+    """Testa divindade pelo nome com acentos."""
+    resp = client.get("/deuses/Selûne")
+    assert resp.status_code == 200
+    assert resp.json()["id"] == "selune"
+
+def test_deity_not_found_suggestion():
+    """Testa "você quis dizer" no 404 de divindade."""
+    resp = client.get("/deuses/zues")
+    assert resp.status_code == 404
+    assert "Você quis dizer 'zeus'?" in resp.json()["detail"]
+
+def test_creature_not_found_suggestion():
+    """Testa "você quis dizer" no 404 de criatura."""
+    resp = client.get("/criaturas/esquleto")
+    assert resp.status_code == 404
+    assert "'esqueleto'" in resp.json()["detail"]
+
+def test_subrace_by_slug():
+    """Testa sub-raça pelo slug do nome."""
+    by_id = client.get("/subracas/1_1").json()
+    by_slug = client.get("/subracas/anao-da-colina").json()
+    assert by_slug == by_id
+
+def test_not_found_without_suggestion():
+    """Testa 404 sem sugestão quando nada se parece com a chave."""
+    resp = client.get("/planos/xyz123")
+    assert resp.status_code == 404
+    assert "Você quis dizer" not in resp.json()["detail"]
+
+# ============================================================================
+# TESTES DE ETAG E GET CONDICIONAL
+# ============================================================================
+
+def test_etag_and_cache_control_headers():
+    """Testa ETag e Cache-Control em respostas de catálogo."""
+    resp = client.get("/spells")
+    assert resp.status_code == 200
+    assert resp.headers["etag"].startswith('"')
+    assert "max-age" in resp.headers["cache-control"]
+
+def test_etag_not_modified():
+    """Testa 304 quando o cliente já tem a versão atual."""
+    etag = client.get("/deuses").headers["etag"]
+    resp = client.get("/deuses", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+def test_etag_ignores_query_param_order():
+    """Testa que a ordem dos parâmetros não muda o ETag."""
+    a = client.get("/spells?level=3&school=Evocação").headers["etag"]
+    b = client.get("/spells?school=Evocação&level=3").headers["etag"]
+    assert a == b
+    assert a != client.get("/spells?level=2").headers["etag"]
+
+def test_etag_weak_and_list_match():
+    """Testa If-None-Match com lista de ETags e prefixo fraco."""
+    etag = client.get("/criaturas").headers["etag"]
+    resp = client.get("/criaturas", headers={"If-None-Match": f'"outro", W/{etag}'})
+    assert resp.status_code == 304
+
+def test_etag_stale_returns_full_response():
+    """Testa que um ETag antigo recebe a resposta completa."""
+    resp = client.get("/planos", headers={"If-None-Match": '"versao-antiga"'})
+    assert resp.status_code == 200
+    assert len(resp.json()) > 0
+
+def test_etag_changes_with_dataset_version():
+    """Testa que o ETag depende da versão do dataset."""
+    from middleware.etag import compute_etag
+    assert compute_etag("v1", "/spells", b"") != compute_etag("v2", "/spells", b"")
+
+def test_no_etag_on_errors():
+    """Testa que respostas de erro não recebem ETag."""
+    resp = client.get("/spells/999")
+    assert resp.status_code == 404
+    assert "etag" not in resp.headers
+
+# ============================================================================
+# TESTES DE RESPOSTAS PRÉ-SERIALIZADAS
+# ============================================================================
+
+def test_cached_list_matches_model_serialization():
+    """Testa que a lista em cache é igual à serialização pelo modelo."""
+    from repository.dataset import get_dataset
+    resp = client.get("/criaturas")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert resp.json() == [c.model_dump() for c in get_dataset().creatures]
+
+def test_cached_list_same_as_filtered_path():
+    """Testa que filtros continuam passando pela lógica da rota."""
+    full = client.get("/spells").json()
+    filtered = client.get("/spells?level=0").json()
+    assert len(filtered) < len(full)
+    assert all(spell["nivel"] == 0 for spell in filtered)
+
+def test_cached_changelog_and_slot_table():
+    """Testa changelog e tabela de espaços servidos do cache."""
+    changelog = client.get("/changelog").json()
+    assert changelog["total_versions"] == len(changelog["versions"])
+    table = client.get("/rules/spells/slot-table").json()
+    assert table["classes"]["Mago"]["tabela"]["5"]["3"] == 2
+
+def test_cached_response_rerenders_on_new_version(monkeypatch):
+    """Testa que o cache é renovado quando a versão do dataset muda."""
+    import repository.responses as responses
+    from types import SimpleNamespace
+    calls = []
+    cached = responses.CachedResponse(lambda: calls.append(1) or {"n": len(calls)})
+    monkeypatch.setattr(responses, "get_dataset", lambda: SimpleNamespace(version="v1"))
+    assert cached.body() == b'{"n":1}'
+    assert cached.body() == b'{"n":1}'
+    monkeypatch.setattr(responses, "get_dataset", lambda: SimpleNamespace(version="v2"))
+    assert cached.body() == b'{"n":2}'
+    assert len(calls) == 2
+
+# ============================================================================
+# TESTES DA CAMADA DE SERIALIZAÇÃO
+# ============================================================================
+
+def test_serialization_backends_same_output():
+    """Testa que todos os backends geram o mesmo JSON."""
+    from repository.serialization import BACKENDS
+    payload = {"nome": "Bola de Fogo", "nivel": 3, "componentes": ["V", "S", "M"], "ritual": False, "extra": None}
+    outputs = {name: dumps(payload) for name, dumps in BACKENDS.items()}
+    assert len(set(outputs.values())) == 1
+    assert "Bola de Fogo".encode() in outputs["json"]
+
+def test_serialization_unknown_backend():
+    """Testa erro para backend inexistente."""
+    import pytest
+    from repository.serialization import response_class
+    with pytest.raises(ValueError):
+        response_class("inexistente")
+
+def test_json_route_uses_backend_only_without_response_model():
+    """Testa que rotas com response_model mantêm o caminho do Pydantic."""
+    from routes.classes import router
+    from repository.serialization import DefaultJSONResponse
+    classes = {route.path: route for route in router.routes}
+    assert classes["/classes/{class_id}/magias"].response_class.value is DefaultJSONResponse
+    assert classes["/classes"].response_class.value is not DefaultJSONResponse
+
+def test_untyped_route_response_unchanged():
+    """Testa uma rota sem response_model servida pelo backend configurado."""
+    resp = client.get("/classes/1/magias")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/json"
+    assert isinstance(resp.json(), list)
+
+# ============================================================================
+# TESTES DE COMPRESSÃO DE RESPOSTAS
+# ============================================================================
+
+def test_negotiate_encoding():
+    """Testa a negociação de Accept-Encoding."""
+    from middleware.compression import negotiate
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None
+    assert negotiate(None) is None
+    assert negotiate("*") is not None
+
+def test_precompressed_list_gzip():
+    """Testa lista completa servida já comprimida em gzip."""
+    resp = client.get("/criaturas", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert len(resp.json()) > 0
+
+def test_dynamic_compression_gzip():
+    """Testa compressão sob demanda de respostas grandes."""
+    identity = client.get("/classes?magic=true", headers={"Accept-Encoding": "identity"})
+    compressed = client.get("/classes?magic=true", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.json() == identity.json()
+
+def test_brotli_precompressed_and_streamed():
+    """Testa br na lista pré-comprimida, na compressão sob demanda e no corpo em blocos (/export)."""
+    import brotli
+    from middleware.compression import negotiate
+    assert negotiate("gzip, deflate, br") == "br"
+    assert negotiate("br;q=0.5, gzip") == "gzip"
+    resp = client.get("/criaturas", headers={"Accept-Encoding": "br"})
+    assert resp.headers["content-encoding"] == "br"
+    assert int(resp.headers["content-length"]) < len(resp.content)
+    assert resp.json() == client.get("/criaturas", headers={"Accept-Encoding": "identity"}).json()
+    dynamic = client.get("/classes?magic=true", headers={"Accept-Encoding": "br"})
+    assert dynamic.headers["content-encoding"] == "br"
+    assert dynamic.json() == client.get("/classes?magic=true", headers={"Accept-Encoding": "identity"}).json()
+    with client.stream("GET", "/export?format=ndjson", headers={"Accept-Encoding": "br"}) as streamed:
+        assert streamed.headers["content-encoding"] == "br"
+        assert "content-length" not in streamed.headers
+        raw = b"".join(streamed.iter_raw())
+    identity = client.get("/export?format=ndjson", headers={"Accept-Encoding": "identity"})
+    assert brotli.decompress(raw) == identity.content
+
+def test_small_responses_not_compressed():
+    """Testa que respostas abaixo do tamanho mínimo saem sem compressão."""
+    resp = client.get("/racas/1", headers={"Accept-Encoding": "gzip"})
+    assert len(resp.content) < 1024
+    assert "content-encoding" not in resp.headers
+
+def test_compressed_etag_variant():
+    """Testa ETag por codificação e 304 para a variante comprimida."""
+    plain = client.get("/backgrounds", headers={"Accept-Encoding": "identity"}).headers["etag"]
+    gzipped = client.get("/backgrounds", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    assert gzipped == plain[:-1] + '-gzip"'
+    resp = client.get("/backgrounds", headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped})
+    assert resp.status_code == 304
+
+# ============================================================================
+# TESTES DE PAGINAÇÃO
+# ============================================================================
+
+def test_pagination_limit_and_headers():
+    """Testa limit com cabeçalhos de total e próxima página."""
+    resp = client.get("/deuses?limit=10")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 10
+    assert resp.headers["x-total-count"] == "85"
+    assert 'rel="next"' in resp.headers["link"]
+    assert resp.headers["x-next-cursor"]
+
+def test_pagination_cursor_walks_whole_list():
+    """Testa que seguir os cursores percorre a lista completa sem repetições."""
+    full = [d["id"] for d in client.get("/deuses").json()]
+    seen, url = [], "/deuses?limit=30"
+    while url:
+        resp = client.get(url)
+        seen.extend(d["id"] for d in resp.json())
+        cursor = resp.headers.get("x-next-cursor")
+        url = f"/deuses?limit=30&cursor={cursor}" if cursor else None
+    assert seen == full
+
+def test_pagination_offset():
+    """Testa paginação por offset."""
+    full = client.get("/racas").json()
+    page = client.get("/racas?offset=2&limit=3").json()
+    assert page == full[2:5]
+
+def test_pagination_with_filters():
+    """Testa paginação combinada com filtros."""
+    resp = client.get("/spells?level=0&limit=2")
+    assert len(resp.json()) <= 2
+    assert all(spell["nivel"] == 0 for spell in resp.json())
+
+def test_pagination_last_page_has_no_next():
+    """Testa que a última página não tem link de próxima."""
+    resp = client.get("/abilities?limit=100")
+    assert len(resp.json()) == 6
+    assert "link" not in resp.headers
+
+def test_pagination_invalid_cursor_and_limit():
+    """Testa cursor inválido e limit acima do máximo."""
+    assert client.get("/criaturas?cursor=invalido!").status_code == 400
+    assert client.get("/criaturas?limit=1000").status_code == 422
+
+def test_pagination_stale_cursor():
+    """Testa que cursores de outra versão dos dados são rejeitados."""
+    from repository.pagination import encode_cursor
+    resp = client.get(f"/planos?cursor={encode_cursor(5, 'outra-versao')}")
+    assert resp.status_code == 400
+    assert "expirado" in resp.json()["detail"]
+
+def test_pagination_with_magic_filter():
+    """Testa paginação combinada com o filtro de classes conjuradoras."""
+    resp = client.get("/classes?magic=true&limit=2")
+    assert resp.status_code == 200
+    assert len(resp.json()) == 2
+
+def test_pagination_on_sub_lists():
+    """Testa paginação nas sub-listas (por nível, tipo, categoria, sub-raças)."""
+    full = client.get("/spells/nivel/1").json()
+    first = client.get("/spells/nivel/1?limit=3")
+    assert first.json() == full[:3]
+    assert first.headers["x-total-count"] == str(len(full))
+    second = client.get(f"/spells/nivel/1?limit=3&cursor={first.headers['x-next-cursor']}")
+    assert second.json() == full[3:6]
+    beasts = client.get("/criaturas/tipos/Besta").json()
+    assert client.get("/criaturas/tipos/Besta?offset=2&limit=2").json() == beasts[2:4]
+    subraces = client.get("/racas/1/subracas").json()
+    assert client.get("/racas/1/subracas?limit=1").json() == subraces[:1]
+    assert client.get("/planos/tipos/Exterior?limit=1000").status_code == 422
+    evocation = client.get("/spells/escola/Evocação?limit=1")
+    assert evocation.headers["link"].startswith('<http://testserver/spells/escola/Evoca%C3%A7%C3%A3o?limit=1&cursor=')
+    assert client.get(evocation.headers["link"][1:].split(">")[0]).status_code == 200
+
+def test_no_pagination_returns_full_list():
+    """Testa compatibilidade: sem parâmetros a lista é completa."""
+    resp = client.get("/criaturas")
+    assert "x-total-count" not in resp.headers
+    assert len(resp.json()) == 32
+
+# ============================================================================
+# TESTES DE PROJEÇÃO DE CAMPOS (fields=)
+# ============================================================================
+
+def test_fields_projection_list():
+    """Testa fields= retornando só os campos pedidos em cada item."""
+    resp = client.get("/spells?fields=nome,nivel,escola")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert len(data) == len(client.get("/spells").json())
+    assert all(set(item) == {"nome", "nivel", "escola"} for item in data)
+
+def test_fields_projection_nested():
+    """Testa campos aninhados com ponto."""
+    resp = client.get("/classes?fields=nome,niveis.nivel")
+    assert resp.status_code == 200
+    classe = resp.json()[0]
+    assert set(classe) == {"nome", "niveis"}
+    assert all(set(nivel) == {"nivel"} for nivel in classe["niveis"])
+
+def test_fields_projection_invalid_nested_field():
+    """Testa caminho aninhado inexistente (ou abaixo de campo simples) retornando 400."""
+    resp = client.get("/classes?fields=niveis.bogus")
+    assert resp.status_code == 400
+    assert "niveis.bogus" in resp.json()["detail"]
+    assert client.get("/classes?fields=nome.x").status_code == 400
+    assert client.get("/racas?fields=subracas.x").status_code == 400
+    assert client.get("/criaturas?fields=atributos.FOR").status_code == 200
+
+def test_fields_projection_on_search():
+    """Testa fields= nas buscas por nome, inclusive no formato da busca tolerante."""
+    for url in ("/spells/busca/fogo", "/deuses/busca/a", "/conditions/busca/ca"):
+        resp = client.get(f"{url}?fields=nome")
+        assert resp.status_code == 200
+        assert resp.json() == [{"nome": item["nome"]} for item in client.get(url).json()]
+        assert client.get(f"{url}?fields=bogus").status_code == 400
+    fuzzy = client.get("/spells/busca/bola de fgo?fuzzy=true&fields=similaridade,item.nome").json()
+    assert fuzzy[0]["item"] == {"nome": "Bola de Fogo"} and set(fuzzy[0]) == {"similaridade", "item"}
+
+def test_fields_projection_detail():
+    """Testa fields= em endpoint de detalhe."""
+    resp = client.get("/criaturas/corvo?fields=nome,ca")
+    assert resp.status_code == 200
+    assert set(resp.json()) == {"nome", "ca"}
+
+def test_fields_projection_invalid_field():
+    """Testa campo inexistente retornando 400."""
+    resp = client.get("/spells?fields=nome,inexistente")
+    assert resp.status_code == 400
+    assert "inexistente" in resp.json()["detail"]
+
+def test_fields_projection_invalid_field_on_dict_resource():
+    """Testa campo inexistente em recursos guardados como dicts."""
+    resp = client.get("/currency?fields=nome,bogus")
+    assert resp.status_code == 400
+    assert "bogus" in resp.json()["detail"] and "sigla" in resp.json()["detail"]
+    assert client.get("/rules/combat?fields=bogus").status_code == 400
+    assert all(set(item) <= {"sigla"} for item in client.get("/currency?fields=sigla").json())
+
+def test_fields_projection_with_pagination():
+    """Testa projeção combinada com paginação, mantendo os cabeçalhos."""
+    resp = client.get("/criaturas?fields=nome&limit=5")
+    assert resp.status_code == 200
+    assert resp.headers["x-total-count"] == "32"
+    assert "x-next-cursor" in resp.headers
+    assert resp.json() == [{"nome": item["nome"]} for item in client.get("/criaturas?limit=5").json()]
+
+def test_no_fields_returns_full_items():
+    """Testa compatibilidade: sem fields os itens são completos."""
+    resp = client.get("/criaturas/corvo")
+    assert "atributos" in resp.json()
+
+# ============================================================================
+# TESTES DO ENDPOINT DE LOTE (/batch)
+# ============================================================================
+
+def test_batch_resolves_mixed_types():
+    """Testa /batch com tipos diferentes, na ordem do pedido."""
+    resp = client.post("/batch", json={"itens": [
+        {"tipo": "racas", "id": 1},
+        {"tipo": "classes", "id": 5},
+        {"tipo": "backgrounds", "id": 0},
+        {"tipo": "spells", "id": 3},
+        {"tipo": "feats", "id": 2},
+        {"tipo": "criaturas", "id": "corvo"},
+    ]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [item["status"] for item in data] == [200] * 6
+    assert data[0]["item"] == client.get("/racas/1").json()
+    assert data[1]["item"] == client.get("/classes/5").json()
+    assert data[3]["item"] == client.get("/spells/3").json()
+    assert data[5]["item"] == client.get("/criaturas/corvo").json()
+
+def test_batch_per_item_errors():
+    """Testa erros por item sem afetar as demais referências."""
+    resp = client.post("/batch", json={"itens": [
+        {"tipo": "classes", "id": 999},
+        {"tipo": "criaturas", "id": "esquleto"},
+        {"tipo": "inexistente", "id": 1},
+        {"tipo": "spells", "id": "abc"},
+        {"tipo": "deuses", "id": "mystra"},
+    ]})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [item["status"] for item in data] == [404, 404, 400, 422, 200]
+    assert data[0]["erro"] == "Classe não encontrada"
+    assert "esqueleto" in data[1]["erro"]
+    assert data[0]["item"] is None
+
+def test_batch_validation():
+    """Testa corpo vazio ou acima do limite retornando 422."""
+    assert client.post("/batch", json={"itens": []}).status_code == 422
+    itens = [{"tipo": "spells", "id": 1}] * 101
+    assert client.post("/batch", json={"itens": itens}).status_code == 422
+
+# ============================================================================
+# TESTES DA EXPORTAÇÃO NDJSON (/export)
+# ============================================================================
+
+def test_export_ndjson_full_catalog():
+    """Testa /export com uma linha por entidade de cada recurso."""
+    resp = client.get("/export?format=ndjson")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    tipos = {line["tipo"] for line in lines}
+    assert {"racas", "classes", "spells", "criaturas", "deuses", "planos", "leituras", "conditions", "equipment"} <= tipos
+    assert sum(1 for line in lines if line["tipo"] == "criaturas") == 32
+
+def test_export_items_match_detail_routes():
+    """Testa que cada item tem o mesmo formato da rota de detalhe."""
+    resp = client.get("/export?tipo=spells&tipo=criaturas")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    spells = [line["item"] for line in lines if line["tipo"] == "spells"]
+    creatures = [line["item"] for line in lines if line["tipo"] == "criaturas"]
+    assert spells[0] == client.get("/spells/1").json()
+    assert creatures == client.get("/criaturas").json()
+
+def test_export_is_streamed_in_chunks():
+    """Testa que o corpo é gerado em blocos, sem montar o catálogo inteiro."""
+    from repository.dataset import get_dataset
+    from repository.export import chunked, iter_lines
+    chunks = list(chunked(iter_lines(get_dataset()), size=4096))
+    assert len(chunks) > 1
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+
+def test_export_invalid_params():
+    """Testa formato e tipo inválidos retornando 400."""
+    assert client.get("/export?format=csv").status_code == 400
+    resp = client.get("/export?tipo=inexistente")
+    assert resp.status_code == 400
+    assert "inexistente" in resp.json()["detail"]
+    # Os nomes internos dos atributos não são aceitos
+    assert client.get("/export?tipo=creatures").status_code == 400
+
+def test_export_types_match_other_bulk_endpoints():
+    """Testa que /export usa os mesmos nomes de tipo que /search e /batch."""
+    from repository.batch import RESOLVERS
+    from repository.dataset import DATA_FILES
+    from repository.export import EXPORT_TYPES
+    from routes.search import SEARCH_TYPES
+    assert set(EXPORT_TYPES.values()) == set(DATA_FILES.values())
+    assert set(SEARCH_TYPES) <= set(EXPORT_TYPES)
+    assert set(RESOLVERS) - {"subracas"} <= set(EXPORT_TYPES)
+    resp = client.get("/export?tipo=deuses&tipo=rules/combat")
+    assert {json.loads(line)["tipo"] for line in resp.text.splitlines()} == {"deuses", "rules/combat"}
+
+# ============================================================================
+# TESTES DO SNAPSHOT BINÁRIO
+# ============================================================================
+
+def test_snapshot_roundtrip(tmp_path):
+    """Testa que o snapshot binário reproduz os dados validados dos JSON."""
+    from repository.dataset import build_snapshot, decode_snapshot, open_snapshot, read_raw_data, validate_raw, dataset_version
+    path = str(tmp_path / "dataset.snapshot")
+    version = build_snapshot(path)
+    raw = read_raw_data()
+    assert version == dataset_version(raw)
+    snapshot = open_snapshot(path)
+    assert snapshot is not None
+    assert snapshot.version == version
+    assert decode_snapshot(snapshot) == validate_raw(raw)
+    snapshot.close()
+
+def test_snapshot_stale_is_ignored(tmp_path):
+    """Testa que um snapshot de outra versão dos arquivos é ignorado."""
+    from repository.dataset import open_snapshot, source_hashes
+    from repository.snapshot import write_snapshot
+    path = str(tmp_path / "dataset.snapshot")
+    sources = dict(source_hashes(), **{"spells.json": "0" * 64})
+    write_snapshot(path, "antiga", sources, {"spells": []})
+    assert open_snapshot(path) is None
+
+def test_snapshot_invalid_file(tmp_path):
+    """Testa arquivo que não é snapshot sendo recusado."""
+    from repository.dataset import open_snapshot
+    from repository.snapshot import Snapshot, SnapshotError
+    path = tmp_path / "dataset.snapshot"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(SnapshotError):
+        Snapshot(str(path))
+    assert open_snapshot(str(path)) is None
+    assert open_snapshot(str(tmp_path / "ausente.snapshot")) is None
+
+def test_snapshot_corrupt_header(tmp_path, monkeypatch):
+    """Testa cabeçalho truncado, sem chaves ou com tipos errados sendo recusado, com o mmap fechado."""
+    import mmap
+    from repository.dataset import open_snapshot
+    from repository.snapshot import _PREAMBLE, FORMAT_VERSION, MAGIC, Snapshot, SnapshotError
+    opened = []
+    original_mmap = mmap.mmap
+    monkeypatch.setattr(mmap, "mmap", lambda *args, **kwargs: opened.append(original_mmap(*args, **kwargs)) or opened[-1])
+    headers = [
+        b'{"version":"abc","sources":{',
+        b'{"version":"abc","sources":{}}',
+        b'{"version":"abc","sources":{},"blocks":{"spells":7}}',
+        b'{"version":"abc","sources":[],"blocks":{}}',
+        b'[1, 2]',
+        b'\xff\xfe',
+    ]
+    for header in headers:
+        path = tmp_path / "dataset.snapshot"
+        path.write_bytes(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header)
+        with pytest.raises(SnapshotError, match="cabeçalho inválido"):
+            Snapshot(str(path))
+        assert open_snapshot(str(path)) is None
+    assert len(opened) == 2 * len(headers)
+    assert all(m.closed for m in opened)
+
+# ============================================================================
+# TESTES DO SERVIDOR COM WORKERS COMPARTILHADOS (server.py)
+# ============================================================================
+
+@pytest.mark.skipif(not hasattr(__import__("os"), "fork"), reason="server.py precisa de fork")
+def test_shared_workers_server():
+    """Testa server.py atendendo com vários workers e parando com SIGTERM."""
+    import os
+    import signal
+    import socket
+    import subprocess
+    import sys
+    import time
+    import httpx
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    root = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen(
+        [sys.executable, "server.py", "--host", "127.0.0.1", "--port", str(port), "--workers", "2", "--log-level", "warning"],
+        cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+    )
+    try:
+        deadline = time.time() + 20
+        while True:
+            try:
+                resp = httpx.get(f"http://127.0.0.1:{port}/spells/1")
+                break
+            except httpx.TransportError:
+                assert time.time() < deadline, "servidor não respondeu"
+                time.sleep(0.1)
+        assert resp.status_code == 200
+        assert resp.json() == client.get("/spells/1").json()
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=20) == 0
+
+class FakeWorkers:
+    """Processos falsos para o Supervisor: relógio manual e saídas enfileiradas."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.next_pid = 100
+        self.exits = []
+        self.signals = []
+        self.sleeps = []
+
+    def spawn(self):
+        self.next_pid += 1
+        return self.next_pid
+
+    def wait(self):
+        if not self.exits:
+            raise ChildProcessError
+        return self.exits.pop(0), 0
+
+    def kill(self, pid, signum):
+        import signal
+        self.signals.append((pid, signum))
+        if signum == signal.SIGTERM:
+            self.exits.append(pid)
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def clock(self):
+        return self.now
+
+def make_supervisor(fake):
+    from server import Supervisor
+    return Supervisor(fake.spawn, wait=fake.wait, kill=fake.kill, sleep=fake.sleep, clock=fake.clock)
+
+def test_supervisor_signals_and_respawn():
+    """Testa SIGHUP repassado, worker estável recriado sem espera e SIGTERM sem recriação."""
+    import signal
+    fake = FakeWorkers()
+    supervisor = make_supervisor(fake)
+    supervisor.start(2)
+    assert set(supervisor.children) == {101, 102}
+    supervisor.reload()
+    assert fake.signals == [(101, signal.SIGHUP), (102, signal.SIGHUP)]
+    # Worker que caiu depois de um bom tempo no ar volta na hora
+    fake.now = 3600
+    assert supervisor.replace(101)
+    assert set(supervisor.children) == {102, 103} and fake.sleeps == []
+    supervisor.stop()
+    assert supervisor.run() == 0
+    assert supervisor.children == {} and fake.next_pid == 103
+
+def test_supervisor_backoff_and_startup_failures():
+    """Testa a espera crescente para workers que morrem ao iniciar e a desistência."""
+    import signal
+    import server
+    supervisor = make_supervisor(FakeWorkers())
+    delays = [supervisor.backoff(0) for _ in range(12)]
+    assert delays[:4] == [server.BACKOFF, server.BACKOFF * 2, server.BACKOFF * 4, server.BACKOFF * 8]
+    assert delays[-1] == server.MAX_BACKOFF
+    # Um worker estável zera a contagem
+    assert supervisor.backoff(server.MIN_UPTIME) == 0 and supervisor.backoff(0) == server.BACKOFF
+
+    fake = FakeWorkers()
+    supervisor = make_supervisor(fake)
+    supervisor.start(2)
+    # Os workers recriados morrem logo ao iniciar, sempre
+    original_spawn = fake.spawn
+    def crashing_spawn():
+        pid = original_spawn()
+        fake.exits.append(pid)
+        return pid
+    supervisor.spawn = crashing_spawn
+    fake.exits.append(101)
+    assert supervisor.run() == 1
+    expected = sum(min(server.BACKOFF * 2 ** i, server.MAX_BACKOFF) for i in range(server.MAX_STARTUP_FAILURES - 1))
+    assert abs(sum(fake.sleeps) - expected) < 1e-6
+    # O worker restante recebe SIGTERM e o processo principal sai com erro
+    assert (102, signal.SIGTERM) in fake.signals
+    assert supervisor.children == {}
+
+def test_supervisor_restart_rate_limit():
+    """Testa a desistência quando workers estáveis caem muitas vezes em pouco tempo."""
+    import server
+    fake = FakeWorkers()
+    supervisor = make_supervisor(fake)
+    supervisor.start(1)
+    fake.now = 3600
+    for _ in range(server.MAX_RESTARTS):
+        pid = next(iter(supervisor.children))
+        # Cada worker fica no ar tempo suficiente para não contar como falha ao iniciar
+        fake.now += server.MIN_UPTIME
+        assert supervisor.replace(pid)
+    assert not supervisor.replace(next(iter(supervisor.children)))
+    assert fake.sleeps == []
+
+def test_warm_app_leaves_metrics_empty():
+    """Testa que o aquecimento antes do fork não aparece no /metrics dos workers."""
+    import server
+    from main import app
+    from middleware.metrics import REGISTRY
+    client.get("/spells")
+    server.warm_app(app)
+    assert REGISTRY.requests.values == {}
+    assert "dnd_api_requests_total{" not in REGISTRY.render()
+
+# ============================================================================
+# TESTES DE RECARGA DOS DADOS (hot reload)
+# ============================================================================
+
+@pytest.fixture
+def edited_data_dir(tmp_path, monkeypatch):
+    """Cópia de data/ com uma divindade a mais; recarrega os dados originais ao final."""
+    import shutil
+    import repository.dataset as dataset_module
+    from repository.reload import reload_data
+    data_dir = tmp_path / "data"
+    shutil.copytree(dataset_module.DATA_DIR, data_dir)
+    deities = json.loads((data_dir / "deuses.json").read_text(encoding="utf-8"))
+    deities.append({"id": "deus-novo", "nome": "Deus Novo", "titulo": "O Recém-Chegado", "panteao": "Faerûn",
+                    "alinhamento": "N", "dominios": ["Conhecimento"], "simbolo": "Livro", "plano": "Plano Material"})
+    (data_dir / "deuses.json").write_text(json.dumps(deities, ensure_ascii=False), encoding="utf-8")
+    monkeypatch.setattr(dataset_module, "DATA_DIR", str(data_dir))
+    yield data_dir
+    monkeypatch.undo()
+    reload_data()
+
+def test_reload_swaps_dataset_and_etags(edited_data_dir):
+    """Testa que a recarga troca os dados, o ETag e a resposta em cache."""
+    from repository.reload import reload_data
+    before = client.get("/deuses")
+    assert len(before.json()) == 85
+    previous, version = reload_data()
+    assert previous != version
+    after = client.get("/deuses")
+    assert len(after.json()) == 86
+    assert after.headers["etag"] != before.headers["etag"]
+    assert client.get("/deuses", headers={"If-None-Match": before.headers["etag"]}).status_code == 200
+    assert client.get("/deuses/deus-novo").json()["nome"] == "Deus Novo"
+
+def test_reload_during_request_keeps_one_snapshot(edited_data_dir, monkeypatch):
+    """Testa recargas entre filtro, ordenação e paginação: a resposta fica toda na versão da requisição."""
+    from repository.dataset import get_dataset
+    from repository.pagination import decode_cursor
+    from repository.reload import reload_data
+    from repository.sorting import Sorting
+    original_apply = Sorting.apply
+
+    def reload_then_apply(self, items, resource):
+        reload_data()
+        return original_apply(self, items, resource)
+
+    def apply_then_reload(self, items, resource):
+        result = original_apply(self, items, resource)
+        reload_data()
+        return result
+
+    # O arquivo já tem uma divindade a mais; cada rodada acrescenta outra
+    for extra, patched in enumerate((reload_then_apply, apply_then_reload)):
+        if extra:
+            path = edited_data_dir / "deuses.json"
+            deities = json.loads(path.read_text(encoding="utf-8"))
+            deities.append({**deities[-1], "id": f"deus-novo-{extra}", "nome": f"Deus Novo {extra}"})
+            path.write_text(json.dumps(deities, ensure_ascii=False), encoding="utf-8")
+        version = get_dataset().version
+        total = len(get_dataset().deities)
+        expected = client.get("/deuses?sort=-nome&limit=5").json()
+        monkeypatch.setattr(Sorting, "apply", patched)
+        resp = client.get("/deuses?sort=-nome&limit=5")
+        monkeypatch.setattr(Sorting, "apply", original_apply)
+        assert resp.status_code == 200
+        assert resp.json() == expected
+        assert resp.headers["x-total-count"] == str(total)
+        assert decode_cursor(resp.headers["x-next-cursor"], version) == 5
+        assert get_dataset().version != version
+
+def test_reload_invalid_data_keeps_current(edited_data_dir):
+    """Testa que arquivo inválido não troca o dataset."""
+    from repository.dataset import get_dataset
+    from repository.reload import reload_data
+    version = get_dataset().version
+    (edited_data_dir / "deuses.json").write_text("[{", encoding="utf-8")
+    with pytest.raises(ValueError):
+        reload_data()
+    assert get_dataset().version == version
+
+def test_data_watcher_detects_changes(edited_data_dir):
+    """Testa o watcher recarregando só quando os arquivos mudam."""
+    import os
+    from repository.reload import DataWatcher
+    watcher = DataWatcher(interval=60)
+    assert watcher.check() is False
+    path = edited_data_dir / "deuses.json"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    assert watcher.check() is True
+    assert len(client.get("/deuses").json()) == 86
+
+def test_admin_reload_endpoint(monkeypatch):
+    """Testa /admin/reload desativado, com token inválido e com token válido."""
+    import routes.admin as admin
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", None)
+    assert client.post("/admin/reload").status_code == 403
+    monkeypatch.setattr(admin, "ADMIN_TOKEN", "segredo")
+    assert client.post("/admin/reload", headers={"X-Admin-Token": "errado"}).status_code == 401
+    resp = client.post("/admin/reload", headers={"X-Admin-Token": "segredo"})
+    assert resp.status_code == 200
+    assert resp.json()["alterado"] is False
+    assert resp.json()["versao"] == resp.json()["versao_anterior"]
+
+# ============================================================================
+# TESTES DO ACESSO ASSÍNCRONO AOS DADOS
+# ============================================================================
+
+def test_routes_run_on_event_loop():
+    """Testa que rotas e dependências são assíncronas (não usam o threadpool)."""
+    import asyncio
+    from fastapi.routing import APIRoute
+
+    def calls(dependant):
+        for dep in dependant.dependencies:
+            yield dep.call
+            yield from calls(dep)
+
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            assert asyncio.iscoroutinefunction(route.endpoint), route.path
+            for call in calls(route.dependant):
+                assert asyncio.iscoroutinefunction(call), (route.path, call)
+
+def test_async_data_access():
+    """Testa aget_dataset e run_io no executor limitado."""
+    import asyncio
+    import threading
+    from repository.aio import aget_dataset, run_io
+    from repository.dataset import get_dataset
+
+    async def run():
+        dataset = await aget_dataset()
+        thread = await run_io(lambda: threading.current_thread().name)
+        return dataset, thread
+
+    dataset, thread = asyncio.run(run())
+    assert dataset is get_dataset()
+    assert thread.startswith("dataset-io")
+
+# ============================================================================
+# TESTES DE MÉTRICAS (/metrics)
+# ============================================================================
+
+def _metric_value(text, prefix):
+    """Valor da primeira linha de /metrics que começa com ``prefix``."""
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_metrics_prometheus_format():
+    """Testa /metrics no formato de texto do Prometheus."""
+    client.get("/spells/1")
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "etag" not in resp.headers
+    assert "# TYPE dnd_api_requests_total counter" in resp.text
+    assert "# TYPE dnd_api_request_duration_seconds histogram" in resp.text
+    assert 'dnd_api_request_duration_seconds_bucket{method="GET",route="/spells/{spell_id}",le="+Inf"}' in resp.text
+
+def test_metrics_count_per_route_and_status():
+    """Testa contagem por rota com parâmetros, status e 304 do ETag."""
+    key = 'dnd_api_requests_total{method="GET",route="/criaturas/{creature_id}",status="200"}'
+    before = _metric_value(client.get("/metrics").text, key)
+    client.get("/criaturas/corvo")
+    client.get("/criaturas/lobo")
+    etag = client.get("/criaturas/gato").headers["etag"]
+    client.get("/criaturas/gato", headers={"If-None-Match": etag})
+    text = client.get("/metrics").text
+    assert _metric_value(text, key) == before + 3
+    assert _metric_value(text, 'dnd_api_requests_total{method="GET",route="/criaturas/{creature_id}",status="304"}') >= 1
+    client.get("/rota/inexistente/123")
+    assert 'route="<unmatched>",status="404"' in client.get("/metrics").text
+
+def test_metrics_phases_and_sizes():
+    """Testa as fases da requisição e o tamanho das respostas."""
+    client.get("/search?q=fogo")
+    text = client.get("/metrics").text
+    for phase_name in ("filter", "model", "serialize"):
+        assert _metric_value(text, f'dnd_api_request_phase_seconds_count{{method="GET",route="/search",phase="{phase_name}"}}') >= 1
+    assert _metric_value(text, 'dnd_api_response_size_bytes_sum{method="GET",route="/search"}') > 0
+
+def test_request_timings_phases():
+    """Testa a divisão do tempo da rota entre ganchos, filtro e serialização."""
+    from repository.timing import RequestTimings
+    timings = RequestTimings()
+    timings.endpoint_start, timings.endpoint_end = 1.0, 1.5
+    timings.add("model", 0.2)
+    phases = timings.finish(response_start=1.75)
+    assert phases["model"] == 0.2
+    assert abs(phases["filter"] - 0.3) < 1e-9
+    assert abs(phases["serialize"] - 0.25) < 1e-9
+
+# ============================================================================
+# TESTES DE EXPRESSÕES DE DADOS (/dice/stats)
+# ============================================================================
+
+def test_parse_dice_expressions():
+    """Testa a compilação e a normalização de expressões de dados."""
+    from repository.dice import DiceError, parse_dice
+    assert str(parse_dice("2d6+3")) == "2d6 + 3"
+    assert str(parse_dice("d20")) == "1d20"
+    assert str(parse_dice("1d6 + 1d6 - 1d4 + 2 - 5")) == "2d6 - 1d4 - 3"
+    assert str(parse_dice("2d6 3")) == "2d6 + 3"  # "+" da query string chega como espaço
+    expression = parse_dice("19d12 + 133")
+    assert (expression.minimum, expression.maximum, expression.mean) == (152, 361, 256.5)
+    for invalid in ("", "2d", "2x6", "0d6", "1d1000", "101d6"):
+        with pytest.raises(DiceError):
+            parse_dice(invalid)
+
+def test_dice_distribution_exact():
+    """Testa a distribuição exata contra a contagem por força bruta."""
+    from itertools import product
+    from repository.dice import distribution, parse_dice
+    dist = distribution(parse_dice("2d6 - 1d4 + 1"))
+    expected = {}
+    for a, b, c in product(range(1, 7), range(1, 7), range(1, 5)):
+        expected[a + b - c + 1] = expected.get(a + b - c + 1, 0) + 1
+    assert dist.minimum == min(expected)
+    assert {dist.minimum + i: count for i, count in enumerate(dist.counts)} == expected
+    results = sorted(value for value, count in expected.items() for _ in range(count))
+    assert dist.percentile(50) == results[len(results) // 2 - 1]
+    assert dist.percentile(100) == max(expected)
+
+def test_dice_stats_endpoint():
+    """Testa GET /dice/stats com distribuição, percentis e erros."""
+    resp = client.get("/dice/stats?expr=2d6+3")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["expressao"] == "2d6 + 3"
+    assert (data["minimo"], data["maximo"], data["media"]) == (5, 15, 10.0)
+    assert data["percentis"] == {"p10": 7, "p25": 8, "p50": 10, "p75": 12, "p90": 13}
+    assert len(data["distribuicao"]) == 11
+    assert data["distribuicao"][0] == {"valor": 5, "probabilidade": 1 / 36}
+    assert abs(sum(p["probabilidade"] for p in data["distribuicao"]) - 1) < 1e-9
+    assert client.get("/dice/stats?expr=8d6&distribuicao=false").json()["distribuicao"] is None
+    resp = client.get("/dice/stats?expr=abc")
+    assert resp.status_code == 400
+    assert "inválida" in resp.json()["detail"]
+    assert client.get("/dice/stats").status_code == 422
+
+def test_creature_and_weapon_dice_fields():
+    """Testa PV, ataques e dano de armas já interpretados nos payloads."""
+    lobo = client.get("/criaturas/lobo").json()
+    assert lobo["pv_dados"]["expressao"] == "2d8 + 2"
+    assert lobo["pv_dados"]["media"] == 11.0
+    mordida = lobo["ataques_detalhados"][0]
+    assert (mordida["nome"], mordida["bonus_ataque"]) == ("Mordida", 4)
+    assert mordida["dano"] == [{
+        "valor": 7,
+        "dados": {"expressao": "2d4 + 2", "dados": [{"quantidade": 2, "faces": 4}], "modificador": 2, "minimo": 4, "maximo": 10, "media": 7.0},
+        "tipo": "perfuração",
+    }]
+    # Dano fixo, sem dados, e dano extra de veneno no mesmo ataque
+    aranha = client.get("/criaturas/aranha").json()
+    dano = aranha["ataques_detalhados"][0]["dano"]
+    assert dano[0] == {"valor": 1, "dados": None, "tipo": "perfuração"}
+    assert (dano[1]["valor"], dano[1]["dados"]["expressao"], dano[1]["tipo"]) == (2, "1d4", "veneno")
+    weapons = client.get("/weapons?fields=dano,dano_dados").json()
+    assert all(w["dano_dados"]["expressao"] == w["dano"] for w in weapons)
+
+# ============================================================================
+# TESTES DE ROLAGEM EM LOTE (POST /dice/roll)
+# ============================================================================
+
+def test_dice_roll_batch_with_seed():
+    """Testa rolagens em lote, limites das expressões e reprodução pela semente."""
+    body = {"rolagens": [{"expr": "1d20 + 5", "vezes": 50}, {"expr": "100d100", "vezes": 20}, {"expr": "3"}], "semente": 42}
+    resp = client.post("/dice/roll", json=body)
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["semente"] == 42
+    d20, big, constant = data["resultados"]
+    assert d20["partes"][0]["expressao"] == "1d20 + 5"
+    assert len(d20["totais"]) == 50 and all(6 <= total <= 25 for total in d20["totais"])
+    assert all(100 <= total <= 10000 for total in big["totais"])
+    assert constant["totais"] == [3]
+    assert client.post("/dice/roll", json=body).json() == data
+    # Sem semente, uma é sorteada e devolvida para repetir as rolagens
+    unseeded = client.post("/dice/roll", json={"rolagens": body["rolagens"]}).json()
+    repeated = client.post("/dice/roll", json={**body, "semente": unseeded["semente"]}).json()
+    assert repeated == unseeded
+
+def test_dice_roll_catalog_strings():
+    """Testa rolagem do dano de armas e do texto de ataques das criaturas."""
+    arma = client.get("/weapons/1").json()
+    aranha = client.get("/criaturas/aranha").json()
+    resp = client.post("/dice/roll", json={"rolagens": [
+        {"expr": arma["dano"], "vezes": 5},
+        {"expr": aranha["ataques"][0], "vezes": 5},
+    ]})
+    assert resp.status_code == 200
+    weapon, attack = resp.json()["resultados"]
+    assert all(1 <= total <= arma["dano_dados"]["maximo"] for total in weapon["totais"])
+    assert [(p["expressao"], p["tipo"]) for p in attack["partes"]] == [("1", "perfuração"), ("1d4", "veneno")]
+    assert attack["totais"] == [1 + veneno for veneno in attack["partes"][1]["resultados"]]
+
+def test_dice_roll_errors():
+    """Testa expressão inválida, limite de rolagens e pedido vazio."""
+    resp = client.post("/dice/roll", json={"rolagens": [{"expr": "1d6"}, {"expr": "xyz"}]})
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("Item 1:")
+    from models.dice import MAX_ROLLS
+    too_many = {"rolagens": [{"expr": "1d6", "vezes": MAX_ROLLS}, {"expr": "1d6"}]}
+    assert client.post("/dice/roll", json=too_many).status_code == 400
+    assert client.post("/dice/roll", json={"rolagens": []}).status_code == 422
+    assert client.post("/dice/roll", json={"rolagens": [{"expr": "1d6", "vezes": 0}]}).status_code == 422
+
+def test_dice_distribution_shared_across_modifiers():
+    """Testa que o modificador só desloca a distribuição e o teto de cálculo por pedido."""
+    from repository.dice import _dice_distribution, distribution, parse_dice
+    base = distribution(parse_dice("3d8"))
+    misses = _dice_distribution.cache_info().misses
+    for modifier in range(1, 50):
+        shifted = distribution(parse_dice(f"3d8 + {modifier}"))
+        assert (shifted.minimum, shifted.counts) == (base.minimum + modifier, base.counts)
+    assert _dice_distribution.cache_info().misses == misses
+    same_dice = {"rolagens": [{"expr": f"100d100 + {i}"} for i in range(100)], "semente": 1}
+    results = client.post("/dice/roll", json=same_dice).json()["resultados"]
+    assert all(100 + i <= r["totais"][0] <= 10000 + i for i, r in enumerate(results))
+    distinct = {"rolagens": [{"expr": f"{n}d100"} for n in range(90, 101)]}
+    resp = client.post("/dice/roll", json=distinct)
+    assert resp.status_code == 400
+    assert "máximo" in resp.json()["detail"]
+
+# ============================================================================
+# TESTES DO MONTADOR DE ENCONTROS (POST /encounters/build)
+# ============================================================================
+
+def test_encounter_xp_math():
+    """Testa XP por nível de desafio, multiplicadores e limiares do grupo."""
+    from repository.encounters import challenge_xp, multiplier, party_thresholds, xp_band
+    assert challenge_xp("1/4") == 50
+    assert challenge_xp("17") == 18000
+    assert challenge_xp("???") is None
+    assert [multiplier(n, 4) for n in (1, 2, 3, 7, 11, 15)] == [1, 1.5, 2, 2.5, 3, 4]
+    assert multiplier(1, 2) == 1.5 and multiplier(1, 6) == 0.5 and multiplier(20, 2) == 5
+    thresholds = party_thresholds([3, 3, 3, 3])
+    assert thresholds == {"facil": 300, "media": 600, "dificil": 900, "mortal": 1600}
+    assert xp_band(thresholds, "media") == (600, 899)
+    assert xp_band(thresholds, "mortal") == (1600, 2400)
+
+def test_encounter_search_matches_brute_force():
+    """Testa a busca com poda contra a enumeração de todas as combinações."""
+    from itertools import combinations, product
+    from repository.encounters import XP_BY_CHALLENGE, multiplier, search_compositions
+    values = sorted(set(XP_BY_CHALLENGE.values()))[:12]
+    band, target = (1200, 1799), 1499.5
+    found = search_compositions(values, 4, band, max_creatures=8, max_kinds=2, limit=5)
+    scores = []
+    for kinds in (1, 2):
+        for xps in combinations(values, kinds):
+            for counts in product(range(1, 9), repeat=kinds):
+                total = sum(counts)
+                adjusted = sum(x * c for x, c in zip(xps, counts)) * multiplier(total, 4)
+                if total <= 8 and band[0] <= adjusted <= band[1]:
+                    scores.append((abs(adjusted - target), total, kinds))
+    assert [(abs(c.adjusted_xp - target), c.total, len(c.counts)) for c in found] == sorted(scores)[:5]
+
+def test_build_encounters_endpoint():
+    """Testa encontros balanceados para um grupo de nível 1."""
+    resp = client.post("/encounters/build", json={"niveis": [1, 1, 1, 1], "dificuldade": "media", "max_criaturas": 6, "tipo": "Besta"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["limiares"] == {"facil": 100, "media": 200, "dificil": 300, "mortal": 400}
+    assert (data["xp_minimo"], data["xp_maximo"]) == (200, 299)
+    assert len(data["encontros"]) == 5
+    for encontro in data["encontros"]:
+        assert encontro["dificuldade"] == "media"
+        assert 200 <= encontro["xp_ajustado"] <= 299
+        assert encontro["total_criaturas"] == sum(c["quantidade"] for c in encontro["criaturas"]) <= 6
+        assert encontro["xp_base"] == sum(c["xp"] * c["quantidade"] for c in encontro["criaturas"])
+        for criatura in encontro["criaturas"]:
+            assert client.get(f"/criaturas/{criatura['id']}").json()["tipo"] == "Besta"
+    distances = [abs(e["xp_ajustado"] - 249.5) for e in data["encontros"]]
+    assert distances == sorted(distances)
+
+def test_build_encounters_limits():
+    """Testa grupo sem combinações possíveis e validação do pedido."""
+    resp = client.post("/encounters/build", json={"niveis": [20, 20, 20, 20], "dificuldade": "mortal"})
+    assert resp.status_code == 200
+    assert resp.json()["encontros"] == []
+    assert client.post("/encounters/build", json={"niveis": [21]}).status_code == 422
+    assert client.post("/encounters/build", json={"niveis": []}).status_code == 422
+    assert client.post("/encounters/build", json={"niveis": [1], "dificuldade": "impossivel"}).status_code == 422
+
+# ============================================================================
+# TESTES DE FILTROS NUMÉRICOS DE CRIATURAS
+# ============================================================================
+
+def test_creature_stat_columns():
+    """Testa a extração de deslocamentos, PV e percepção passiva."""
+    from repository.dataset import get_dataset
+    from repository.indexes import parse_speeds
+    assert parse_speeds("9 m, voo 18 m") == {"deslocamento": 9.0, "voo": 18.0, "natacao": 0.0, "escalar": 0.0, "escavar": 0.0}
+    assert parse_speeds("0 m, natação 12 m")["natacao"] == 12.0
+    assert parse_speeds("1,5 m, voo 4,5 m")["voo"] == 4.5
+    stats = get_dataset().creature_stats
+    pos = [c.id for c in stats.creatures].index("aguia-gigante")
+    assert stats.columns["pv"][pos] == 26
+    assert stats.columns["voo"][pos] == 24.0
+    assert stats.columns["percepcao_passiva"][pos] == 14
+
+def test_creature_range_filters():
+    """Testa filtros por faixa combinados entre si e com os filtros de texto."""
+    creatures = client.get("/criaturas").json()
+    resp = client.get("/criaturas?ca_min=13&pv_max=20")
+    assert resp.status_code == 200
+    expected = [c["id"] for c in creatures if c["ca"] >= 13 and int(c["pv"].split()[0]) <= 20]
+    assert [c["id"] for c in resp.json()] == expected
+    assert expected
+    strong = client.get("/criaturas?for_min=15&for_max=16").json()
+    assert strong and all(15 <= c["atributos"]["FOR"] <= 16 for c in strong)
+    beasts = client.get("/criaturas?voo_min=18&tipo=Besta").json()
+    assert {c["id"] for c in beasts} == {"aguia-gigante", "falcao"}
+    assert client.get("/criaturas?ca_min=30").json() == []
+    assert client.get("/criaturas?ca_min=abc").status_code == 422
+
+def test_creature_movement_filters():
+    """Testa voo=true/false e os demais modos de deslocamento."""
+    flying = client.get("/criaturas?voo=true").json()
+    assert flying and all("voo" in c["deslocamento"] for c in flying)
+    grounded = client.get("/criaturas?voo=false").json()
+    assert len(flying) + len(grounded) == len(client.get("/criaturas").json())
+    swimmers = client.get("/criaturas?natacao=true&voo=false&fields=deslocamento").json()
+    assert swimmers and all("natação" in c["deslocamento"] for c in swimmers)
+    page = client.get("/criaturas?voo=true&limit=2")
+    assert page.headers["x-total-count"] == str(len(flying))
+
+# ============================================================================
+# TESTES DE ORDENAÇÃO (sort=)
+# ============================================================================
+
+def test_sort_multiple_fields():
+    """Testa sort=-nivel,nome em /spells, com filtros e paginação."""
+    from repository.text import fold
+    spells = client.get("/spells").json()
+    resp = client.get("/spells?sort=-nivel,nome")
+    assert resp.status_code == 200
+    expected = sorted(spells, key=lambda s: (-s["nivel"], fold(s["nome"]), s["nome"]))
+    assert [s["nome"] for s in resp.json()] == [s["nome"] for s in expected]
+    # Filtros e ordenação combinados; a paginação percorre a ordem pedida
+    rituals = client.get("/spells?ritual=true&sort=nome").json()
+    assert [s["nome"] for s in rituals] == sorted((s["nome"] for s in spells if s["ritual"]), key=fold)
+    first = client.get("/spells?sort=-nivel,nome&limit=5")
+    second = client.get(f"/spells?sort=-nivel,nome&limit=5&cursor={first.headers['x-next-cursor']}")
+    assert [s["nome"] for s in first.json() + second.json()] == [s["nome"] for s in expected[:10]]
+
+def test_sort_creature_columns():
+    """Testa a ordenação de criaturas por CA, PV numérico e nível de desafio."""
+    creatures = client.get("/criaturas?sort=-ca&fields=ca").json()
+    assert [c["ca"] for c in creatures] == sorted((c["ca"] for c in creatures), reverse=True)
+    by_hp = client.get("/criaturas?sort=pv&fields=pv").json()
+    assert [int(c["pv"].split()[0]) for c in by_hp] == sorted(int(c["pv"].split()[0]) for c in by_hp)
+    by_challenge = [c["nivel_desafio"] for c in client.get("/criaturas?sort=nivel_desafio&fields=nivel_desafio").json()]
+    order = ["0", "1/8", "1/4", "1/2", "1", "2"]
+    assert by_challenge == sorted(by_challenge, key=order.index)
+    beasts = client.get("/criaturas?tipo=Besta&sort=nome").json()
+    assert beasts and all(c["tipo"] == "Besta" for c in beasts)
+
+def test_sort_accents_and_errors():
+    """Testa a colação sem acentos, o order=nome de /racas e campos inválidos."""
+    from repository.indexes import collation_key
+    assert sorted(["Elfo", "Anão", "anel", "Água"], key=collation_key) == ["Água", "Anão", "anel", "Elfo"]
+    races = client.get("/racas?order=nome").json()
+    assert races == client.get("/racas?sort=nome").json()
+    assert races[0]["nome"] == "Anão"
+    assert [r["nome"] for r in client.get("/racas?sort=-nome").json()] == [r["nome"] for r in reversed(races)]
+    assert client.get("/currency?sort=-valor_em_PO").json()[0]["sigla"] == "PL"
+    resp = client.get("/spells?sort=nivel,xyz")
+    assert resp.status_code == 400
+    assert "xyz" in resp.json()["detail"] and "nivel" in resp.json()["detail"]
+
+def test_sort_on_sub_lists():
+    """Testa sort= nas sub-listas (por nível, tipo, categoria, sub-raças), antes da paginação."""
+    from repository.indexes import collation_key
+    for url, field in [
+        ("/spells/nivel/1", "nome"),
+        ("/spells/escola/Evocação", "nome"),
+        ("/spells/classe/Mago", "nivel"),
+        ("/criaturas/tipos/Besta", "ca"),
+        ("/criaturas/niveis/1_4", "nome"),
+        ("/planos/tipos/Transitivo", "nome"),
+        ("/leituras/categorias/Mitologia", "titulo"),
+        ("/racas/1/subracas", "nome"),
+    ]:
+        items = client.get(url).json()
+        ordered = client.get(f"{url}?sort=-{field}").json()
+        assert len(ordered) == len(items) > 1 and all(item in items for item in ordered)
+        assert [i[field] for i in ordered] == sorted((i[field] for i in items), key=collation_key, reverse=True)
+        assert client.get(f"{url}?sort=-{field}&limit=1").json() == ordered[:1]
+    resp = client.get("/racas/1/subracas?sort=xyz")
+    assert resp.status_code == 400
+    assert "bonus_habilidade" in resp.json()["detail"]
+
+# ============================================================================
+# TESTES DO BENCHMARK DE CARGA (benchmarks/bench_load.py)
+# ============================================================================
+
+def test_bench_load_smoke(tmp_path, monkeypatch):
+    """Testa o benchmark de carga de ponta a ponta com poucas rotas e uma rodada."""
+    from benchmarks import bench_load
+    monkeypatch.setattr(bench_load, "SCENARIOS", {"smoke": ["/spells/1", "/criaturas?limit=1"]})
+    baseline = tmp_path / "bench_load.json"
+    args = ["--requests", "4", "--concurrency", "2", "--rounds", "1"]
+    bench_load.main(args + ["--save", str(baseline)])
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    assert saved["meta"]["rounds"] == 1
+    result = saved["results"]["smoke"]
+    assert result["requests"] == 4 and result["errors"] == 0
+    assert result["req_s"] > 0 and result["p50_ms"] <= result["p99_ms"]
+    # Tolerância alta: só verifica que a comparação com o baseline roda
+    bench_load.main(args + ["--compare", str(baseline), "--tolerance", "1000"])
+
+def test_bench_load_scenario_urls_respond():
+    """Testa que as URLs dos cenários do benchmark continuam respondendo 200."""
+    from benchmarks.bench_load import SCENARIOS
+    for urls in SCENARIOS.values():
+        for url in urls:
+            assert client.get(url).status_code == 200, url
+
+def test_bench_load_filter_scenario_filters():
+    """Testa que cada URL do cenário de filtros realmente filtra: parâmetro ignorado devolveria a lista inteira."""
+    from urllib.parse import parse_qsl, urlencode, urlsplit
+    from benchmarks.bench_load import SCENARIOS
+    for url in SCENARIOS["filtros"]:
+        parts = urlsplit(url)
+        filters = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("fields", "limit", "offset", "cursor", "sort")]
+        if not filters and parts.path.count("/") == 1:
+            continue  # só projeção: mesma quantidade de itens
+        items = client.get(f"{parts.path}?{urlencode(filters)}").json()
+        full = client.get("/" + parts.path.split("/")[1]).json()
+        assert 0 < len(items) < len(full), url
+
 # ============================================================================
 # ATUALIZAÇÃO DOS ENDPOINTS PARA TESTAR
 # ============================================================================